@@ -1,16 +1,103 @@
+import json
+import math
+import os
+import threading
 import requests
-from typing import Optional, Any
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Any, Callable, Iterable, Iterator, Mapping, TypeVar, TYPE_CHECKING
+from dataclasses import dataclass, field
 from urllib.parse import urljoin
+from pydantic import TypeAdapter
 
+from request_timing import RequestTiming, TimingAdapter, track
 
-@dataclass
+if TYPE_CHECKING:
+    from cassette import Cassette
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+
+_UNPARSED = object()
+
+DEFAULT_BASE_URL = "http://localhost:8080/api/v1"
+
+T = TypeVar("T")
+
+
+def _decode(content: bytes) -> Optional[Any]:
+    if not content:
+        return None
+    try:
+        return _loads(content)
+    except ValueError:
+        return None
+
+
+def default_base_url() -> str:
+    """API_BASE_URL, shared by the sync and async clients, conftest and the load runner"""
+    return os.getenv("API_BASE_URL", DEFAULT_BASE_URL)
+
+
+@lru_cache(maxsize=None)
+def validator_for(schema: Any) -> TypeAdapter:
+    """build the pydantic validator for a schema once, reuse it after"""
+    return TypeAdapter(schema)
+
+
+@dataclass(init=False)
 class APIResponse:
+    """
+    Response wrapper. The body is kept as the raw bytes the transport
+    already holds and only decoded on first access of json_data/get, so
+    tests that just check status_code never pay for parsing. headers is
+    the transport's own case-insensitive mapping, not a copy.
+
+    The original APIResponse(status_code, json_data, headers, elapsed_ms,
+    raw_response) form still works, positionally or by keyword; clients
+    pass content= instead and leave json_data to be decoded lazily.
+    """
     status_code: int
-    json_data: Optional[dict]
-    headers: dict
+    headers: Mapping[str, str]
     elapsed_ms: float
-    raw_response: requests.Response
+    raw_response: Any
+    content: bytes = b""
+    timing: Optional[RequestTiming] = None
+    _json: Any = field(default=_UNPARSED, repr=False, compare=False)
+
+    def __init__(
+        self,
+        status_code: int,
+        json_data: Any = _UNPARSED,
+        headers: Optional[Mapping[str, str]] = None,
+        elapsed_ms: float = 0.0,
+        raw_response: Any = None,
+        content: bytes = b"",
+        timing: Optional[RequestTiming] = None
+    ):
+        self.status_code = status_code
+        self.headers = {} if headers is None else headers
+        self.elapsed_ms = elapsed_ms
+        self.raw_response = raw_response
+        self.content = content
+        self.timing = timing
+        self._json = json_data
+
+    @property
+    def json_data(self) -> Optional[Any]:
+        if self._json is _UNPARSED:
+            self._json = _decode(self.content)
+        return self._json
+
+    @property
+    def body(self) -> memoryview:
+        """zero-copy view of the raw body"""
+        return memoryview(self.content)
 
     @property
     def is_success(self) -> bool:
@@ -21,14 +108,67 @@ class APIResponse:
             return self.json_data.get(key, default)
         return default
 
+    def validate(self, schema: type[T]) -> T:
+        """validate the raw body against `schema` without building a dict first"""
+        if not self.content and self._json is not _UNPARSED:
+            return validator_for(schema).validate_python(self._json)
+        return validator_for(schema).validate_json(self.content)
+
+
+class SampledValidator:
+    """
+    Validate only every Nth response.
+
+    For load and soak runs where validating every list page costs
+    measurable CPU. every=1 validates everything.
+    """
+
+    def __init__(self, every: int = 1):
+        self.every = max(every, 1)
+        self.validated = 0
+        self.skipped = 0
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, resp: APIResponse, schema: type[T]) -> Optional[T]:
+        with self._lock:
+            sampled = self._seen % self.every == 0
+            self._seen += 1
+            if sampled:
+                self.validated += 1
+            else:
+                self.skipped += 1
+        return resp.validate(schema) if sampled else None
+
 
 class APIClient:
 
-    def __init__(self, base_url: str, timeout: int = 30):
-        self.base_url = base_url
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: int = 30,
+        max_connections: int = 10,
+        cassette: Optional["Cassette"] = None
+    ):
+        self.base_url = base_url or default_base_url()
         self.timeout = timeout
+        self.cassette = cassette
         self.session = requests.Session()
+        # size the keep-alive pool for concurrent fan-out (prefetch, bulk ops)
+        adapter = TimingAdapter(pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self._token: Optional[str] = None
+        self.hooks: dict[str, list[Callable]] = {"pre_request": [], "post_request": []}
+
+    def add_hook(self, event: str, callback: Callable) -> None:
+        """
+        pre_request callbacks get (method, url, kwargs) before sending,
+        post_request callbacks get the APIResponse (with .timing) after.
+        """
+        if event not in self.hooks:
+            raise ValueError(f"Unknown hook event: {event}")
+        self.hooks[event].append(callback)
 
     def set_auth_token(self, token: str) -> None:
         self._token = token
@@ -45,19 +185,32 @@ class APIClient:
         url = self._url(endpoint)
         kwargs.setdefault("timeout", self.timeout)
 
-        resp = self.session.request(method, url, **kwargs)
+        for hook in self.hooks["pre_request"]:
+            hook(method, url, kwargs)
 
-        try:
-            data = resp.json()
-        except ValueError:
-            data = None
+        if self.cassette:
+            resp = self.cassette.handle(
+                method, url, self.session.headers, kwargs,
+                send=lambda: self._send(method, url, **kwargs)
+            )
+        else:
+            resp = self._send(method, url, **kwargs)
+
+        for hook in self.hooks["post_request"]:
+            hook(resp)
+        return resp
+
+    def _send(self, method: str, url: str, **kwargs) -> APIResponse:
+        with track(method, url) as timing:
+            resp = self.session.request(method, url, **kwargs)
 
         return APIResponse(
             status_code=resp.status_code,
-            json_data=data,
-            headers=dict(resp.headers),
+            headers=resp.headers,
             elapsed_ms=resp.elapsed.total_seconds() * 1000,
-            raw_response=resp
+            raw_response=resp,
+            content=resp.content,
+            timing=timing
         )
 
     def get(self, endpoint: str, params: dict = None) -> APIResponse:
@@ -76,6 +229,36 @@ class APIClient:
         return self._request("DELETE", endpoint)
 
 
+class BulkRequestError(RuntimeError):
+    """
+    Some requests of a bulk call raised. Raised only after every request
+    finished; `responses` holds the ones that completed (None where one
+    raised) in input order, `errors` maps input index to exception.
+    """
+
+    def __init__(self, responses: list[Optional[APIResponse]], errors: dict[int, BaseException]):
+        self.responses = responses
+        self.errors = errors
+        first = min(errors)
+        super().__init__(f"{len(errors)}/{len(responses)} bulk requests raised, first (#{first}): {errors[first]!r}")
+
+
+def _run_all(call: Callable[[T], APIResponse], items: Iterable[T], workers: int) -> list[APIResponse]:
+    """`call` on every item concurrently; raise BulkRequestError only once all are done."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(call, item) for item in items]
+    responses: list[Optional[APIResponse]] = []
+    errors: dict[int, BaseException] = {}
+    for i, future in enumerate(futures):
+        error = future.exception()
+        responses.append(None if error else future.result())
+        if error:
+            errors[i] = error
+    if errors:
+        raise BulkRequestError(responses, errors) from errors[min(errors)]
+    return responses
+
+
 class UserServiceClient(APIClient):
     """client for user api endpoints"""
 
@@ -95,9 +278,69 @@ class UserServiceClient(APIClient):
     def delete_user(self, user_id: str) -> APIResponse:
         return self.delete(f"/users/{user_id}")
 
+    def bulk_create_users(self, users: Iterable[dict], workers: int = 8) -> list[APIResponse]:
+        """
+        Create many users concurrently.
+
+        `users` are dicts of create_user kwargs. Responses come back in
+        input order; failed creates are returned, not raised. If a request
+        itself raises (connection error etc.) the others still finish and
+        BulkRequestError carries their responses, so created users can be
+        cleaned up.
+        """
+        return _run_all(lambda u: self.create_user(**u), users, workers)
+
+    def bulk_delete_users(self, user_ids: Iterable[str], workers: int = 8) -> list[APIResponse]:
+        """Delete many users concurrently, responses in input order. Raises like bulk_create_users."""
+        return _run_all(self.delete_user, user_ids, workers)
+
     def list_users(self, page: int = 1, limit: int = 20) -> APIResponse:
         return self.get("/users", params={"page": page, "limit": limit})
 
+    def _fetch_page(self, page: int, limit: int) -> APIResponse:
+        resp = self.list_users(page=page, limit=limit)
+        resp.raw_response.raise_for_status()
+        return resp
+
+    def iter_users(self, limit: int = 100, prefetch: int = 2) -> Iterator[dict]:
+        """
+        Walk every user across pages.
+
+        While the caller consumes one page, up to `prefetch` following
+        pages are fetched in the background. Pages past `total` are never
+        requested, and stopping early cancels prefetches not yet sent.
+        """
+        resp = self._fetch_page(1, limit)
+        total = resp.get("total")
+        last_page = math.ceil(total / limit) if total is not None else None
+
+        if last_page is None or prefetch < 1:
+            page = 1
+            while True:
+                users = resp.get("users") or []
+                yield from users
+                if len(users) < limit or (last_page is not None and page >= last_page):
+                    return
+                page += 1
+                resp = self._fetch_page(page, limit)
+
+        pool = ThreadPoolExecutor(max_workers=prefetch)
+        pending = deque()
+        next_page = 2
+        try:
+            while True:
+                while next_page <= last_page and len(pending) < prefetch:
+                    pending.append(pool.submit(self._fetch_page, next_page, limit))
+                    next_page += 1
+
+                yield from resp.get("users") or []
+
+                if not pending:
+                    return
+                resp = pending.popleft().result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def login(self, email: str, password: str) -> APIResponse:
         resp = self.post("/auth/login", json={
             "email": email,
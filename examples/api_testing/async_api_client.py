@@ -0,0 +1,156 @@
+import asyncio
+import time
+import aiohttp
+from typing import Optional, Awaitable, Iterable, TypeVar
+from urllib.parse import urljoin
+
+from api_client import APIResponse, default_base_url
+
+
+T = TypeVar("T")
+
+
+def shared_pool(max_connections: int = 100, timeout: int = 30) -> aiohttp.ClientSession:
+    """
+    connection pool that several async clients can share.
+    must be created inside a running event loop.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=max_connections),
+        timeout=aiohttp.ClientTimeout(total=timeout)
+    )
+
+
+class AsyncAPIClient:
+    """
+    asyncio version of APIClient.
+
+    Same surface and APIResponse shape, but every call is awaitable so
+    hundreds of flows can run from one event loop. Auth headers are kept
+    per client, which lets many clients share one connection pool.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: int = 30,
+        pool: Optional[aiohttp.ClientSession] = None,
+        max_connections: int = 100
+    ):
+        self.base_url = base_url or default_base_url()
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._owns_pool = pool is None
+        self._session = pool
+        self.headers: dict[str, str] = {}
+        self._token: Optional[str] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # created lazily - aiohttp sessions need a running loop
+        if self._session is None:
+            self._session = shared_pool(self.max_connections, self.timeout)
+        return self._session
+
+    async def __aenter__(self) -> "AsyncAPIClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        # shared pools are closed by whoever created them
+        if self._owns_pool and self._session is not None:
+            await self._session.close()
+
+    def set_auth_token(self, token: str) -> None:
+        self._token = token
+        self.headers["Authorization"] = f"Bearer {token}"
+
+    def clear_auth(self) -> None:
+        self._token = None
+        self.headers.pop("Authorization", None)
+
+    def _url(self, endpoint: str) -> str:
+        return urljoin(self.base_url, endpoint)
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> APIResponse:
+        url = self._url(endpoint)
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=self.timeout))
+
+        start = time.perf_counter()
+        async with self.session.request(method, url, headers=self.headers, **kwargs) as resp:
+            # same meaning as requests' resp.elapsed: time until headers arrived
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            body = await resp.read()
+
+        return APIResponse(
+            status_code=resp.status,
+            headers=resp.headers,
+            elapsed_ms=elapsed_ms,
+            raw_response=resp,
+            content=body
+        )
+
+    async def get(self, endpoint: str, params: dict = None) -> APIResponse:
+        return await self._request("GET", endpoint, params=params)
+
+    async def post(self, endpoint: str, json: dict = None, data: dict = None) -> APIResponse:
+        return await self._request("POST", endpoint, json=json, data=data)
+
+    async def put(self, endpoint: str, json: dict = None) -> APIResponse:
+        return await self._request("PUT", endpoint, json=json)
+
+    async def patch(self, endpoint: str, json: dict = None) -> APIResponse:
+        return await self._request("PATCH", endpoint, json=json)
+
+    async def delete(self, endpoint: str) -> APIResponse:
+        return await self._request("DELETE", endpoint)
+
+
+class AsyncUserServiceClient(AsyncAPIClient):
+    """async client for user api endpoints"""
+
+    async def create_user(self, email: str, name: str, password: str) -> APIResponse:
+        return await self.post("/users", json={
+            "email": email,
+            "name": name,
+            "password": password
+        })
+
+    async def get_user(self, user_id: str) -> APIResponse:
+        return await self.get(f"/users/{user_id}")
+
+    async def update_user(self, user_id: str, **fields) -> APIResponse:
+        return await self.patch(f"/users/{user_id}", json=fields)
+
+    async def delete_user(self, user_id: str) -> APIResponse:
+        return await self.delete(f"/users/{user_id}")
+
+    async def list_users(self, page: int = 1, limit: int = 20) -> APIResponse:
+        return await self.get("/users", params={"page": page, "limit": limit})
+
+    async def login(self, email: str, password: str) -> APIResponse:
+        resp = await self.post("/auth/login", json={
+            "email": email,
+            "password": password
+        })
+
+        # auto set token if login successful
+        if resp.is_success:
+            token = resp.get("access_token")
+            if token:
+                self.set_auth_token(token)
+
+        return resp
+
+
+async def gather_limited(coros: Iterable[Awaitable[T]], limit: int = 100) -> list[T]:
+    """run coroutines concurrently with at most `limit` in flight"""
+    sem = asyncio.Semaphore(limit)
+
+    async def _run(coro):
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros))
@@ -0,0 +1,83 @@
+"""
+Validation Benchmark.
+
+Compares per-response cost of the ways a list page can be validated:
+building the model from a decoded dict (the old style), the cached
+TypeAdapter validating raw bytes, and 1-in-N sampling on top of that.
+
+Usage:
+    python bench_validation.py --users 100 --responses 2000
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from api_client import APIResponse, SampledValidator
+from schemas import UserListResponse
+
+
+def _list_page(users: int) -> bytes:
+    now = datetime.now(timezone.utc).isoformat()
+    return json.dumps({
+        "users": [
+            {
+                "id": uuid.uuid4().hex,
+                "email": f"bench{i}@example.com",
+                "name": f"Bench User {i}",
+                "created_at": now,
+                "updated_at": None,
+            }
+            for i in range(users)
+        ],
+        "total": users,
+        "page": 1,
+        "limit": users,
+    }).encode()
+
+
+def _fresh(body: bytes) -> APIResponse:
+    return APIResponse(status_code=200, headers={}, elapsed_ms=0.0, raw_response=None, content=body)
+
+
+def _time_per_response(fn, body: bytes, responses: int) -> float:
+    start = time.perf_counter()
+    for _ in range(responses):
+        fn(_fresh(body))
+    return (time.perf_counter() - start) / responses * 1_000_000
+
+
+def run(users: int = 100, responses: int = 2000, sample_every: int = 10) -> dict[str, float]:
+    """Microseconds per response for each validation strategy."""
+    body = _list_page(users)
+    sampler = SampledValidator(sample_every)
+
+    # warm the adapter cache so it's not billed to the first strategy
+    _fresh(body).validate(UserListResponse)
+
+    return {
+        "model_from_dict": _time_per_response(
+            lambda r: UserListResponse(**r.json_data), body, responses
+        ),
+        "cached_adapter_json": _time_per_response(
+            lambda r: r.validate(UserListResponse), body, responses
+        ),
+        f"sampled_1_in_{sample_every}": _time_per_response(
+            lambda r: sampler(r, UserListResponse), body, responses
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response validation cost")
+    parser.add_argument("--users", type=int, default=100, help="users per list page")
+    parser.add_argument("--responses", type=int, default=2000)
+    parser.add_argument("--sample-every", type=int, default=10)
+    args = parser.parse_args()
+
+    results = run(args.users, args.responses, args.sample_every)
+    baseline = results["model_from_dict"]
+    for name, us in results.items():
+        print(f"{name:<24} {us:>10.1f} us/response  ({baseline / us:.1f}x)")
@@ -0,0 +1,240 @@
+"""
+Record/replay cassette for APIClient.
+
+Modes:
+    record  - send requests for real and capture every response
+    replay  - serve captured responses from memory, no network
+    hybrid  - send for real, but cache GETs for `ttl_s` seconds and
+              drop cached entries when a write touches the same resource
+    off     - pass through
+
+Cassettes are gzipped JSON lines, one recorded response per line. They
+are meant to be committed for CI replay, so credentials are redacted
+before anything is written: token fields in JSON bodies and the
+Authorization/Cookie/Set-Cookie headers.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Mapping
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from api_client import APIResponse
+
+
+MODES = ("off", "record", "replay", "hybrid")
+
+REDACTED = "REDACTED"
+SECRET_HEADERS = frozenset({"authorization", "proxy-authorization", "cookie", "set-cookie"})
+SECRET_FIELDS = frozenset({
+    "access_token", "refresh_token", "id_token", "token", "password", "client_secret", "api_key",
+})
+
+
+class CassetteMiss(LookupError):
+    """Replay was asked for a request that was never recorded."""
+
+
+class Cassette:
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        ttl_s: float = 30.0,
+        match_body: bool = False
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.ttl_s = ttl_s
+        # test data is usually random, so bodies are ignored by default and
+        # repeated requests replay in recorded order instead
+        self.match_body = match_body
+        self.hits = 0
+        self.misses = 0
+
+        self._recorded: dict[str, list[dict]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        self._cache: dict[str, tuple[float, str, APIResponse]] = {}
+        self._lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+
+    # --- keys ---
+
+    def _key(self, method: str, url: str, headers: Mapping[str, str], kwargs: dict) -> str:
+        params = kwargs.get("params")
+        if params:
+            query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+            url = f"{url}?{query}"
+
+        # auth changes the answer but tokens differ between runs,
+        # so hybrid (same run) keys on the token, record/replay on its presence
+        auth = headers.get("Authorization", "")
+        if self.mode == "hybrid":
+            auth = hashlib.sha1(auth.encode()).hexdigest()[:12] if auth else ""
+        else:
+            auth = "auth" if auth else ""
+
+        key = f"{method} {url} {auth}"
+        if self.match_body:
+            body = kwargs.get("json") if kwargs.get("json") is not None else kwargs.get("data")
+            if body is not None:
+                digest = hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()
+                key = f"{key} {digest[:12]}"
+        return key
+
+    # --- request handling ---
+
+    def handle(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        kwargs: dict,
+        send: Callable[[], APIResponse]
+    ) -> APIResponse:
+        if self.mode == "off":
+            return send()
+
+        key = self._key(method, url, headers, kwargs)
+
+        if self.mode == "replay":
+            return self._replay(key, url)
+
+        if self.mode == "record":
+            resp = send()
+            self._record(key, resp)
+            return resp
+
+        return self._hybrid(method, url, key, send)
+
+    def _replay(self, key: str, url: str) -> APIResponse:
+        start = time.perf_counter()
+        with self._lock:
+            entries = self._recorded.get(key)
+            if not entries:
+                self.misses += 1
+                raise CassetteMiss(f"No recording for {key!r} in {self.path}")
+            # same request recorded several times replays in order,
+            # then keeps serving the last answer
+            index = min(self._cursor[key], len(entries) - 1)
+            self._cursor[key] += 1
+            self.hits += 1
+            entry = entries[index]
+
+        raw = _build_response(entry, url)
+        return APIResponse(
+            status_code=raw.status_code,
+            headers=raw.headers,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            raw_response=raw,
+            content=raw.content
+        )
+
+    def _record(self, key: str, resp: APIResponse) -> None:
+        entry = {
+            "key": key,
+            "status": resp.status_code,
+            "headers": redact_headers(resp.headers),
+            "body": base64.b64encode(redact_body(resp.content)).decode(),
+        }
+        with self._lock:
+            self._recorded[key].append(entry)
+
+    def _hybrid(self, method: str, url: str, key: str, send: Callable[[], APIResponse]) -> APIResponse:
+        path = urlsplit(url).path
+        now = time.monotonic()
+
+        if method != "GET":
+            resp = send()
+            self.invalidate(path)
+            return resp
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                self.hits += 1
+                return cached[2]
+            self.misses += 1
+
+        resp = send()
+        if resp.is_success:
+            with self._lock:
+                self._cache[key] = (now + self.ttl_s, path, resp)
+        return resp
+
+    def invalidate(self, path: str) -> None:
+        """Drop cached GETs for `path`, its parent collections and its children."""
+        segments = path.rstrip("/").split("/")
+        with self._lock:
+            for key, (_, cached_path, _) in list(self._cache.items()):
+                cached = cached_path.rstrip("/").split("/")
+                shorter = min(len(cached), len(segments))
+                if cached[:shorter] == segments[:shorter]:
+                    del self._cache[key]
+
+    # --- storage ---
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path} (record it first)")
+        with gzip.open(self.path, "rt") as f:
+            for line in f:
+                entry = json.loads(line)
+                self._recorded[entry["key"]].append(entry)
+
+    def save(self) -> None:
+        if self.mode != "record":
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, gzip.open(self.path, "wt") as f:
+            for entries in self._recorded.values():
+                for entry in entries:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+def redact_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    return {name: REDACTED if name.lower() in SECRET_HEADERS else value for name, value in headers.items()}
+
+
+def redact_body(content: bytes) -> bytes:
+    """`content` with secret JSON fields replaced at any depth; non-JSON bodies unchanged."""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content
+    redacted = _redact(data)
+    return content if redacted == data else json.dumps(redacted).encode()
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in SECRET_FIELDS else _redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _build_response(entry: dict, url: str) -> requests.Response:
+    """rebuild a requests.Response so raise_for_status etc. keep working"""
+    raw = requests.Response()
+    raw.status_code = entry["status"]
+    raw.headers = CaseInsensitiveDict(entry["headers"])
+    raw._content = base64.b64decode(entry["body"])
+    raw.url = url
+    raw.encoding = "utf-8"
+    return raw
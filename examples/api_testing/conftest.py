@@ -2,15 +2,25 @@ import pytest
 import os
 from faker import Faker
 
+from api_client import default_base_url
+from cassette import Cassette
+from request_timing import JsonlTraceExporter, OtlpJsonExporter
+from stub_server import StubUserService
+from token_cache import TokenCache
+
 
 @pytest.fixture(scope="session")
-def faker():
-    return Faker()
+def faker(api_cassette):
+    fake = Faker()
+    # recorded requests only match on replay if the test data is reproducible
+    if api_cassette and api_cassette.mode in ("record", "replay"):
+        fake.seed_instance(int(os.getenv("FAKER_SEED", "1234")))
+    return fake
 
 
 @pytest.fixture(scope="session")
 def api_base_url():
-    return os.getenv("API_BASE_URL", "http://localhost:8080/api/v1")
+    return default_base_url()
 
 
 @pytest.fixture(scope="session")
@@ -25,6 +35,69 @@ def test_creds():
     }
 
 
+@pytest.fixture(scope="session")
+def api_cassette():
+    """
+    Record/replay layer for the api clients.
+    API_CASSETTE_MODE: off (default), record, replay or hybrid.
+    """
+    mode = os.getenv("API_CASSETTE_MODE", "off")
+    if mode == "off":
+        yield None
+        return
+
+    cassette = Cassette(
+        os.getenv("API_CASSETTE_PATH", "cassettes/users_api.jsonl.gz"),
+        mode=mode,
+        ttl_s=float(os.getenv("API_CASSETTE_TTL", "30")),
+        match_body=True
+    )
+    yield cassette
+    cassette.save()
+
+
+@pytest.fixture(scope="session")
+def trace_exporters():
+    """
+    post_request hooks exporting per-request timing breakdowns.
+    API_TRACE_JSONL / API_TRACE_OTLP: output paths, unset to disable.
+    """
+    exporters = []
+    if os.getenv("API_TRACE_JSONL"):
+        exporters.append(JsonlTraceExporter(os.getenv("API_TRACE_JSONL")))
+    if os.getenv("API_TRACE_OTLP"):
+        exporters.append(OtlpJsonExporter(os.getenv("API_TRACE_OTLP")))
+
+    yield exporters
+
+    for exporter in exporters:
+        exporter.close()
+
+
+@pytest.fixture(scope="session")
+def token_cache(tmp_path_factory):
+    """bearer tokens shared by all tests and xdist workers in this run"""
+    base = tmp_path_factory.getbasetemp()
+    # under xdist each worker gets its own basetemp below a shared run dir
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        base = base.parent
+    return TokenCache(str(base / "api_tokens"))
+
+
+@pytest.fixture(scope="session")
+def stub_server():
+    """in-memory user service for client tests that shouldn't hit the real api"""
+    with StubUserService() as stub:
+        yield stub
+
+
+@pytest.fixture
+def stub(stub_server):
+    """stub server with clean state for each test"""
+    stub_server.reset()
+    return stub_server
+
+
 @pytest.fixture(autouse=True)
 def log_test(request):
     print(f"\n>>> {request.node.name}")
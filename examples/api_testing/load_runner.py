@@ -0,0 +1,365 @@
+"""
+Load Runner.
+
+Drives UserServiceClient scenarios at a fixed concurrency or a
+target request rate and records per-endpoint latency histograms.
+
+Usage:
+    python load_runner.py --stub --concurrency 20 --duration 10
+    python load_runner.py --base-url http://api:8080 --rps 200 --out load.json
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import requests
+
+from api_client import APIResponse, SampledValidator, UserServiceClient, default_base_url
+from schemas import UserResponse
+
+
+class LatencyHistogram:
+    """
+    HDR-style latency histogram.
+
+    Values (microseconds) land in log-linear buckets with a fixed
+    relative precision, so memory stays constant no matter how many
+    samples are recorded and percentiles are accurate to
+    `significant_figures` digits.
+    """
+
+    def __init__(self, significant_figures: int = 3):
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.counts: dict[tuple[int, int], int] = {}
+        self.total = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+        self._sum_us = 0
+
+    def _key(self, value: int) -> tuple[int, int]:
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return shift, value >> shift
+
+    def record(self, value_us: float) -> None:
+        value = max(int(value_us), 0)
+        key = self._key(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+        self._sum_us += value
+        self.max_us = max(self.max_us, value)
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self._sum_us += other._sum_us
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def percentile(self, pct: float) -> int:
+        """Highest value (us) in the bucket holding the given percentile."""
+        if not self.total:
+            return 0
+        target = max(math.ceil(pct / 100 * self.total), 1)
+        seen = 0
+        for shift, sub in sorted(self.counts):
+            seen += self.counts[(shift, sub)]
+            if seen >= target:
+                return min(((sub + 1) << shift) - 1, self.max_us)
+        return self.max_us
+
+    @property
+    def mean_us(self) -> float:
+        return self._sum_us / self.total if self.total else 0.0
+
+
+@dataclass
+class Step:
+    """One request in a scenario, e.g. create or get."""
+    name: str
+    action: Callable[[UserServiceClient, dict], APIResponse]
+    expect_status: Optional[int] = None
+    schema: Optional[type] = None
+
+
+@dataclass
+class Scenario:
+    """Ordered steps run against one client; `context` carries ids between steps."""
+    name: str
+    steps: list[Step]
+
+
+@dataclass
+class EndpointStats:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    # transport failures by exception type, counted in errors too
+    exceptions: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        h = self.histogram
+        return {
+            "count": h.total,
+            "errors": self.errors,
+            "error_rate": round(self.errors / h.total, 4) if h.total else 0.0,
+            "mean_ms": round(h.mean_us / 1000, 3),
+            "p50_ms": h.percentile(50) / 1000,
+            "p95_ms": h.percentile(95) / 1000,
+            "p99_ms": h.percentile(99) / 1000,
+            "max_ms": h.max_us / 1000,
+            "exceptions": dict(self.exceptions),
+        }
+
+
+def user_crud_scenario(password: str = "load-test-password") -> Scenario:
+    """create -> get -> update -> delete, the flow the api suite exercises"""
+
+    def create(client, ctx):
+        resp = client.create_user(
+            email=f"load_{uuid.uuid4().hex[:12]}@example.com",
+            name="Load Test",
+            password=password
+        )
+        ctx["user_id"] = resp.get("id")
+        return resp
+
+    return Scenario("user_crud", [
+        Step("create_user", create, expect_status=201, schema=UserResponse),
+        Step("get_user", lambda c, ctx: c.get_user(ctx["user_id"]), expect_status=200, schema=UserResponse),
+        Step("update_user", lambda c, ctx: c.update_user(ctx["user_id"], name="Updated"),
+             expect_status=200, schema=UserResponse),
+        Step("delete_user", lambda c, ctx: c.delete_user(ctx["user_id"]), expect_status=204),
+    ])
+
+
+class _Pacer:
+    """hands out evenly spaced send slots for a target request rate"""
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps
+        self._next = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def next_slot(self) -> float:
+        with self._lock:
+            slot = self._next
+            self._next += self.interval
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return slot
+
+
+class LoadRunner:
+    """
+    Run scenarios from worker threads, one client per worker.
+
+    With `rps` set, requests are paced to that rate and latency is
+    measured from the scheduled send time, so a slow server shows up
+    as latency instead of silently lowering the request rate.
+
+    Steps with a schema are validated on 1 in `validate_every`
+    responses; a validation failure counts as an error, as does a
+    request that fails in transport (connection refused, timeout).
+    Any other exception is a bug in the scenario or client: it stops
+    that worker and run() re-raises it once all workers are done.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], UserServiceClient],
+        scenario: Scenario,
+        concurrency: int = 10,
+        rps: Optional[float] = None,
+        duration_s: Optional[float] = None,
+        iterations: Optional[int] = None,
+        validate_every: int = 1
+    ):
+        if duration_s is None and iterations is None:
+            raise ValueError("Set duration_s or iterations")
+
+        self.client_factory = client_factory
+        self.scenario = scenario
+        self.concurrency = concurrency
+        self.rps = rps
+        self.duration_s = duration_s
+        self.iterations = iterations
+        self.validator = SampledValidator(validate_every)
+        self.stats: dict[str, EndpointStats] = {
+            step.name: EndpointStats() for step in scenario.steps
+        }
+        self._lock = threading.Lock()
+        self._started = 0
+        self._elapsed_s = 0.0
+        self._crashes: list[BaseException] = []
+
+    def _claim_iteration(self, deadline: Optional[float]) -> bool:
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        with self._lock:
+            # a crashed worker fails the run; don't keep the others going
+            if self._crashes:
+                return False
+            if self.iterations is not None and self._started >= self.iterations:
+                return False
+            self._started += 1
+            return True
+
+    def _worker(self, deadline: Optional[float], pacer: Optional[_Pacer]) -> None:
+        try:
+            self._run_worker(deadline, pacer)
+        except BaseException as e:
+            with self._lock:
+                self._crashes.append(e)
+
+    def _run_worker(self, deadline: Optional[float], pacer: Optional[_Pacer]) -> None:
+        client = self.client_factory()
+        local = {name: EndpointStats() for name in self.stats}
+
+        while self._claim_iteration(deadline):
+            ctx: dict = {}
+            for step in self.scenario.steps:
+                start = pacer.next_slot() if pacer else time.perf_counter()
+                try:
+                    resp = step.action(client, ctx)
+                except requests.RequestException as e:
+                    resp = None
+                    name = type(e).__name__
+                    local[step.name].exceptions[name] = local[step.name].exceptions.get(name, 0) + 1
+
+                stats = local[step.name]
+                stats.histogram.record((time.perf_counter() - start) * 1_000_000)
+
+                if resp is None:
+                    failed = True
+                elif step.expect_status is not None:
+                    failed = resp.status_code != step.expect_status
+                else:
+                    failed = not resp.is_success
+
+                # validated after timing so schema cost stays out of latency
+                if not failed and step.schema is not None:
+                    try:
+                        self.validator(resp, step.schema)
+                    except ValueError:
+                        failed = True
+
+                if failed:
+                    stats.errors += 1
+                    # later steps depend on this one
+                    break
+
+        with self._lock:
+            for name, stats in local.items():
+                self.stats[name].histogram.merge(stats.histogram)
+                self.stats[name].errors += stats.errors
+                for exc_name, count in stats.exceptions.items():
+                    self.stats[name].exceptions[exc_name] = self.stats[name].exceptions.get(exc_name, 0) + count
+
+    def run(self) -> dict:
+        pacer = _Pacer(self.rps) if self.rps else None
+        start = time.perf_counter()
+        deadline = start + self.duration_s if self.duration_s else None
+
+        threads = [
+            threading.Thread(target=self._worker, args=(deadline, pacer), daemon=True)
+            for _ in range(self.concurrency)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self._elapsed_s = time.perf_counter() - start
+        if self._crashes:
+            raise self._crashes[0]
+        return self.summary()
+
+    def summary(self) -> dict:
+        total = LatencyHistogram()
+        errors = 0
+        exceptions: dict[str, int] = {}
+        for stats in self.stats.values():
+            total.merge(stats.histogram)
+            errors += stats.errors
+            for name, count in stats.exceptions.items():
+                exceptions[name] = exceptions.get(name, 0) + count
+        overall = EndpointStats(total, errors, exceptions).to_dict()
+
+        return {
+            "scenario": self.scenario.name,
+            "concurrency": self.concurrency,
+            "target_rps": self.rps,
+            "validated_responses": self.validator.validated,
+            "duration_s": round(self._elapsed_s, 3),
+            "achieved_rps": round(total.total / self._elapsed_s, 2) if self._elapsed_s else 0.0,
+            "overall": overall,
+            "endpoints": {name: s.to_dict() for name, s in self.stats.items()},
+        }
+
+    def write_summary(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def logged_in_factory(base_url: str, email: str, password: str) -> Callable[[], UserServiceClient]:
+    def _factory() -> UserServiceClient:
+        client = UserServiceClient(base_url)
+        client.login(email, password)
+        return client
+    return _factory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the user service")
+    parser.add_argument("--base-url", default=default_base_url())
+    parser.add_argument("--stub", action="store_true", help="run against a local stub server")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rps", type=float, default=None)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--validate-every", type=int, default=1,
+                        help="validate 1 in N responses against their schema")
+    parser.add_argument("--out", default="load_summary.json")
+    args = parser.parse_args()
+
+    stub = None
+    if args.stub:
+        from stub_server import StubUserService
+        stub = StubUserService().start()
+        base_url, email, password = stub.base_url, stub.email, stub.password
+    else:
+        base_url = args.base_url
+        email = os.getenv("TEST_USER_EMAIL", "")
+        password = os.getenv("TEST_USER_PASSWORD", "")
+
+    try:
+        runner = LoadRunner(
+            logged_in_factory(base_url, email, password),
+            user_crud_scenario(),
+            concurrency=args.concurrency,
+            rps=args.rps,
+            duration_s=args.duration,
+            validate_every=args.validate_every
+        )
+        summary = runner.run()
+        runner.write_summary(args.out)
+    finally:
+        if stub:
+            stub.stop()
+
+    print(json.dumps(summary["overall"], indent=2))
+    print(f"Summary written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Per-request timing breakdown for APIClient.
+
+requests' resp.elapsed only covers the time until headers arrive.
+TimingAdapter times the connection itself (DNS, TCP connect, TLS) around
+urllib3's own connection code and the surrounding client splits the rest into
+server time and body download, so a slow test can be pinned on the
+network or on the backend.
+
+Timings can be exported as JSON lines or as OTLP/JSON spans that any
+OpenTelemetry collector or viewer accepts.
+"""
+
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+import types
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import connection
+
+
+PHASES = ("dns", "connect", "tls", "server", "download")
+
+_local = threading.local()
+
+
+@dataclass
+class RequestTiming:
+    """Phase durations in milliseconds. Setup phases are 0 on reused connections."""
+    method: str
+    url: str
+    start_unix_ns: int
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    server_ms: float = 0.0
+    download_ms: float = 0.0
+    total_ms: float = 0.0
+    reused_connection: bool = True
+    test: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@contextmanager
+def track(method: str, url: str) -> Iterator[RequestTiming]:
+    """Collect timings for the request made inside the block on this thread."""
+    current = os.getenv("PYTEST_CURRENT_TEST")
+    timing = RequestTiming(
+        method=method,
+        url=url,
+        start_unix_ns=time.time_ns(),
+        test=current.rsplit(" ", 1)[0] if current else None
+    )
+    _local.timing = timing
+    _local.send_start = _local.headers_at = None
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        end = time.perf_counter()
+        _local.timing = None
+        timing.total_ms = (end - start) * 1000
+        if _local.headers_at is not None:
+            setup_ms = timing.dns_ms + timing.connect_ms + timing.tls_ms
+            sent_to_headers = (_local.headers_at - _local.send_start) * 1000
+            timing.server_ms = max(sent_to_headers - setup_ms, 0.0)
+            timing.download_ms = (end - _local.headers_at) * 1000
+
+
+def _current() -> Optional[RequestTiming]:
+    return getattr(_local, "timing", None)
+
+
+class _TimedSocketModule(types.ModuleType):
+    """
+    The `socket` urllib3's create_connection sees: the real module, with
+    getaddrinfo reporting its duration to track(). Everything else about
+    opening the connection (address family, fallback across addresses,
+    audit hook, error mapping) stays urllib3's own.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(socket, name)
+
+    @staticmethod
+    def getaddrinfo(*args, **kwargs):
+        timing = _current()
+        if timing is None:
+            return socket.getaddrinfo(*args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return socket.getaddrinfo(*args, **kwargs)
+        finally:
+            timing.dns_ms += (time.perf_counter() - t0) * 1000
+
+
+if not isinstance(connection.socket, _TimedSocketModule):
+    connection.socket = _TimedSocketModule("socket")
+
+
+class _TimedConnectMixin:
+
+    def _new_conn(self):
+        timing = _current()
+        if timing is None:
+            return super()._new_conn()
+
+        timing.reused_connection = False
+        dns_before = timing.dns_ms
+        t0 = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            # the lookup inside is counted as dns, the rest is connect
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            timing.connect_ms += max(elapsed_ms - (timing.dns_ms - dns_before), 0.0)
+
+
+class TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+
+    def connect(self) -> None:
+        timing = _current()
+        if timing is None:
+            return super().connect()
+
+        before = timing.dns_ms + timing.connect_ms
+        t0 = time.perf_counter()
+        super().connect()
+        # whatever connect() spent beyond opening the socket is the handshake
+        handshake_ms = (time.perf_counter() - t0) * 1000 - (timing.dns_ms + timing.connect_ms - before)
+        timing.tls_ms += max(handshake_ms, 0.0)
+
+
+class _TimedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class _TimedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report setup phases to track()."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPPool,
+            "https": _TimedHTTPSPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        if _current() is not None and _local.send_start is None:
+            _local.send_start = time.perf_counter()
+        resp = super().send(request, *args, **kwargs)
+        # body is read by the session after send returns
+        if _current() is not None:
+            _local.headers_at = time.perf_counter()
+        return resp
+
+
+# --- exporters ---
+
+class JsonlTraceExporter:
+    """post_request hook writing one JSON line per timed request."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a")
+        self._lock = threading.Lock()
+
+    def __call__(self, resp: Any) -> None:
+        if resp.timing is None:
+            return
+        record = {"status": resp.status_code, **resp.timing.to_dict()}
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class OtlpJsonExporter:
+    """
+    post_request hook collecting OTLP/JSON spans.
+
+    Each request becomes a client span with one child span per
+    non-zero phase; close() writes them in the OTLP/JSON file format.
+    """
+
+    def __init__(self, path: str, service_name: str = "api-tests"):
+        self.path = path
+        self.service_name = service_name
+        self.spans: list[dict] = []
+        self._lock = threading.Lock()
+
+    def _span(self, trace_id, span_id, parent_id, name, start_ns, end_ns, attributes) -> dict:
+        return {
+            "traceId": trace_id,
+            "spanId": span_id,
+            "parentSpanId": parent_id,
+            "name": name,
+            "kind": 3 if not parent_id else 1,  # CLIENT / INTERNAL
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [
+                {"key": k, "value": {"stringValue": str(v)} if isinstance(v, str) else {"intValue": str(v)}}
+                for k, v in attributes.items() if v is not None
+            ],
+        }
+
+    def __call__(self, resp: Any) -> None:
+        timing = resp.timing
+        if timing is None:
+            return
+
+        trace_id = secrets.token_hex(16)
+        root_id = secrets.token_hex(8)
+        start = timing.start_unix_ns
+        spans = [self._span(
+            trace_id, root_id, "", f"HTTP {timing.method}",
+            start, start + int(timing.total_ms * 1e6),
+            {
+                "http.request.method": timing.method,
+                "url.full": timing.url,
+                "http.response.status_code": resp.status_code,
+                "test.name": timing.test,
+            }
+        )]
+
+        cursor = start
+        for phase in PHASES:
+            duration_ns = int(getattr(timing, f"{phase}_ms") * 1e6)
+            if duration_ns:
+                spans.append(self._span(
+                    trace_id, secrets.token_hex(8), root_id, phase,
+                    cursor, cursor + duration_ns, {}
+                ))
+                cursor += duration_ns
+
+        with self._lock:
+            self.spans.extend(spans)
+
+    def close(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}}
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "api_client.request_timing"},
+                "spans": self.spans,
+            }],
+        }]}
+        with open(self.path, "w") as f:
+            json.dump(payload, f)
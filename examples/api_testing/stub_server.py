@@ -0,0 +1,256 @@
+"""
+Stub User Service.
+
+In-memory stand-in for the user API, so client-level tests
+and load runs can execute without the real backend.
+"""
+
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # default backlog of 5 drops connects under concurrent load
+    request_queue_size = 256
+
+
+class StubUserService:
+    """
+    Threaded HTTP server implementing the user endpoints.
+
+    Usage:
+        with StubUserService(email="qa@example.com", password="pw") as stub:
+            client = UserServiceClient(stub.base_url)
+    """
+
+    def __init__(
+        self,
+        email: str = "qa@example.com",
+        password: str = "stub-password",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0
+    ):
+        self.email = email
+        self.password = password
+        self.latency_ms = latency_ms
+        self.users: dict[str, dict] = {}
+        self.tokens: set[str] = set()
+        self.request_log: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubUserService":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubUserService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        """Drop all users, tokens and logged requests."""
+        with self._lock:
+            self.users.clear()
+            self.tokens.clear()
+            self.request_log.clear()
+
+    def seed_users(self, count: int) -> list[dict]:
+        """Insert users directly, bypassing the api."""
+        created = []
+        for i in range(count):
+            status, user = self._create_user({
+                "email": f"seed_{uuid.uuid4().hex[:8]}_{i}@example.com",
+                "name": f"Seed User {i}",
+            })
+            created.append(user)
+        return created
+
+    def count(self, method: str, path_prefix: str = "") -> int:
+        """Number of logged requests matching method and path prefix."""
+        with self._lock:
+            return sum(
+                1 for m, p in self.request_log
+                if m == method and p.startswith(path_prefix)
+            )
+
+    # --- request handling ---
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out as separate writes; avoid delayed-ack stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self, method: str):
+                parsed = urlparse(self.path)
+                with service._lock:
+                    service.request_log.append((method, parsed.path))
+
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+
+                if service.latency_ms:
+                    time.sleep(service.latency_ms / 1000)
+
+                auth = self.headers.get("Authorization", "")
+                status, payload = service._route(
+                    method, parsed.path, parse_qs(parsed.query), body, auth
+                )
+                self._send(status, payload)
+
+            def _send(self, status: int, payload: Optional[dict]):
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                if payload is not None:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if data:
+                    self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_PATCH(self):
+                self._dispatch("PATCH")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        return Handler
+
+    def _error(self, status: int, error: str, message: str) -> tuple[int, dict]:
+        return status, {"error": error, "message": message}
+
+    def _route(
+        self,
+        method: str,
+        path: str,
+        query: dict,
+        body: dict,
+        auth: str
+    ) -> tuple[int, Optional[dict]]:
+        path = path.rstrip("/")
+
+        if path == "/auth/login" and method == "POST":
+            if body.get("email") == self.email and body.get("password") == self.password:
+                token = uuid.uuid4().hex
+                with self._lock:
+                    self.tokens.add(token)
+                return 200, {"access_token": token, "token_type": "bearer", "expires_in": 3600}
+            return self._error(401, "unauthorized", "Invalid credentials")
+
+        if not path.startswith("/users"):
+            return self._error(404, "not_found", f"No route for {path}")
+
+        token = auth[len("Bearer "):] if auth.startswith("Bearer ") else ""
+        if token not in self.tokens:
+            return self._error(401, "unauthorized", "Missing or invalid token")
+
+        parts = path.split("/")[2:]
+        if not parts:
+            if method == "GET":
+                return self._list_users(query)
+            if method == "POST":
+                return self._create_user(body)
+            return self._error(405, "method_not_allowed", method)
+
+        user_id = parts[0]
+        with self._lock:
+            user = self.users.get(user_id)
+        if user is None:
+            return self._error(404, "not_found", f"User {user_id} not found")
+
+        if method == "GET":
+            return 200, user
+        if method in ("PUT", "PATCH"):
+            with self._lock:
+                user.update({k: v for k, v in body.items() if k in ("email", "name")})
+                user["updated_at"] = _now()
+            return 200, user
+        if method == "DELETE":
+            with self._lock:
+                self.users.pop(user_id, None)
+            return 204, None
+        return self._error(405, "method_not_allowed", method)
+
+    def _create_user(self, body: dict) -> tuple[int, dict]:
+        email = body.get("email") or ""
+        if not EMAIL_PATTERN.match(email):
+            return self._error(400, "validation_error", "Invalid email address")
+
+        with self._lock:
+            if any(u["email"] == email for u in self.users.values()):
+                return self._error(409, "conflict", "Email already registered")
+            user = {
+                "id": uuid.uuid4().hex,
+                "email": email,
+                "name": body.get("name", ""),
+                "created_at": _now(),
+                "updated_at": None,
+            }
+            self.users[user["id"]] = user
+        return 201, user
+
+    def _list_users(self, query: dict) -> tuple[int, dict]:
+        page = int(query.get("page", ["1"])[0])
+        limit = int(query.get("limit", ["20"])[0])
+        with self._lock:
+            users = list(self.users.values())
+        start = (page - 1) * limit
+        return 200, {
+            "users": users[start:start + limit],
+            "total": len(users),
+            "page": page,
+            "limit": limit,
+        }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+if __name__ == "__main__":
+    stub = StubUserService(port=8080)
+    print(f"Stub user service on {stub.base_url} (login: {stub.email})")
+    stub._server.serve_forever()
@@ -0,0 +1,610 @@
+import asyncio
+import base64
+import gzip
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import pytest
+import requests
+import urllib3.util.connection
+from pydantic import ValidationError
+from urllib3.exceptions import NewConnectionError
+
+import api_client
+from api_client import APIResponse, BulkRequestError, SampledValidator, UserServiceClient, validator_for
+from cassette import REDACTED, Cassette, CassetteMiss, redact_body, redact_headers
+from request_timing import JsonlTraceExporter, OtlpJsonExporter
+from async_api_client import AsyncUserServiceClient, gather_limited, shared_pool
+from schemas import UserListResponse, UserResponse
+from token_cache import TokenCache
+from user_pool import UserPool
+
+
+def closed_port() -> int:
+    """a local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# client-level tests, run against the in-memory stub server
+
+class TestAsyncClient:
+
+    def test_crud_flow(self, stub):
+        async def flow():
+            async with AsyncUserServiceClient(stub.base_url) as client:
+                login = await client.login(stub.email, stub.password)
+                assert login.is_success
+
+                created = await client.create_user("async@example.com", "Async", "pw")
+                assert created.status_code == 201
+                user_id = created.get("id")
+
+                fetched = await client.get_user(user_id)
+                assert fetched.get("email") == "async@example.com"
+
+                updated = await client.update_user(user_id, name="Renamed")
+                assert updated.get("name") == "Renamed"
+
+                deleted = await client.delete_user(user_id)
+                assert deleted.status_code == 204
+                assert deleted.json_data is None
+
+        asyncio.run(flow())
+
+    def test_base_url_from_shared_config(self, monkeypatch):
+        monkeypatch.setenv("API_BASE_URL", "http://api.test/v2")
+
+        assert AsyncUserServiceClient().base_url == "http://api.test/v2"
+        assert UserServiceClient().base_url == "http://api.test/v2"
+
+    def test_no_auth(self, stub):
+        async def flow():
+            async with AsyncUserServiceClient(stub.base_url) as client:
+                return await client.list_users()
+
+        assert asyncio.run(flow()).status_code == 401
+
+    def test_concurrent_flows_share_pool(self, stub):
+        stub.latency_ms = 20
+        flows = 200
+
+        async def one_flow(pool, i):
+            client = AsyncUserServiceClient(stub.base_url, pool=pool)
+            await client.login(stub.email, stub.password)
+            created = await client.create_user(f"user{i}@example.com", f"User {i}", "pw")
+            user_id = created.get("id")
+            await client.get_user(user_id)
+            await client.update_user(user_id, name=f"Updated {i}")
+            return (await client.delete_user(user_id)).status_code
+
+        async def run():
+            async with shared_pool(max_connections=100) as pool:
+                return await gather_limited(
+                    (one_flow(pool, i) for i in range(flows)), limit=flows
+                )
+
+        try:
+            start = time.perf_counter()
+            statuses = asyncio.run(run())
+            elapsed = time.perf_counter() - start
+        finally:
+            stub.latency_ms = 0
+
+        assert statuses == [204] * flows
+        assert not stub.users
+        # 1000 requests at 20ms each would take 20s one at a time
+        assert elapsed < 10, f"flows did not overlap: {elapsed:.1f}s"
+
+
+class TestLazyResponse:
+
+    def test_json_decoded_on_first_access(self, stub, monkeypatch):
+        calls = []
+        real_loads = api_client._loads
+        monkeypatch.setattr(api_client, "_loads", lambda b: calls.append(b) or real_loads(b))
+
+        client = UserServiceClient(stub.base_url)
+        resp = client.login(stub.email, stub.password)
+        assert len(calls) == 1  # login reads the token
+
+        listed = client.list_users()
+        assert listed.status_code == 200
+        assert len(calls) == 1
+
+        assert listed.json_data["page"] == 1
+        assert listed.get("limit") == 20
+        assert len(calls) == 2
+        assert resp.is_success
+
+    def test_empty_body_skips_decoding(self, stub):
+        client = UserServiceClient(stub.base_url)
+        client.login(stub.email, stub.password)
+        user_id = client.create_user("lazy@example.com", "Lazy", "pw").get("id")
+
+        resp = client.delete_user(user_id)
+
+        assert resp.status_code == 204
+        assert resp.json_data is None
+        assert resp.get("id") is None
+
+    def test_original_constructor_still_works(self):
+        data = {"id": "1", "email": "a@example.com", "name": "A", "created_at": "2024-01-01T00:00:00Z"}
+        positional = APIResponse(200, data, {"X-Id": "1"}, 5.0, None)
+        keyword = APIResponse(status_code=200, json_data=data, headers={"X-Id": "1"}, elapsed_ms=5.0, raw_response=None)
+
+        for resp in (positional, keyword):
+            assert resp.json_data is data
+            assert resp.get("email") == "a@example.com"
+            assert resp.headers == {"X-Id": "1"}
+            assert resp.validate(UserResponse).email == "a@example.com"
+        assert positional == keyword
+
+    def test_body_and_headers_are_views(self, stub):
+        resp = UserServiceClient(stub.base_url).list_users()
+
+        assert resp.body.obj is resp.content
+        assert resp.headers is resp.raw_response.headers
+        assert resp.headers["content-type"] == resp.headers["Content-Type"]
+
+
+class TestIterUsers:
+
+    @pytest.fixture
+    def client(self, stub):
+        client = UserServiceClient(stub.base_url)
+        client.login(stub.email, stub.password)
+        return client
+
+    @pytest.mark.parametrize("prefetch", [0, 1, 3])
+    def test_walks_every_page(self, stub, client, prefetch):
+        seeded = stub.seed_users(95)
+
+        users = list(client.iter_users(limit=10, prefetch=prefetch))
+
+        assert [u["id"] for u in users] == [u["id"] for u in seeded]
+        assert stub.count("GET", "/users") == 10
+
+    def test_exact_multiple_has_no_extra_request(self, stub, client):
+        stub.seed_users(40)
+
+        assert len(list(client.iter_users(limit=10))) == 40
+        assert stub.count("GET", "/users") == 4
+
+    def test_early_stop_without_prefetch(self, stub, client):
+        stub.seed_users(50)
+
+        first = list(islice(client.iter_users(limit=10, prefetch=0), 5))
+
+        assert len(first) == 5
+        assert stub.count("GET", "/users") == 1
+
+    def test_early_stop_bounds_prefetch(self, stub, client):
+        stub.seed_users(200)
+
+        gen = client.iter_users(limit=10, prefetch=2)
+        list(islice(gen, 15))
+        gen.close()
+
+        # current page plus at most the prefetch window
+        assert stub.count("GET", "/users") <= 4
+
+    def test_error_raises(self, stub):
+        with pytest.raises(requests.HTTPError):
+            next(UserServiceClient(stub.base_url).iter_users())
+
+
+class TestBulkProvisioning:
+
+    @pytest.fixture
+    def client(self, stub):
+        client = UserServiceClient(stub.base_url)
+        client.login(stub.email, stub.password)
+        return client
+
+    def test_bulk_create_and_delete(self, stub, client):
+        specs = [
+            {"email": f"bulk{i}@example.com", "name": f"Bulk {i}", "password": "pw"}
+            for i in range(30)
+        ]
+
+        created = client.bulk_create_users(specs, workers=10)
+
+        assert [r.status_code for r in created] == [201] * 30
+        assert [r.get("email") for r in created] == [s["email"] for s in specs]
+
+        deleted = client.bulk_delete_users([r.get("id") for r in created], workers=10)
+        assert [r.status_code for r in deleted] == [204] * 30
+        assert not stub.users
+
+    def test_bulk_create_is_concurrent(self, stub, client):
+        stub.latency_ms = 50
+        specs = [
+            {"email": f"slow{i}@example.com", "name": "Slow", "password": "pw"}
+            for i in range(20)
+        ]
+        try:
+            start = time.perf_counter()
+            client.bulk_create_users(specs, workers=10)
+            elapsed = time.perf_counter() - start
+        finally:
+            stub.latency_ms = 0
+
+        # serial would be ~1s
+        assert elapsed < 0.6
+
+    def test_pool_checkout_and_teardown(self, stub, client):
+        pool = UserPool(client, password="pw", size=5)
+
+        first = pool.checkout()
+        assert stub.count("POST", "/users") == 5
+        assert pool.available == 4
+
+        others = [pool.checkout() for _ in range(6)]
+        assert stub.count("POST", "/users") == 10
+        assert len({u["id"] for u in [first, *others]}) == 7
+
+        pool.checkin(first)
+        assert pool.checkout() is first
+
+        # a test deleting its own user must not break teardown
+        client.delete_user(others[0]["id"])
+        pool.teardown()
+
+        assert not stub.users
+        assert pool.failed_deletes == []
+
+    def test_partial_provision_is_still_torn_down(self, stub, client):
+        emails = iter(["p0@example.com", "p1@example.com", "p0@example.com", "p2@example.com"])
+        pool = UserPool(client, password="pw", workers=1,
+                        user_factory=lambda: {"email": next(emails), "name": "P", "password": "pw"})
+
+        with pytest.raises(RuntimeError, match="failed for 1/4 users: 409"):
+            pool.provision(4)
+
+        assert len(pool.created_ids) == 3
+        pool.teardown()
+        assert not stub.users
+
+    def test_raising_request_does_not_lose_the_others(self, stub, client, monkeypatch):
+        create = client.create_user
+
+        def flaky(email, name, password):
+            if email == "b3@example.com":
+                raise requests.ConnectionError("reset")
+            return create(email, name, password)
+
+        monkeypatch.setattr(client, "create_user", flaky)
+        specs = [{"email": f"b{i}@example.com", "name": "B", "password": "pw"} for i in range(6)]
+
+        with pytest.raises(BulkRequestError) as info:
+            client.bulk_create_users(specs, workers=3)
+
+        assert list(info.value.errors) == [3]
+        assert isinstance(info.value.__cause__, requests.ConnectionError)
+        statuses = [r and r.status_code for r in info.value.responses]
+        assert statuses == [201, 201, 201, None, 201, 201]
+        assert len(stub.users) == 5
+
+    def test_pool_tracks_users_created_before_a_raise(self, stub, client, monkeypatch):
+        create = client.create_user
+        calls = iter(range(100))
+
+        def flaky(**user):
+            if next(calls) == 1:
+                raise requests.ConnectionError("reset")
+            return create(**user)
+
+        monkeypatch.setattr(client, "create_user", flaky)
+        pool = UserPool(client, password="pw", size=4, workers=1)
+
+        with pytest.raises(BulkRequestError):
+            pool.checkout()
+
+        assert len(pool.created_ids) == 3
+        assert pool.available == 0
+        pool.teardown()
+        assert not stub.users
+
+    def test_pool_size_must_be_positive(self, client):
+        with pytest.raises(ValueError, match="at least 1"):
+            UserPool(client, password="pw", size=0)
+
+    def test_checkout_raises_when_provisioning_yields_nothing(self, client, monkeypatch):
+        monkeypatch.setattr(client, "bulk_create_users", lambda specs, workers: [])
+        pool = UserPool(client, password="pw", size=3)
+
+        with pytest.raises(RuntimeError, match="produced none"):
+            pool.checkout()
+
+
+class TestValidation:
+
+    @pytest.fixture
+    def client(self, stub):
+        client = UserServiceClient(stub.base_url)
+        client.login(stub.email, stub.password)
+        return client
+
+    def test_validate_from_raw_body(self, stub, client):
+        stub.seed_users(3)
+
+        page = client.list_users(limit=10).validate(UserListResponse)
+
+        assert page.total == 3
+        assert all(isinstance(u, UserResponse) for u in page.users)
+
+    def test_validator_is_cached(self):
+        assert validator_for(UserResponse) is validator_for(UserResponse)
+
+    def test_invalid_body_raises(self, stub, client):
+        resp = client.get_user("missing")
+
+        with pytest.raises(ValidationError):
+            resp.validate(UserResponse)
+
+    def test_sampling(self, stub, client):
+        stub.seed_users(1)
+        sampler = SampledValidator(every=4)
+
+        results = [sampler(client.list_users(), UserListResponse) for _ in range(10)]
+
+        assert sampler.validated == 3
+        assert sampler.skipped == 7
+        assert [r is not None for r in results] == [
+            True, False, False, False, True, False, False, False, True, False
+        ]
+
+
+class TestCassette:
+
+    def _client(self, stub, cassette):
+        client = UserServiceClient(stub.base_url, cassette=cassette)
+        client.login(stub.email, stub.password)
+        return client
+
+    def test_record_then_replay_offline(self, stub, tmp_path):
+        path = str(tmp_path / "users.jsonl.gz")
+
+        recorder = Cassette(path, mode="record")
+        client = self._client(stub, recorder)
+        user_id = client.create_user("rec@example.com", "Rec", "pw").get("id")
+        client.get_user(user_id)
+        client.delete_user(user_id)
+        client.get_user(user_id)
+        recorder.save()
+
+        stub.reset()
+        client = self._client(stub, Cassette(path, mode="replay"))
+
+        assert client.create_user("rec@example.com", "Rec", "pw").get("id") == user_id
+        assert client.get_user(user_id).status_code == 200
+        assert client.delete_user(user_id).status_code == 204
+        # same request replays in recorded order
+        missing = client.get_user(user_id)
+        assert missing.status_code == 404
+        with pytest.raises(requests.HTTPError):
+            missing.raw_response.raise_for_status()
+
+        assert stub.request_log == []
+
+    def test_credentials_are_redacted(self, stub, tmp_path):
+        path = str(tmp_path / "login.jsonl.gz")
+        recorder = Cassette(path, mode="record")
+        client = self._client(stub, recorder)
+        token = client.session.headers["Authorization"].split()[-1]
+        client.get_user(client.create_user("sec@example.com", "Sec", "pw").get("id"))
+        recorder.save()
+
+        with gzip.open(path, "rt") as f:
+            entries = [json.loads(line) for line in f]
+        bodies = [base64.b64decode(e["body"]) for e in entries]
+        assert not any(token.encode() in body for body in bodies)
+        assert json.loads(bodies[0])["access_token"] == REDACTED
+        # the rest of the body survives
+        assert json.loads(bodies[-1])["email"] == "sec@example.com"
+
+        # replay still authenticates, on the token's presence
+        replay = self._client(stub, Cassette(path, mode="replay"))
+        assert replay.session.headers["Authorization"] == f"Bearer {REDACTED}"
+
+    def test_redact_headers_and_nested_fields(self):
+        headers = redact_headers({"Set-Cookie": "sid=abc", "authorization": "Bearer x", "Content-Type": "text/plain"})
+        assert headers == {"Set-Cookie": REDACTED, "authorization": REDACTED, "Content-Type": "text/plain"}
+
+        body = redact_body(b'{"data": [{"id": 1, "refresh_token": "r"}], "token": "t"}')
+        assert json.loads(body) == {"data": [{"id": 1, "refresh_token": REDACTED}], "token": REDACTED}
+        assert redact_body(b"<html>access_token</html>") == b"<html>access_token</html>"
+
+    def test_replay_miss(self, stub, tmp_path):
+        path = str(tmp_path / "empty.jsonl.gz")
+        Cassette(path, mode="record").save()
+
+        client = UserServiceClient(stub.base_url, cassette=Cassette(path, mode="replay"))
+
+        with pytest.raises(CassetteMiss):
+            client.list_users()
+
+    def test_hybrid_caches_gets_until_write(self, stub):
+        cassette = Cassette("unused", mode="hybrid", ttl_s=60)
+        client = self._client(stub, cassette)
+        user_id = client.create_user("hyb@example.com", "Hyb", "pw").get("id")
+
+        client.get_user(user_id)
+        client.list_users()
+        client.get_user(user_id)
+        client.list_users()
+        assert stub.count("GET", "/users") == 2
+        assert cassette.hits == 2
+
+        client.update_user(user_id, name="Changed")
+
+        assert client.get_user(user_id).get("name") == "Changed"
+        client.list_users()
+        assert stub.count("GET", "/users") == 4
+
+    def test_hybrid_ttl_and_auth(self, stub):
+        cassette = Cassette("unused", mode="hybrid", ttl_s=0)
+        client = self._client(stub, cassette)
+
+        client.list_users()
+        client.list_users()
+        assert stub.count("GET", "/users") == 2
+
+        # an unauthenticated client must not see the cached answer
+        cassette.ttl_s = 60
+        client.list_users()
+        anon = UserServiceClient(stub.base_url, cassette=cassette)
+        assert anon.list_users().status_code == 401
+
+
+class TestTokenCache:
+
+    def test_one_login_across_threads_and_workers(self, stub, tmp_path):
+        # two caches on one directory stand in for two xdist workers
+        caches = [TokenCache(str(tmp_path)), TokenCache(str(tmp_path))]
+
+        def auth(i):
+            client = UserServiceClient(stub.base_url)
+            caches[i % 2].authenticate(client, stub.email, stub.password)
+            return client.list_users().status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(auth, range(32)))
+
+        assert statuses == [200] * 32
+        assert stub.count("POST", "/auth/login") == 1
+        assert sum(c.logins for c in caches) == 1
+
+    def test_refreshes_before_expiry(self, stub, tmp_path):
+        # stub tokens live 3600s, so this margin treats them as expiring
+        cache = TokenCache(str(tmp_path), refresh_margin_s=3600)
+        client = UserServiceClient(stub.base_url)
+
+        first = cache.get_token(client, stub.email, stub.password)
+        second = cache.get_token(client, stub.email, stub.password)
+
+        assert first != second
+        assert cache.logins == 2
+
+    def test_long_lived_client_refreshes_on_request(self, stub, tmp_path):
+        now = [1_000_000.0]
+        cache = TokenCache(str(tmp_path), refresh_margin_s=60, clock=lambda: now[0])
+        client = cache.authenticate(UserServiceClient(stub.base_url), stub.email, stub.password)
+        first = client.session.headers["Authorization"]
+
+        assert client.list_users().status_code == 200
+        assert cache.logins == 1
+
+        # stub tokens live 3600s; step into the refresh window
+        now[0] += 3600 - 59
+        assert client.list_users().status_code == 200
+        assert cache.logins == 2
+        assert client.session.headers["Authorization"] != first
+
+        client.list_users()
+        assert cache.logins == 2
+
+    def test_reauthenticating_keeps_one_hook(self, stub, tmp_path):
+        cache = TokenCache(str(tmp_path))
+        client = UserServiceClient(stub.base_url)
+        cache.authenticate(client, stub.email, stub.password)
+        cache.authenticate(client, stub.email, stub.password)
+
+        assert len(client.hooks["pre_request"]) == 1
+
+    def test_invalidate(self, stub, tmp_path):
+        cache = TokenCache(str(tmp_path))
+        client = UserServiceClient(stub.base_url)
+        cache.get_token(client, stub.email, stub.password)
+
+        cache.invalidate(stub.base_url, stub.email)
+        cache.get_token(client, stub.email, stub.password)
+
+        assert cache.logins == 2
+
+    def test_bad_credentials(self, stub, tmp_path):
+        with pytest.raises(RuntimeError):
+            TokenCache(str(tmp_path)).get_token(UserServiceClient(stub.base_url), stub.email, "nope")
+
+
+class TestRequestTiming:
+
+    def test_phase_breakdown(self, stub):
+        client = UserServiceClient(stub.base_url)
+        stub.latency_ms = 30
+        try:
+            first = client.list_users()
+            second = client.list_users()
+        finally:
+            stub.latency_ms = 0
+
+        assert not first.timing.reused_connection
+        assert first.timing.connect_ms > 0
+        assert second.timing.reused_connection
+        assert second.timing.connect_ms == second.timing.dns_ms == 0
+        # server-side latency lands in the server phase, not the network
+        assert second.timing.server_ms >= 30
+        assert second.timing.total_ms >= second.timing.server_ms + second.timing.download_ms
+
+    def test_lookup_counted_as_dns_through_urllib3(self, stub, monkeypatch):
+        families = []
+        real = socket.getaddrinfo
+
+        def slow_lookup(host, port, family=0, *args, **kwargs):
+            families.append(family)
+            time.sleep(0.02)
+            return real(host, port, family, *args, **kwargs)
+
+        monkeypatch.setattr(socket, "getaddrinfo", slow_lookup)
+        monkeypatch.setattr(urllib3.util.connection, "allowed_gai_family", lambda: socket.AF_INET)
+
+        resp = UserServiceClient(stub.base_url).list_users()
+
+        # urllib3's address family choice is kept, and the lookup isn't billed as connect
+        assert families == [socket.AF_INET]
+        assert resp.timing.dns_ms >= 20
+        assert resp.timing.connect_ms < resp.timing.dns_ms
+
+    def test_connect_errors_keep_urllib3_types(self):
+        with pytest.raises(requests.ConnectionError) as info:
+            UserServiceClient(f"http://127.0.0.1:{closed_port()}").list_users()
+        assert isinstance(info.value.args[0].reason, NewConnectionError)
+
+    def test_hooks(self, stub):
+        client = UserServiceClient(stub.base_url)
+        events = []
+        client.add_hook("pre_request", lambda method, url, kwargs: events.append(("pre", method)))
+        client.add_hook("post_request", lambda resp: events.append(("post", resp.status_code)))
+
+        client.login(stub.email, stub.password)
+
+        assert events == [("pre", "POST"), ("post", 200)]
+        with pytest.raises(ValueError):
+            client.add_hook("on_error", print)
+
+    def test_exporters(self, stub, tmp_path):
+        jsonl = JsonlTraceExporter(str(tmp_path / "trace.jsonl"))
+        otlp = OtlpJsonExporter(str(tmp_path / "trace.otlp.json"))
+        client = UserServiceClient(stub.base_url)
+        client.add_hook("post_request", jsonl)
+        client.add_hook("post_request", otlp)
+
+        client.list_users()
+        client.list_users()
+        jsonl.close()
+        otlp.close()
+
+        records = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+        assert [r["status"] for r in records] == [401, 401]
+        assert records[0]["test"].endswith("test_exporters")
+
+        spans = json.loads((tmp_path / "trace.otlp.json").read_text())[
+            "resourceSpans"][0]["scopeSpans"][0]["spans"]
+        roots = [s for s in spans if not s["parentSpanId"]]
+        assert [s["name"] for s in roots] == ["HTTP GET", "HTTP GET"]
+        assert {s["name"] for s in spans} >= {"connect", "server"}
@@ -0,0 +1,142 @@
+import json
+import time
+
+import pytest
+import requests
+
+from api_client import UserServiceClient
+from load_runner import (
+    LatencyHistogram,
+    LoadRunner,
+    Scenario,
+    Step,
+    logged_in_factory,
+    user_crud_scenario,
+)
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_within_precision(self):
+        hist = LatencyHistogram(significant_figures=3)
+        for value in range(1, 100_001):
+            hist.record(value)
+
+        assert hist.total == 100_000
+        assert hist.percentile(50) == pytest.approx(50_000, rel=1e-3)
+        assert hist.percentile(99) == pytest.approx(99_000, rel=1e-3)
+        assert hist.percentile(100) == hist.max_us == 100_000
+        assert hist.min_us == 1
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(20)
+        b.record(30)
+        a.merge(b)
+
+        assert a.total == 3
+        assert a.max_us == 30
+        assert a.mean_us == 20
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(99) == 0
+
+
+class TestLoadRunner:
+
+    def test_crud_scenario_summary(self, stub, tmp_path):
+        runner = LoadRunner(
+            logged_in_factory(stub.base_url, stub.email, stub.password),
+            user_crud_scenario(),
+            concurrency=8,
+            iterations=40
+        )
+        summary = runner.run()
+
+        assert summary["overall"]["count"] == 160
+        assert summary["overall"]["errors"] == 0
+        for name in ("create_user", "get_user", "update_user", "delete_user"):
+            stats = summary["endpoints"][name]
+            assert stats["count"] == 40
+            assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert not stub.users
+
+        out = tmp_path / "summary.json"
+        runner.write_summary(str(out))
+        assert json.loads(out.read_text())["scenario"] == "user_crud"
+
+    def test_target_rps(self, stub):
+        scenario = Scenario("list", [Step("list_users", lambda c, ctx: c.list_users())])
+        runner = LoadRunner(
+            logged_in_factory(stub.base_url, stub.email, stub.password),
+            scenario,
+            concurrency=4,
+            rps=50,
+            duration_s=1.0
+        )
+
+        summary = runner.run()
+
+        assert 35 <= summary["overall"]["count"] <= 60
+
+    def test_errors_recorded(self, stub):
+        # no login, every request is a 401
+        runner = LoadRunner(
+            logged_in_factory(stub.base_url, stub.email, "wrong"),
+            user_crud_scenario(),
+            concurrency=2,
+            iterations=5
+        )
+
+        summary = runner.run()
+
+        create = summary["endpoints"]["create_user"]
+        assert create["errors"] == 5
+        assert create["error_rate"] == 1.0
+        # dependent steps are skipped after a failure
+        assert summary["endpoints"]["get_user"]["count"] == 0
+
+    def test_transport_failures_counted_by_type(self, stub):
+        def flaky_create(client, ctx):
+            raise requests.ConnectionError("connection reset")
+
+        scenario = Scenario("flaky", [Step("create_user", flaky_create)])
+        summary = LoadRunner(lambda: UserServiceClient(stub.base_url), scenario, concurrency=2, iterations=4).run()
+
+        create = summary["endpoints"]["create_user"]
+        assert create["errors"] == 4
+        assert create["exceptions"] == {"ConnectionError": 4}
+        assert summary["overall"]["exceptions"] == {"ConnectionError": 4}
+
+    def test_scenario_bugs_are_raised(self, stub):
+        def broken(client, ctx):
+            return client.get_user(ctx["missing"])
+
+        scenario = Scenario("broken", [Step("get_user", broken)])
+        runner = LoadRunner(lambda: UserServiceClient(stub.base_url), scenario, concurrency=3, duration_s=30)
+
+        start = time.perf_counter()
+        with pytest.raises(KeyError, match="missing"):
+            runner.run()
+        # the crash ends the run instead of waiting out the duration
+        assert time.perf_counter() - start < 5
+
+    def test_sampled_validation(self, stub):
+        runner = LoadRunner(
+            logged_in_factory(stub.base_url, stub.email, stub.password),
+            user_crud_scenario(),
+            concurrency=2,
+            iterations=10,
+            validate_every=5
+        )
+
+        summary = runner.run()
+
+        # 30 responses carry a schema (create, get, update)
+        assert summary["validated_responses"] == 6
+        assert summary["overall"]["errors"] == 0
+
+    def test_needs_a_limit(self, stub):
+        with pytest.raises(ValueError):
+            LoadRunner(lambda: None, user_crud_scenario())
@@ -1,68 +1,56 @@
 import pytest
 import os
-from pydantic import BaseModel, EmailStr
-from typing import Optional
-from datetime import datetime
 
 from api_client import UserServiceClient
+from schemas import UserResponse, UserListResponse, ErrorResponse
+from user_pool import UserPool
 
 
 # Load test password from environment - never hardcode credentials
 TEST_PASSWORD = os.getenv("TEST_USER_PASSWORD", "")
 
 
-# response schemas
-class UserResponse(BaseModel):
-    id: str
-    email: EmailStr
-    name: str
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-
-    class Config:
-        extra = "forbid"
-
-
-class UserListResponse(BaseModel):
-    users: list[UserResponse]
-    total: int
-    page: int
-    limit: int
-
-
-class ErrorResponse(BaseModel):
-    error: str
-    message: str
-    details: Optional[dict] = None
-
-
 # fixtures
 
 @pytest.fixture
-def user_client(api_base_url):
-    return UserServiceClient(api_base_url)
-
-
-@pytest.fixture
-def auth_client(user_client, test_creds):
-    user_client.login(test_creds["email"], test_creds["password"])
-    return user_client
+def user_client(api_base_url, api_cassette, trace_exporters):
+    client = UserServiceClient(api_base_url, cassette=api_cassette)
+    for exporter in trace_exporters:
+        client.add_hook("post_request", exporter)
+    return client
 
 
 @pytest.fixture
-def created_user(auth_client, faker):
-    """create user for test, delete after"""
-    resp = auth_client.create_user(
-        email=faker.email(),
-        name=faker.name(),
-        password=TEST_PASSWORD
+def auth_client(user_client, test_creds, token_cache):
+    return token_cache.authenticate(user_client, test_creds["email"], test_creds["password"])
+
+
+@pytest.fixture(scope="session")
+def user_pool(api_base_url, test_creds, api_cassette, faker, token_cache):
+    """users provisioned in bulk once per session, deleted together at the end"""
+    client = UserServiceClient(api_base_url, cassette=api_cassette)
+    # outlives the token; authenticate() refreshes it as requests go out
+    token_cache.authenticate(client, test_creds["email"], test_creds["password"])
+
+    pool = UserPool(
+        client,
+        password=TEST_PASSWORD,
+        size=int(os.getenv("USER_POOL_SIZE", "10")),
+        user_factory=lambda: {
+            "email": faker.unique.email(),
+            "name": faker.name(),
+            "password": TEST_PASSWORD
+        }
     )
+    yield pool
+
+    pool.teardown()
 
-    user = resp.json_data
-    yield user
 
-    # cleanup
-    auth_client.delete_user(user["id"])
+@pytest.fixture
+def created_user(user_pool):
+    """fresh user for this test, cleaned up with the pool"""
+    return user_pool.checkout()
 
 
 # tests
@@ -82,7 +70,7 @@ class TestCreateUser:
         assert resp.status_code == 201
 
         # validate schema
-        user = UserResponse(**resp.json_data)
+        user = resp.validate(UserResponse)
         assert user.email == email
         assert user.name == name
 
@@ -103,7 +91,7 @@ class TestCreateUser:
         )
 
         assert resp.status_code == 400
-        err = ErrorResponse(**resp.json_data)
+        err = resp.validate(ErrorResponse)
         assert "email" in err.message.lower()
 
     def test_create_user_duplicate_email(self, auth_client, created_user):
@@ -122,7 +110,7 @@ class TestGetUser:
         resp = auth_client.get_user(created_user["id"])
 
         assert resp.status_code == 200
-        user = UserResponse(**resp.json_data)
+        user = resp.validate(UserResponse)
         assert user.id == created_user["id"]
 
     def test_get_user_not_found(self, auth_client):
@@ -143,7 +131,7 @@ class TestListUsers:
         resp = auth_client.list_users(page=1, limit=10)
 
         assert resp.status_code == 200
-        data = UserListResponse(**resp.json_data)
+        data = resp.validate(UserListResponse)
         assert data.page == 1
         assert data.limit == 10
         assert len(data.users) <= 10
@@ -157,7 +145,7 @@ class TestUpdateUser:
         resp = auth_client.update_user(created_user["id"], name=new_name)
 
         assert resp.status_code == 200
-        user = UserResponse(**resp.json_data)
+        user = resp.validate(UserResponse)
         assert user.name == new_name
 
 
@@ -0,0 +1,183 @@
+"""
+Shared bearer-token cache.
+
+Logs in once per credential and shares the token between tests,
+threads and pytest-xdist workers through small JSON files guarded
+by a file lock. Tokens are refreshed shortly before they expire
+instead of waiting for a 401, including on long-lived (session-scoped)
+clients: authenticate() re-checks the expiry as each request is sent.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from api_client import UserServiceClient
+
+try:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+
+    def _lock_file(f):
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(f):
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _jwt_exp(token: str) -> Optional[float]:
+    """exp claim of a JWT, None for opaque tokens"""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class TokenCache:
+    """
+    Usage:
+        cache = TokenCache(shared_dir)
+        cache.authenticate(client, email, password)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        refresh_margin_s: float = 60.0,
+        default_ttl_s: float = 900.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.directory = directory
+        self.clock = clock
+        self.refresh_margin_s = refresh_margin_s
+        self.default_ttl_s = default_ttl_s
+        self.logins = 0
+        self.hits = 0
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _key(self, base_url: str, email: str) -> str:
+        return hashlib.sha256(f"{base_url}|{email}".encode()).hexdigest()[:24]
+
+    @contextmanager
+    def _locked(self, key: str):
+        # thread lock first: flock is per process, not per thread
+        with self._locks_guard:
+            thread_lock = self._locks.setdefault(key, threading.Lock())
+        with thread_lock, open(os.path.join(self.directory, f"{key}.lock"), "a+") as f:
+            _lock_file(f)
+            try:
+                yield
+            finally:
+                _unlock_file(f)
+
+    def _read(self, path: str) -> Optional[dict]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: str, entry: dict) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def _fresh(self, expires_at: float) -> bool:
+        return expires_at - self.refresh_margin_s > self.clock()
+
+    def get_token(self, client: UserServiceClient, email: str, password: str) -> str:
+        """Cached token for these credentials, logging in only when needed."""
+        return self._entry(client, email, password)["token"]
+
+    def _entry(self, client: UserServiceClient, email: str, password: str) -> dict:
+        key = self._key(client.base_url, email)
+        path = os.path.join(self.directory, f"{key}.json")
+
+        with self._locked(key):
+            entry = self._read(path)
+            if entry and self._fresh(entry["expires_at"]):
+                self.hits += 1
+                return entry
+
+            resp = client.login(email, password)
+            token = resp.get("access_token")
+            if not resp.is_success or not token:
+                raise RuntimeError(f"Login failed for {email}: {resp.status_code}")
+            self.logins += 1
+
+            expires_in = resp.get("expires_in")
+            expires_at = (
+                self.clock() + float(expires_in) if expires_in
+                else _jwt_exp(token) or self.clock() + self.default_ttl_s
+            )
+            entry = {"token": token, "expires_at": expires_at}
+            self._write(path, entry)
+            return entry
+
+    def authenticate(self, client: UserServiceClient, email: str, password: str) -> UserServiceClient:
+        """
+        Put a cached token on `client` and keep it fresh: a pre_request
+        hook swaps in a new token once the current one is within the
+        refresh margin, so clients that outlive a token keep working.
+        """
+        refresh = _Refresh(self, client, email, password)
+        hooks = client.hooks["pre_request"]
+        hooks[:] = [h for h in hooks if not isinstance(h, _Refresh)]
+        refresh.renew()
+        hooks.append(refresh)
+        return client
+
+    def invalidate(self, base_url: str, email: str) -> None:
+        """Forget a token the server rejected."""
+        key = self._key(base_url, email)
+        with self._locked(key):
+            try:
+                os.remove(os.path.join(self.directory, f"{key}.json"))
+            except FileNotFoundError:
+                pass
+
+
+class _Refresh:
+    """pre_request hook behind TokenCache.authenticate"""
+
+    def __init__(self, cache: TokenCache, client: UserServiceClient, email: str, password: str):
+        self.cache = cache
+        self.client = client
+        self.email = email
+        self.password = password
+        self.expires_at = 0.0
+        # the login a renewal sends comes through this hook too
+        self._renewing = threading.local()
+
+    def renew(self) -> None:
+        self._renewing.active = True
+        try:
+            entry = self.cache._entry(self.client, self.email, self.password)
+        finally:
+            self._renewing.active = False
+        self.expires_at = entry["expires_at"]
+        self.client.set_auth_token(entry["token"])
+
+    def __call__(self, method: str, url: str, kwargs: dict) -> None:
+        if getattr(self._renewing, "active", False) or self.cache._fresh(self.expires_at):
+            return
+        self.renew()
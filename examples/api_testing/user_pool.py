@@ -0,0 +1,116 @@
+import threading
+import uuid
+from collections import deque
+from typing import Callable, Optional
+
+from api_client import BulkRequestError, UserServiceClient
+
+
+def _default_user(password: str) -> dict:
+    return {
+        "email": f"pool_{uuid.uuid4().hex[:12]}@example.com",
+        "name": "Pooled User",
+        "password": password,
+    }
+
+
+class UserPool:
+    """
+    Session-wide pool of pre-provisioned users.
+
+    Tests check users out instead of creating them inline. Users are
+    created in bulk on first use (and refilled in batches when the pool
+    runs dry), and every id the pool ever created is deleted in one
+    concurrent sweep by teardown().
+
+    Checked-out users are not handed out again unless checked back in,
+    so tests are free to modify them.
+    """
+
+    def __init__(
+        self,
+        client: UserServiceClient,
+        password: str,
+        size: int = 10,
+        workers: int = 8,
+        user_factory: Optional[Callable[[], dict]] = None
+    ):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got {size}")
+        self.client = client
+        self.size = size
+        self.workers = workers
+        self.user_factory = user_factory or (lambda: _default_user(password))
+        self.created_ids: set[str] = set()
+        self.failed_deletes: list[str] = []
+        self._available: deque[dict] = deque()
+        self._lock = threading.Lock()
+
+    def provision(self, count: int) -> list[dict]:
+        """Bulk-create `count` users and add them to the pool."""
+        specs = [self.user_factory() for _ in range(count)]
+        try:
+            responses, error = self.client.bulk_create_users(specs, workers=self.workers), None
+        except BulkRequestError as e:
+            responses, error = e.responses, e
+
+        done = [resp for resp in responses if resp is not None]
+        users = [resp.json_data for resp in done if resp.status_code == 201]
+        failed = [resp for resp in done if resp.status_code != 201]
+
+        with self._lock:
+            # track the ones that did get created, so teardown still deletes them
+            self.created_ids.update(u["id"] for u in users)
+            if not failed and error is None:
+                self._available.extend(users)
+        if error is not None:
+            raise error
+        if failed:
+            raise RuntimeError(
+                f"User provisioning failed for {len(failed)}/{len(responses)} users: "
+                f"{failed[0].status_code} {failed[0].json_data}"
+            )
+        return users
+
+    def checkout(self) -> dict:
+        """Take a user out of the pool, provisioning a batch if empty."""
+        while True:
+            with self._lock:
+                if self._available:
+                    return self._available.popleft()
+            # other threads may drain the new batch first; go round again
+            if not self.provision(self.size):
+                raise RuntimeError(f"Provisioning {self.size} users produced none")
+
+    def checkin(self, user: dict) -> None:
+        """Return an unmodified user so another test can use it."""
+        with self._lock:
+            self._available.appendleft(user)
+
+    def track(self, user_id: str) -> None:
+        """Register a user created outside the pool for teardown."""
+        with self._lock:
+            self.created_ids.add(user_id)
+
+    @property
+    def available(self) -> int:
+        return len(self._available)
+
+    def teardown(self) -> None:
+        """Delete every user the pool knows about."""
+        with self._lock:
+            ids = list(self.created_ids)
+            self.created_ids.clear()
+            self._available.clear()
+
+        try:
+            responses = self.client.bulk_delete_users(ids, workers=self.workers)
+        except BulkRequestError as e:
+            responses = e.responses
+        # 404 means a test already deleted it
+        self.failed_deletes = [
+            user_id for user_id, resp in zip(ids, responses)
+            if resp is None or resp.status_code not in (200, 204, 404)
+        ]
+        if self.failed_deletes:
+            print(f"Failed to delete pooled users: {self.failed_deletes}")
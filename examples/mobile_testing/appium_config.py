@@ -5,8 +5,9 @@ Demonstrates the Appium framework configuration I set up
 for iOS and Android testing.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+import threading
+from dataclasses import astuple, dataclass, field
+from typing import Optional, Union
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.options.ios import XCUITestOptions
@@ -21,6 +22,159 @@ class DeviceConfig:
     app_path: str
     automation_name: str
     udid: Optional[str] = None
+    # per-device Appium server and driver ports, so devices can run in parallel
+    server_url: Optional[str] = None
+    system_port: Optional[int] = None
+    wda_local_port: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        return self.udid or self.device_name
+
+
+@dataclass(frozen=True, eq=False)
+class CapabilityProfile:
+    """Named set of startup capabilities, per platform, on top of the device's own."""
+    name: str
+    description: str
+    android: dict = field(default_factory=dict)
+    ios: dict = field(default_factory=dict)
+
+    def for_platform(self, platform: str) -> dict:
+        return self.android if platform.lower() == "android" else self.ios
+
+
+PROFILES = {
+    profile.name: profile for profile in (
+        CapabilityProfile(
+            name="standard",
+            description="Keep the installed app and its data; the server and WDA are set up as usual",
+            android={
+                "noReset": True,
+                "fullReset": False,
+                "disableWindowAnimation": True,
+            },
+            ios={
+                "noReset": True,
+                "fullReset": False,
+                "wdaStartupRetries": 3,
+            },
+        ),
+        CapabilityProfile(
+            name="fastest-reuse",
+            description="Keep the installed app, server and data; needs a device a previous run already set up",
+            android={
+                "noReset": True,
+                "fullReset": False,
+                "skipServerInstallation": True,
+                "skipDeviceInitialization": True,
+                "disableWindowAnimation": True,
+            },
+            ios={
+                "noReset": True,
+                "fullReset": False,
+                "useNewWDA": False,
+                "usePrebuiltWDA": True,
+                "wdaStartupRetries": 3,
+            },
+        ),
+        CapabilityProfile(
+            name="clean-install",
+            description="Reinstall the app and set up the device from scratch; slowest, nothing carried over",
+            android={
+                "noReset": False,
+                "fullReset": True,
+                "skipServerInstallation": False,
+                "skipDeviceInitialization": False,
+            },
+            ios={
+                "noReset": False,
+                "fullReset": True,
+                "useNewWDA": True,
+                "wdaStartupRetries": 3,
+            },
+        ),
+        CapabilityProfile(
+            name="ci",
+            description="Keep the app installed but clear its data; no animations, permissions pre-granted",
+            android={
+                "noReset": False,
+                "fullReset": False,
+                "skipServerInstallation": True,
+                "skipDeviceInitialization": True,
+                "disableWindowAnimation": True,
+                "autoGrantPermissions": True,
+                "newCommandTimeout": 120,
+            },
+            ios={
+                "noReset": False,
+                "fullReset": False,
+                "useNewWDA": False,
+                "usePrebuiltWDA": True,
+                "wdaStartupRetries": 3,
+                "newCommandTimeout": 120,
+            },
+        ),
+    )
+}
+
+# the skip / prebuilt flags fail on a fresh emulator or simulator, so fastest-reuse is opt-in
+DEFAULT_PROFILE = "standard"
+
+_options_cache: dict[tuple, Union[UiAutomator2Options, XCUITestOptions]] = {}
+_options_lock = threading.Lock()
+
+
+def get_profile(profile: Union[str, CapabilityProfile, None] = None) -> CapabilityProfile:
+    if isinstance(profile, CapabilityProfile):
+        return profile
+    name = profile or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown capability profile: {name} (expected one of {sorted(PROFILES)})")
+    return PROFILES[name]
+
+
+def options_for(
+    config: DeviceConfig,
+    profile: Union[str, CapabilityProfile, None] = None
+) -> Union[UiAutomator2Options, XCUITestOptions]:
+    """
+    Options for `config` under a capability profile.
+
+    Resolved once per (profile, device) and cached; treat the returned
+    object as read-only.
+    """
+    profile = get_profile(profile)
+    key = (profile, astuple(config))
+    with _options_lock:
+        cached = _options_cache.get(key)
+        if cached is not None:
+            return cached
+
+    platform = config.platform_name.lower()
+    if platform == "android":
+        options = UiAutomator2Options()
+        if config.system_port:
+            options.system_port = config.system_port
+    elif platform == "ios":
+        options = XCUITestOptions()
+        if config.wda_local_port:
+            options.wda_local_port = config.wda_local_port
+    else:
+        raise ValueError(f"Unsupported platform: {config.platform_name}")
+
+    options.platform_name = config.platform_name
+    options.device_name = config.device_name
+    options.platform_version = config.platform_version
+    options.app = config.app_path
+    options.automation_name = config.automation_name
+    if config.udid:
+        options.udid = config.udid
+    for name, value in profile.for_platform(platform).items():
+        options.set_capability(name, value)
+
+    with _options_lock:
+        return _options_cache.setdefault(key, options)
 
 
 class AppiumDriver:
@@ -48,52 +202,35 @@ class AppiumDriver:
     @classmethod
     def create_android_driver(
         cls,
-        config: DeviceConfig = None
+        config: DeviceConfig = None,
+        profile: Union[str, CapabilityProfile, None] = None
     ) -> webdriver.Remote:
         """Create Android Appium driver."""
         config = config or cls.ANDROID_EMULATOR
-
-        options = UiAutomator2Options()
-        options.platform_name = config.platform_name
-        options.device_name = config.device_name
-        options.platform_version = config.platform_version
-        options.app = config.app_path
-        options.automation_name = config.automation_name
-
-        # Performance optimizations
-        options.set_capability("skipServerInstallation", True)
-        options.set_capability("skipDeviceInitialization", True)
-        options.set_capability("noReset", True)
-
-        return webdriver.Remote(cls.APPIUM_SERVER, options=options)
+        options = options_for(config, profile)
+        return webdriver.Remote(config.server_url or cls.APPIUM_SERVER, options=options)
 
     @classmethod
     def create_ios_driver(
         cls,
-        config: DeviceConfig = None
+        config: DeviceConfig = None,
+        profile: Union[str, CapabilityProfile, None] = None
     ) -> webdriver.Remote:
         """Create iOS Appium driver."""
         config = config or cls.IOS_SIMULATOR
-
-        options = XCUITestOptions()
-        options.platform_name = config.platform_name
-        options.device_name = config.device_name
-        options.platform_version = config.platform_version
-        options.app = config.app_path
-        options.automation_name = config.automation_name
-
-        # iOS-specific settings
-        options.set_capability("useNewWDA", False)
-        options.set_capability("wdaStartupRetries", 3)
-
-        return webdriver.Remote(cls.APPIUM_SERVER, options=options)
+        options = options_for(config, profile)
+        return webdriver.Remote(config.server_url or cls.APPIUM_SERVER, options=options)
 
     @classmethod
-    def create_driver(cls, platform: str) -> webdriver.Remote:
+    def create_driver(
+        cls,
+        platform: str,
+        profile: Union[str, CapabilityProfile, None] = None
+    ) -> webdriver.Remote:
         """Create driver based on platform."""
         if platform.lower() == "android":
-            return cls.create_android_driver()
+            return cls.create_android_driver(profile=profile)
         elif platform.lower() == "ios":
-            return cls.create_ios_driver()
+            return cls.create_ios_driver(profile=profile)
         else:
             raise ValueError(f"Unsupported platform: {platform}")
@@ -6,10 +6,20 @@ including device management and platform-specific setup.
 """
 
 import pytest
+import json
 import os
+import sys
 from appium import webdriver
-from appium.options.android import UiAutomator2Options
-from appium.options.ios import XCUITestOptions
+from selenium.common.exceptions import WebDriverException
+
+from appium_config import DEFAULT_PROFILE, DeviceConfig, get_profile, options_for
+from device_pool import DevicePool
+from flutter_scroll import SCROLL_STATS
+from session_reuse import STRATEGIES, AppState, ReusableSession
+
+# shared helpers live in examples/utilities
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "utilities"))
+from command_profiler import PROFILER  # noqa: E402
 
 
 def pytest_addoption(parser):
@@ -26,6 +36,18 @@ def pytest_addoption(parser):
         default="emulator",
         help="Device type: emulator, simulator, or real"
     )
+    parser.addoption(
+        "--appium-profile",
+        action="store",
+        default=os.getenv("APPIUM_PROFILE", DEFAULT_PROFILE),
+        help="Capability profile: standard (default), fastest-reuse, clean-install or ci"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", f"app_reset(strategy, url=None): how to reset the reused app session, one of {STRATEGIES}"
+    )
 
 
 @pytest.fixture(scope="session")
@@ -34,53 +56,171 @@ def platform(request):
     return request.config.getoption("--platform")
 
 
+@pytest.fixture(scope="session")
+def capability_profile(request):
+    """Startup capabilities shared by every session (see appium_config.PROFILES)."""
+    return get_profile(request.config.getoption("--appium-profile"))
+
+
 @pytest.fixture(scope="session")
 def appium_server():
     """Appium server URL."""
     return os.getenv("APPIUM_SERVER", "http://localhost:4723")
 
 
+def _default_device(platform: str, appium_server: str) -> DeviceConfig:
+    if platform == "android":
+        return DeviceConfig(
+            platform_name="Android",
+            device_name=os.getenv("ANDROID_DEVICE", "Pixel_6_API_33"),
+            platform_version=os.getenv("ANDROID_VERSION", "13.0"),
+            app_path=os.getenv("ANDROID_APP_PATH", "./apps/app-debug.apk"),
+            automation_name="UiAutomator2",
+            server_url=appium_server,
+        )
+    if platform != "ios":
+        raise ValueError(f"Unsupported platform: {platform}")
+    return DeviceConfig(
+        platform_name="iOS",
+        device_name=os.getenv("IOS_DEVICE", "iPhone 14 Pro"),
+        platform_version=os.getenv("IOS_VERSION", "16.0"),
+        app_path=os.getenv("IOS_APP_PATH", "./apps/App.app"),
+        automation_name="XCUITest",
+        server_url=appium_server,
+    )
+
+
+@pytest.fixture(scope="session")
+def device_pool(platform, appium_server, tmp_path_factory):
+    """
+    Devices this run can use.
+
+    DEVICES_FILE points to a JSON list of DeviceConfig fields, one entry
+    per emulator/simulator (distinct udid, server_url and ports), so
+    parallel workers each get their own. Without it the single device
+    from the env vars is used. Lock files live next to the xdist
+    workers' basetemps so all workers share them.
+    """
+    path = os.getenv("DEVICES_FILE")
+    if path:
+        with open(path) as f:
+            devices = [DeviceConfig(**entry) for entry in json.load(f)]
+    else:
+        devices = [_default_device(platform, appium_server)]
+
+    root = tmp_path_factory.getbasetemp()
+    if os.getenv("PYTEST_XDIST_WORKER"):
+        root = root.parent
+    pool = DevicePool(devices, lock_dir=str(root / "device_locks"))
+    yield pool
+    print(f"\nDevice pool: {pool.report()}")
+
+
+@pytest.fixture(scope="session")
+def app_session(platform, appium_server, capability_profile, device_pool):
+    """
+    One Appium session per worker, reset between tests instead of relaunched.
+
+    Each session holds a device lease until it is quit. DEVICE_LEASE_TIMEOUT
+    (seconds, default 30) caps the wait for a free device.
+    """
+    leases = {}
+
+    # short by default: with no free device, tests should fail, not stall
+    lease_timeout = float(os.getenv("DEVICE_LEASE_TIMEOUT", "30"))
+
+    def start():
+        device = device_pool.lease(platform, timeout=lease_timeout)
+        try:
+            driver = webdriver.Remote(
+                device.server_url or appium_server, options=options_for(device, capability_profile)
+            )
+            if os.getenv("PROFILE_COMMANDS"):
+                PROFILER.install(driver)
+            driver.implicitly_wait(10)
+        except WebDriverException:
+            device_pool.release(device, failed=True)
+            raise
+        leases[id(driver)] = device
+        return driver
+
+    def stop(driver, failed):
+        try:
+            driver.quit()
+        except WebDriverException:
+            failed = True
+        device_pool.release(leases.pop(id(driver)), failed=failed)
+
+    session = ReusableSession(start, stop)
+    yield session
+    session.discard()
+
+    report = session.report()
+    print(
+        f"\nApp session reuse: {report['reused']} tests reused {report['sessions']} session(s), "
+        f"~{report['saved_ms'] / 1000:.1f}s saved (session start+quit {report['session_cost_ms']:.0f}ms)"
+    )
+    for test, reuse in report["tests"].items():
+        print(f"  {test}: {reuse['strategy']} {reuse['reset_ms']:.0f}ms, saved {reuse['saved_ms']:.0f}ms")
+
+
 @pytest.fixture(scope="function")
-def mobile_driver(request, platform, appium_server):
+def mobile_driver(request, app_session):
     """
     Create mobile driver based on platform.
 
     Handles both Android and iOS with appropriate capabilities.
+    The worker's session is reused; the app is reset per the test's
+    app_reset marker (APP_RESET, default "restart", otherwise).
     """
-    if platform == "android":
-        options = UiAutomator2Options()
-        options.platform_name = "Android"
-        options.device_name = os.getenv("ANDROID_DEVICE", "Pixel_6_API_33")
-        options.platform_version = os.getenv("ANDROID_VERSION", "13.0")
-        options.app = os.getenv("ANDROID_APP_PATH", "./apps/app-debug.apk")
-        options.automation_name = "UiAutomator2"
-
-        # Performance optimizations
-        options.set_capability("skipServerInstallation", True)
-        options.set_capability("noReset", False)
-        options.set_capability("fullReset", False)
-
-    elif platform == "ios":
-        options = XCUITestOptions()
-        options.platform_name = "iOS"
-        options.device_name = os.getenv("IOS_DEVICE", "iPhone 14 Pro")
-        options.platform_version = os.getenv("IOS_VERSION", "16.0")
-        options.app = os.getenv("IOS_APP_PATH", "./apps/App.app")
-        options.automation_name = "XCUITest"
-
-        # iOS-specific
-        options.set_capability("useNewWDA", False)
-
-    else:
-        raise ValueError(f"Unsupported platform: {platform}")
+    marker = request.node.get_closest_marker("app_reset")
+    strategy = marker.args[0] if marker and marker.args else os.getenv("APP_RESET", "restart")
+    url = (marker.kwargs.get("url") if marker else None) or os.getenv("APP_START_URL")
 
-    driver = webdriver.Remote(appium_server, options=options)
-    driver.implicitly_wait(10)
+    if strategy == "fresh":
+        app_session.discard()
+        strategy = "none"
+    driver = app_session.acquire(request.node.nodeid, strategy, url)
 
     yield driver
 
-    # Cleanup
-    driver.quit()
+    # only a lost session or connection counts against the device
+    app_session.finish(getattr(request.node, "test_error", None))
+
+
+def pytest_sessionfinish(session):
+    directory = os.getenv("PROFILE_COMMANDS")
+    if directory and PROFILER.durations:
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        PROFILER.write(directory, f"-{worker}" if worker else "")
+
+
+def pytest_terminal_summary(terminalreporter):
+    report = SCROLL_STATS.report()
+    if report:
+        terminalreporter.write_sep("-", "flutter scroll lookups")
+        terminalreporter.write_line(
+            f"{report['lookups']} lookups, {report['round_trips']} round trips "
+            f"(p50 {report['round_trips_p50']}, max {report['round_trips_max']}), "
+            f"{report['not_found']} not found, by strategy {report['by_strategy']}, "
+            f"slowest {report['slowest']}"
+        )
+
+    commands = PROFILER.report()["commands"]
+    if commands:
+        terminalreporter.write_sep("-", "webdriver command latency")
+        for name, stat in list(commands.items())[:10]:
+            terminalreporter.write_line(
+                f"{name:<40} {stat['count']:>6}x  {stat['total_ms']:>9.0f}ms total  "
+                f"p50 {stat['p50_ms']:>7.1f}  p95 {stat['p95_ms']:>7.1f}  max {stat['max_ms']:>7.1f}"
+            )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    yield
+    if call.when == "call" and call.excinfo is not None:
+        item.test_error = call.excinfo.value
 
 
 @pytest.fixture
@@ -90,21 +230,4 @@ def app_state(mobile_driver):
 
     Provides methods to reset or prepare app state.
     """
-    class AppState:
-        def __init__(self, driver):
-            self.driver = driver
-
-        def reset_app(self):
-            """Reset app to initial state."""
-            self.driver.reset()
-
-        def clear_app_data(self):
-            """Clear all app data."""
-            self.driver.terminate_app(self.driver.current_package)
-            self.driver.activate_app(self.driver.current_package)
-
-        def background_app(self, seconds: int = 5):
-            """Send app to background."""
-            self.driver.background_app(seconds)
-
     return AppState(mobile_driver)
@@ -0,0 +1,298 @@
+"""
+Device Pool.
+
+Leases registered devices (emulators, simulators, real devices) to
+parallel workers, one test at a time per device. A device is checked
+before every lease; if it fails repeatedly it is recycled (e.g. the
+emulator restarted) or quarantined for a while, and the run continues
+on the others.
+
+Threads in one process share the pool directly. With `lock_dir` set,
+pytest-xdist workers also coordinate: a device is only handed out
+while its lock file is held, so two processes never drive it at once.
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from appium_config import DeviceConfig
+
+try:
+    import fcntl
+
+    def _try_lock(f) -> bool:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(f) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+
+    def _try_lock(f) -> bool:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(f) -> None:
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class NoDeviceAvailable(TimeoutError):
+    pass
+
+
+def server_ready(device: DeviceConfig, timeout: float = 3.0) -> bool:
+    """Default health check: the device's Appium server answers /status as ready."""
+    if not device.server_url:
+        return True
+    try:
+        with urllib.request.urlopen(f"{device.server_url.rstrip('/')}/status", timeout=timeout) as resp:
+            return bool(json.load(resp).get("value", {}).get("ready", True))
+    except (OSError, ValueError):
+        return False
+
+
+@dataclass
+class DeviceStats:
+    leases: int = 0
+    failures: int = 0
+    recycles: int = 0
+    health_failures: int = 0
+    busy_s: float = 0.0
+
+
+@dataclass
+class _Device:
+    config: DeviceConfig
+    stats: DeviceStats = field(default_factory=DeviceStats)
+    consecutive_failures: int = 0
+    quarantined_until: float = 0.0
+    # another process holds the lock file; try again after this
+    retry_at: float = 0.0
+    leased_at: Optional[float] = None
+    # being health-checked or recycled, outside the pool's lock
+    busy: bool = False
+    # failed its last health check; cleared by a passing one
+    unhealthy: bool = False
+    lock_file: Optional[TextIO] = None
+
+
+class DevicePool:
+    """
+    Usage:
+        pool = DevicePool(devices, recycle=restart_emulator)
+        with pool.leased("android") as device:
+            driver = AppiumDriver.create_android_driver(device)
+    """
+
+    def __init__(
+        self,
+        devices: Iterable[DeviceConfig] = (),
+        max_failures: int = 2,
+        quarantine_s: float = 60.0,
+        health_check: Callable[[DeviceConfig], bool] = server_ready,
+        recycle: Optional[Callable[[DeviceConfig], None]] = None,
+        lock_dir: Optional[str] = None
+    ):
+        self.max_failures = max_failures
+        self.quarantine_s = quarantine_s
+        self.health_check = health_check
+        self.recycle = recycle
+        self.lock_dir = lock_dir
+        self.started_at = time.monotonic()
+        self._devices: dict[str, _Device] = {}
+        self._cond = threading.Condition()
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        for device in devices:
+            self.register(device)
+
+    def register(self, device: DeviceConfig) -> None:
+        with self._cond:
+            if device.key in self._devices:
+                raise ValueError(f"Device {device.key} is already registered")
+            self._devices[device.key] = _Device(device)
+            self._cond.notify_all()
+
+    def lease(self, platform: Optional[str] = None, timeout: float = 300.0) -> DeviceConfig:
+        """
+        Block until a healthy device (of `platform`, if given) is free.
+
+        Raises NoDeviceAvailable at once when every matching device has
+        failed its health check, rather than waiting out their quarantine.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            device = self._reserve(platform, timeout, deadline)
+            if self._claim(device):
+                return device.config
+
+    def release(self, config: DeviceConfig, failed: bool = False) -> None:
+        """Return a device; `failed` means the device (not the test) misbehaved."""
+        with self._cond:
+            device = self._devices[config.key]
+            device.stats.busy_s += time.monotonic() - device.leased_at
+            device.leased_at = None
+            self._unlock_file(device)
+
+            if not failed:
+                device.consecutive_failures = 0
+                self._cond.notify_all()
+                return
+            device.stats.failures += 1
+            device.consecutive_failures += 1
+            if device.consecutive_failures < self.max_failures:
+                self._cond.notify_all()
+                return
+            device.consecutive_failures = 0
+            if self.recycle is None:
+                device.quarantined_until = time.monotonic() + self.quarantine_s
+                self._cond.notify_all()
+                return
+            device.busy = True
+
+        # restarting an emulator takes a while; don't hold up other leases
+        try:
+            self.recycle(device.config)
+            recycled = True
+        except Exception:
+            recycled = False
+        with self._cond:
+            device.busy = False
+            if recycled:
+                device.stats.recycles += 1
+            else:
+                device.quarantined_until = time.monotonic() + self.quarantine_s
+            self._cond.notify_all()
+
+    @contextmanager
+    def leased(self, platform: Optional[str] = None, timeout: float = 300.0) -> Iterator[DeviceConfig]:
+        device = self.lease(platform, timeout)
+        failed = False
+        try:
+            yield device
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(device, failed=failed)
+
+    def report(self) -> dict:
+        elapsed = time.monotonic() - self.started_at
+        with self._cond:
+            devices = {
+                key: {
+                    "leases": d.stats.leases,
+                    "failures": d.stats.failures,
+                    "recycles": d.stats.recycles,
+                    "health_failures": d.stats.health_failures,
+                    "busy_s": round(d.stats.busy_s, 2),
+                    "utilization": round(d.stats.busy_s / elapsed, 2) if elapsed else 0.0,
+                    "quarantined": d.quarantined_until > time.monotonic(),
+                }
+                for key, d in self._devices.items()
+            }
+        busy = sum(d["busy_s"] for d in devices.values())
+        return {
+            "devices": devices,
+            "elapsed_s": round(elapsed, 2),
+            "utilization": round(busy / (elapsed * len(devices)), 2) if devices and elapsed else 0.0,
+        }
+
+    # --- internals ---
+
+    def _matching(self, platform: Optional[str]) -> list[_Device]:
+        return [
+            d for d in self._devices.values()
+            if platform is None or d.config.platform_name.lower() == platform.lower()
+        ]
+
+    def _candidates(self, platform: Optional[str]) -> list[_Device]:
+        now = time.monotonic()
+        free = [
+            d for d in self._matching(platform)
+            if d.leased_at is None and not d.busy and d.quarantined_until <= now and d.retry_at <= now
+        ]
+        # spread the work: least used device first
+        return sorted(free, key=lambda d: d.stats.busy_s)
+
+    def _reserve(self, platform: Optional[str], timeout: float, deadline: float) -> _Device:
+        """Wait for a free device and mark it busy, so the checks can run without the lock."""
+        with self._cond:
+            while True:
+                free = self._candidates(platform)
+                if free:
+                    device = free[0]
+                    device.busy = True
+                    return device
+
+                matching = self._matching(platform)
+                if matching and all(d.unhealthy for d in matching):
+                    raise NoDeviceAvailable(f"Every {platform or 'device'} failed its health check")
+
+                now = time.monotonic()
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise NoDeviceAvailable(f"No {platform or 'device'} free within {timeout}s")
+                # wake up for releases, or when a quarantine or lock backoff ends
+                wakeups = [
+                    t - now for d in matching for t in (d.quarantined_until, d.retry_at) if t > now
+                ]
+                self._cond.wait(min([remaining, 1.0, *wakeups]))
+
+    def _claim(self, device: _Device) -> bool:
+        """Lock file and health check, outside the pool's lock; `device` is marked busy."""
+        locked = self._lock_file(device)
+        healthy = False
+        if locked:
+            try:
+                healthy = self.health_check(device.config)
+            except Exception:
+                healthy = False
+            if not healthy:
+                self._unlock_file(device)
+
+        with self._cond:
+            device.busy = False
+            now = time.monotonic()
+            if not locked:
+                # leased by another worker process
+                device.retry_at = now + 0.5
+            elif not healthy:
+                device.stats.health_failures += 1
+                device.unhealthy = True
+                device.quarantined_until = now + self.quarantine_s
+            else:
+                device.unhealthy = False
+                device.leased_at = now
+                device.stats.leases += 1
+            self._cond.notify_all()
+            return locked and healthy
+
+    def _lock_file(self, device: _Device) -> bool:
+        if not self.lock_dir:
+            return True
+        f = open(os.path.join(self.lock_dir, f"{device.config.key.replace(os.sep, '_')}.lock"), "a+")
+        if _try_lock(f):
+            device.lock_file = f
+            return True
+        f.close()
+        return False
+
+    def _unlock_file(self, device: _Device) -> None:
+        if device.lock_file is not None:
+            _unlock(device.lock_file)
+            device.lock_file.close()
+            device.lock_file = None
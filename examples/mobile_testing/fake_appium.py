@@ -0,0 +1,208 @@
+"""
+Fake Appium Server.
+
+Minimal W3C/Appium endpoint stand-in, so device pooling, session reuse
+and capability profiles can be tested without emulators. It answers
+session create/delete, /status, timeouts and the `mobile:` extensions
+the suite uses, and keeps a per-session app state. Other commands on
+a live session return null.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+
+# ApplicationState values from the Appium client
+NOT_RUNNING = 1
+RUNNING_IN_FOREGROUND = 4
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+
+class FakeAppiumServer:
+    """
+    Usage:
+        with FakeAppiumServer(session_latency_ms=200) as server:
+            driver = webdriver.Remote(server.url, options=options)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        session_latency_ms: float = 0,
+        app_package: str = "com.example.app",
+        capability_latency_ms: Optional[dict[str, float]] = None
+    ):
+        self.session_latency_ms = session_latency_ms
+        # extra start-up time when a capability is set and truthy, e.g. {"appium:fullReset": 500}
+        self.capability_latency_ms = capability_latency_ms or {}
+        self.app_package = app_package
+        self.ready = True
+        self.fail_next_sessions = 0
+        self.sessions: dict[str, dict] = {}
+        self.sessions_created = 0
+        self.command_log: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeAppiumServer":
+        # short poll interval so stop() doesn't stall test teardown
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeAppiumServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def kill_sessions(self) -> None:
+        """Drop every session, like a crashed UiAutomator2/WDA server."""
+        with self._lock:
+            self.sessions.clear()
+
+    def commands(self, name: str) -> int:
+        """Number of logged commands, e.g. commands("mobile: terminateApp")."""
+        with self._lock:
+            return sum(1 for _, command in self.command_log if command == name)
+
+    # --- request handling ---
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+                status, value = server._route(method, self.path.rstrip("/"), body)
+                data = json.dumps({"value": value}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        return Handler
+
+    def _error(self, status: int, error: str, message: str) -> tuple[int, dict]:
+        return status, {"error": error, "message": message, "stacktrace": ""}
+
+    def _route(self, method: str, path: str, body: dict) -> tuple[int, Any]:
+        if path == "/status":
+            if not self.ready:
+                return self._error(500, "unknown error", "server not ready")
+            return 200, {"ready": True, "message": "fake appium"}
+
+        if path == "/session" and method == "POST":
+            return self._create_session(body)
+
+        parts = path.split("/")
+        if len(parts) < 3 or parts[1] != "session":
+            return self._error(404, "unknown command", f"No route for {method} {path}")
+
+        session_id = parts[2]
+        command = "/".join(parts[3:])
+        with self._lock:
+            session = self.sessions.get(session_id)
+            self.command_log.append((session_id, self._command_name(method, command, body)))
+        if session is None:
+            return self._error(404, "invalid session id", f"Session {session_id} does not exist")
+
+        if method == "DELETE" and not command:
+            with self._lock:
+                self.sessions.pop(session_id, None)
+            return 200, None
+
+        if command == "execute/sync":
+            return self._execute(session, body.get("script", ""), (body.get("args") or [{}])[0])
+        return 200, None
+
+    def _command_name(self, method: str, command: str, body: dict) -> str:
+        if command == "execute/sync":
+            return body.get("script", "")
+        return f"{method} /{command}" if command else method
+
+    def _create_session(self, body: dict) -> tuple[int, Any]:
+        caps = dict(body.get("capabilities", {}).get("alwaysMatch", {}))
+        latency = self.session_latency_ms + sum(
+            ms for name, ms in self.capability_latency_ms.items() if caps.get(name)
+        )
+        if latency:
+            time.sleep(latency / 1000)
+        with self._lock:
+            self.command_log.append(("", "createSession"))
+            if self.fail_next_sessions:
+                self.fail_next_sessions -= 1
+                return self._error(500, "session not created", "device offline")
+
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = {"caps": caps, "app_state": RUNNING_IN_FOREGROUND}
+            self.sessions_created += 1
+        return 200, {"sessionId": session_id, "capabilities": caps}
+
+    def _execute(self, session: dict, script: str, args: dict) -> tuple[int, Any]:
+        if script == "mobile: terminateApp":
+            was_running = session["app_state"] != NOT_RUNNING
+            session["app_state"] = NOT_RUNNING
+            return 200, was_running
+        if script in ("mobile: activateApp", "mobile: deepLink"):
+            session["app_state"] = RUNNING_IN_FOREGROUND
+            return 200, None
+        if script == "mobile: clearApp":
+            session["app_state"] = NOT_RUNNING
+            return 200, None
+        if script == "mobile: queryAppState":
+            return 200, session["app_state"]
+        if script == "mobile: getCurrentPackage":
+            return 200, self.app_package
+        return 200, None
+
+
+if __name__ == "__main__":
+    with FakeAppiumServer(port=4723) as fake:
+        print(f"Fake Appium server on {fake.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,108 @@
+"""
+Flutter Finders and Waits.
+
+Serialized finders are built once per (kind, value) and reused, together
+with the FlutterElement wrapping them. Waits use the Flutter driver's own
+`flutter:waitFor` / `flutter:waitForAbsent`, which block inside the app
+until the widget tree matches, so there is no client-side polling and no
+dependence on the session's implicit wait.
+
+The Flutter driver has no multi-finder wait, so wait_for_all() sends one
+wait per widget under a single shared deadline: the first call absorbs
+the screen transition and the rest return on their first check.
+"""
+
+import threading
+import time
+from typing import Iterable, Optional
+
+from appium_flutter_finder.flutter_finder import FlutterElement, FlutterFinder
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+_TIMEOUTS = ("timeout", "timed out")
+
+
+class WidgetTimeout(TimeoutException):
+    pass
+
+
+class FinderCache:
+    """Serialized finders and their FlutterElements, built once per (kind, value)."""
+
+    KINDS = {
+        "key": "by_value_key",
+        "text": "by_text",
+        "type": "by_type",
+        "semantics": "by_semantics_label",
+        "tooltip": "by_tooltip",
+    }
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.finder = FlutterFinder()
+        self.hits = 0
+        self.misses = 0
+        self._elements: dict[tuple[str, object], FlutterElement] = {}
+        self._lock = threading.Lock()
+
+    def element(self, kind: str, value) -> FlutterElement:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown finder kind: {kind} (expected one of {sorted(self.KINDS)})")
+        with self._lock:
+            element = self._elements.get((kind, value))
+            if element is not None:
+                self.hits += 1
+                return element
+            self.misses += 1
+            serialized = getattr(self.finder, self.KINDS[kind])(value)
+            return self._elements.setdefault((kind, value), FlutterElement(self.driver, serialized))
+
+    def serialized(self, kind: str, value) -> str:
+        return self.element(kind, value).id
+
+
+class FlutterWaits:
+    """Native Flutter waits; `round_trips` counts the wait commands sent."""
+
+    def __init__(self, driver, timeout_s: float = 10.0):
+        self.driver = driver
+        self.timeout_s = timeout_s
+        self.round_trips = 0
+
+    def wait_for(self, element: FlutterElement, timeout_s: Optional[float] = None, label: Optional[str] = None) -> FlutterElement:
+        """Block until the widget is in the tree."""
+        self._wait("flutter:waitFor", element, timeout_s, f"{label or element.id} did not appear")
+        return element
+
+    def wait_for_absent(self, element: FlutterElement, timeout_s: Optional[float] = None, label: Optional[str] = None) -> None:
+        """Block until the widget has left the tree."""
+        self._wait("flutter:waitForAbsent", element, timeout_s, f"{label or element.id} did not go away")
+
+    def wait_for_all(
+        self,
+        elements: Iterable[FlutterElement],
+        timeout_s: Optional[float] = None,
+        labels: Optional[Iterable[str]] = None
+    ) -> list[FlutterElement]:
+        """Block until every widget is in the tree, all within one timeout."""
+        elements = list(elements)
+        labels = list(labels) if labels is not None else [e.id for e in elements]
+        deadline = time.monotonic() + (self.timeout_s if timeout_s is None else timeout_s)
+        for element, label in zip(elements, labels):
+            # at least a moment per widget, so ones already present still pass
+            remaining = max(deadline - time.monotonic(), 0.05)
+            self.wait_for(element, remaining, label)
+        return elements
+
+    def _wait(self, command: str, element: FlutterElement, timeout_s: Optional[float], message: str) -> None:
+        timeout_ms = int((self.timeout_s if timeout_s is None else timeout_s) * 1000)
+        self.round_trips += 1
+        try:
+            self.driver.execute_script(command, element.id, timeout_ms)
+        except TimeoutException as e:
+            raise WidgetTimeout(f"{message} within {timeout_ms}ms: {e.msg}") from e
+        except WebDriverException as e:
+            # the Flutter driver reports its timeouts as plain errors; anything else is real
+            if not any(marker in (e.msg or "").lower() for marker in _TIMEOUTS):
+                raise
+            raise WidgetTimeout(f"{message} within {timeout_ms}ms: {e.msg}") from e
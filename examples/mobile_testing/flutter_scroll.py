@@ -0,0 +1,225 @@
+"""
+Flutter Scroll Engine.
+
+Brings a widget inside a scroll view into view in as few Appium round
+trips as possible:
+
+1. `flutter:scrollIntoView` - one call when the widget is already built
+   (on screen or in the list's cache extent).
+2. `flutter:scrollUntilVisible` - one call that scrolls on the device
+   until the widget shows up, for lazily built lists.
+3. Stepped `flutter:scroll` + probe, for Flutter driver builds without
+   the command above.
+
+Scroll steps are sized to the scroll view's viewport, and a lookup is
+capped by time rather than by number of scrolls. Each lookup's round
+trips are recorded in SCROLL_STATS.
+"""
+
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchDriverException,
+    NoSuchElementException,
+    TimeoutException,
+    UnknownMethodException,
+    WebDriverException,
+)
+
+
+# messages Flutter/Appium use when a driver build lacks a command
+_UNSUPPORTED = ("not supported", "not implemented", "unknown command", "unsupported")
+# "not there (yet)"; any other error is real and propagates
+_MISSES = ("timeout", "timed out", "not found", "no such element")
+
+
+class ScrollTimeout(TimeoutException):
+    pass
+
+
+@dataclass
+class ScrollLookup:
+    target: str
+    strategy: str
+    round_trips: int
+    elapsed_ms: float
+    found: bool
+
+
+class ScrollStats:
+    """Round trips per lookup, across the run."""
+
+    def __init__(self):
+        self.lookups: list[ScrollLookup] = []
+        self._lock = threading.Lock()
+
+    def record(self, lookup: ScrollLookup) -> None:
+        with self._lock:
+            self.lookups.append(lookup)
+
+    def report(self) -> dict:
+        with self._lock:
+            lookups = list(self.lookups)
+        if not lookups:
+            return {}
+        trips = sorted(lookup.round_trips for lookup in lookups)
+        return {
+            "lookups": len(lookups),
+            "not_found": sum(1 for lookup in lookups if not lookup.found),
+            "round_trips": sum(trips),
+            "round_trips_p50": trips[len(trips) // 2],
+            "round_trips_max": trips[-1],
+            "by_strategy": dict(Counter(lookup.strategy for lookup in lookups)),
+            "slowest": max(lookups, key=lambda lookup: lookup.elapsed_ms).target,
+        }
+
+
+SCROLL_STATS = ScrollStats()
+
+
+class ScrollEngine:
+    """
+    Usage:
+        engine = ScrollEngine(driver)
+        engine.scroll_until_visible(finder.by_value_key("list"), finder.by_value_key("item_42"))
+
+    Finders are the serialized strings appium-flutter-finder produces.
+    """
+
+    def __init__(
+        self,
+        driver,
+        timeout_s: float = 15.0,
+        overlap: float = 0.2,
+        probe_ms: int = 250,
+        stats: ScrollStats = SCROLL_STATS
+    ):
+        self.driver = driver
+        self.timeout_s = timeout_s
+        self.overlap = overlap
+        self.probe_ms = probe_ms
+        self.stats = stats
+        self.unsupported: set[str] = set()
+        self._viewports: dict[str, float] = {}
+        self._round_trips = 0
+
+    def scroll_until_visible(
+        self,
+        scroll_view: str,
+        target: str,
+        timeout_s: Optional[float] = None,
+        direction: str = "down",
+        label: Optional[str] = None
+    ) -> str:
+        """Scroll `scroll_view` until `target` is on screen; returns `target`."""
+        if direction not in ("down", "up"):
+            raise ValueError(f"direction must be 'down' or 'up', not {direction!r}")
+        timeout_s = self.timeout_s if timeout_s is None else timeout_s
+        deadline = time.monotonic() + timeout_s
+        self._round_trips = 0
+        start = time.perf_counter()
+        strategy, error = "scrollIntoView", None
+
+        found = self._probe(target)
+        if not found and "flutter:scrollUntilVisible" not in self.unsupported:
+            strategy = "scrollUntilVisible"
+            found, error = self._scroll_until_visible(scroll_view, target, deadline, direction)
+        if not found and "flutter:scrollUntilVisible" in self.unsupported:
+            strategy = "stepped"
+            found, error = self._stepped(scroll_view, target, deadline, direction)
+
+        self.stats.record(ScrollLookup(
+            target=label or target,
+            strategy=strategy,
+            round_trips=self._round_trips,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            found=found,
+        ))
+        if not found:
+            raise ScrollTimeout(
+                f"{label or target} not visible after {timeout_s}s of scrolling "
+                f"({self._round_trips} round trips, {strategy})"
+                + (f": {error.msg}" if error is not None else "")
+            )
+        return target
+
+    def viewport_delta(self, scroll_view: str) -> float:
+        """Scroll step: the viewport's height less some overlap, so nothing is skipped."""
+        if scroll_view not in self._viewports:
+            try:
+                top = self._call("flutter:getTopLeft", scroll_view)
+                bottom = self._call("flutter:getBottomRight", scroll_view)
+                self._viewports[scroll_view] = float(bottom["dy"]) - float(top["dy"])
+            except (WebDriverException, KeyError, TypeError):
+                self._viewports[scroll_view] = 0.0
+        height = self._viewports[scroll_view]
+        return height * (1 - self.overlap) if height > 0 else 300.0
+
+    # --- strategies ---
+
+    def _probe(self, target: str) -> bool:
+        """One-call check: scrolls the target fully into view if it is built."""
+        if "flutter:scrollIntoView" not in self.unsupported:
+            ok, _ = self._attempt("flutter:scrollIntoView", target, {"alignment": 0.1, "timeout": self.probe_ms})
+            if ok or "flutter:scrollIntoView" not in self.unsupported:
+                return ok
+        # older drivers: the widget being built is the best signal there is
+        return self._attempt("flutter:waitFor", target, self.probe_ms)[0]
+
+    def _scroll_until_visible(self, scroll_view, target, deadline, direction):
+        delta = self.viewport_delta(scroll_view)
+        remaining_ms = int(max(deadline - time.monotonic(), 0) * 1000)
+        return self._attempt("flutter:scrollUntilVisible", scroll_view, {
+            "item": target,
+            "dxScroll": 0,
+            "dyScroll": -delta if direction == "down" else delta,
+            "waitTimeoutMilliseconds": remaining_ms,
+        })
+
+    def _stepped(self, scroll_view, target, deadline, direction):
+        delta = self.viewport_delta(scroll_view)
+        while time.monotonic() < deadline:
+            self._call("flutter:scroll", scroll_view, {
+                "dx": 0,
+                "dy": -delta if direction == "down" else delta,
+                "durationMilliseconds": 100,
+                "frequency": 30,
+            })
+            if self._probe(target):
+                return True, None
+        return False, None
+
+    # --- round trips ---
+
+    def _call(self, command: str, *args):
+        self._round_trips += 1
+        return self.driver.execute_script(command, *args)
+
+    def _attempt(self, command: str, *args) -> tuple[bool, Optional[WebDriverException]]:
+        """
+        (ok, error) for a lookup that may miss; commands this Flutter driver
+        lacks are remembered and skipped, and errors other than a miss raise.
+        """
+        try:
+            self._call(command, *args)
+            return True, None
+        except UnknownMethodException as e:
+            self.unsupported.add(command)
+            return False, e
+        except (InvalidSessionIdException, NoSuchDriverException):
+            raise
+        except (TimeoutException, NoSuchElementException) as e:
+            return False, e
+        except WebDriverException as e:
+            message = (e.msg or "").lower()
+            if any(marker in message for marker in _UNSUPPORTED):
+                self.unsupported.add(command)
+                return False, e
+            if any(marker in message for marker in _MISSES):
+                return False, e
+            raise
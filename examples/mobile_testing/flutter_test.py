@@ -9,7 +9,10 @@ import pytest
 import os
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
-from appium_flutter_finder.flutter_finder import FlutterFinder, FlutterElement
+from appium_flutter_finder.flutter_finder import FlutterElement
+
+from flutter_finders import FinderCache, FlutterWaits
+from flutter_scroll import ScrollEngine
 
 
 # Load credentials from environment - never hardcode
@@ -20,25 +23,39 @@ TEST_USER_PASSWORD = os.getenv("TEST_USER_PASSWORD", "")
 class FlutterDriver:
     """Extended driver for Flutter app testing."""
 
-    def __init__(self, driver: webdriver.Remote):
+    def __init__(self, driver: webdriver.Remote, timeout_s: float = 10.0):
         self.driver = driver
-        self.finder = FlutterFinder(driver)
+        self.finders = FinderCache(driver)
+        self.waits = FlutterWaits(driver, timeout_s)
+        self.scroller = ScrollEngine(driver)
 
     def find_by_key(self, key: str) -> FlutterElement:
         """Find Flutter widget by ValueKey."""
-        return self.finder.by_value_key(key)
+        return self.finders.element("key", key)
 
     def find_by_text(self, text: str) -> FlutterElement:
         """Find Flutter widget by text content."""
-        return self.finder.by_text(text)
+        return self.finders.element("text", text)
 
     def find_by_type(self, widget_type: str) -> FlutterElement:
         """Find Flutter widget by type (e.g., 'TextField')."""
-        return self.finder.by_type(widget_type)
+        return self.finders.element("type", widget_type)
 
     def find_by_semantics_label(self, label: str) -> FlutterElement:
         """Find Flutter widget by semantics label."""
-        return self.finder.by_semantics_label(label)
+        return self.finders.element("semantics", label)
+
+    def wait_for(self, key: str, timeout_s: float = None) -> FlutterElement:
+        """Wait until the widget with this ValueKey is rendered."""
+        return self.waits.wait_for(self.find_by_key(key), timeout_s, label=key)
+
+    def wait_for_absent(self, key: str, timeout_s: float = None) -> None:
+        """Wait until the widget with this ValueKey is gone (spinners, dialogs)."""
+        self.waits.wait_for_absent(self.find_by_key(key), timeout_s, label=key)
+
+    def wait_for_all(self, *keys: str, timeout_s: float = None) -> list[FlutterElement]:
+        """Wait for several widgets under one timeout; returns them in order."""
+        return self.waits.wait_for_all([self.find_by_key(key) for key in keys], timeout_s, labels=keys)
 
     def tap(self, element: FlutterElement) -> None:
         """Tap on a Flutter element."""
@@ -52,23 +69,22 @@ class FlutterDriver:
         self,
         scroll_view_key: str,
         target_key: str,
-        max_scrolls: int = 10
+        timeout_s: float = 15.0,
+        direction: str = "down"
     ) -> FlutterElement:
-        """Scroll within a Flutter ScrollView until target is visible."""
-        scroll_view = self.find_by_key(scroll_view_key)
-
-        for _ in range(max_scrolls):
-            try:
-                target = self.find_by_key(target_key)
-                if target.is_displayed():
-                    return target
-            except Exception:
-                pass
-
-            # Scroll down
-            self.finder.scroll(scroll_view, delta_x=0, delta_y=-300)
-
-        raise Exception(f"Element {target_key} not found after scrolling")
+        """
+        Scroll within a Flutter ScrollView until target is visible.
+
+        Raises ScrollTimeout when it is still not visible after `timeout_s`.
+        """
+        self.scroller.scroll_until_visible(
+            self.finders.serialized("key", scroll_view_key),
+            self.finders.serialized("key", target_key),
+            timeout_s=timeout_s,
+            direction=direction,
+            label=target_key,
+        )
+        return self.find_by_key(target_key)
 
 
 class TestFlutterLogin:
@@ -81,10 +97,10 @@ class TestFlutterLogin:
 
     def test_login_with_valid_credentials(self, flutter_driver):
         """Test successful login in Flutter app."""
-        # Find widgets by ValueKey (set in Flutter code)
-        username_field = flutter_driver.find_by_key("username_input")
-        password_field = flutter_driver.find_by_key("password_input")
-        login_button = flutter_driver.find_by_key("login_button")
+        # Find widgets by ValueKey (set in Flutter code), once the form is rendered
+        username_field, password_field, login_button = flutter_driver.wait_for_all(
+            "username_input", "password_input", "login_button"
+        )
 
         # Perform login - credentials loaded from environment
         flutter_driver.enter_text(username_field, TEST_USER_EMAIL)
@@ -92,7 +108,7 @@ class TestFlutterLogin:
         flutter_driver.tap(login_button)
 
         # Verify navigation to home screen
-        home_title = flutter_driver.find_by_key("home_screen_title")
+        home_title = flutter_driver.wait_for("home_screen_title")
         assert home_title.text == "Welcome"
 
     def test_login_validation_error(self, flutter_driver):
@@ -103,7 +119,7 @@ class TestFlutterLogin:
         flutter_driver.tap(login_button)
 
         # Verify error message
-        error_text = flutter_driver.find_by_key("error_message")
+        error_text = flutter_driver.wait_for("error_message")
         assert "required" in error_text.text.lower()
 
     def test_scroll_to_terms_link(self, flutter_driver):
@@ -116,5 +132,5 @@ class TestFlutterLogin:
         flutter_driver.tap(terms_link)
 
         # Verify navigation
-        terms_title = flutter_driver.find_by_key("terms_page_title")
+        terms_title = flutter_driver.wait_for("terms_page_title")
         assert terms_title.is_displayed()
@@ -0,0 +1,102 @@
+"""
+Session start-up latency per capability profile.
+
+Creates and quits sessions on one device under each profile, rounds
+interleaved so device warm-up or a busy host does not favour one
+profile, and reports the median and worst time per profile.
+
+Usage:
+    python profile_benchmark.py --platform android --runs 5
+    python profile_benchmark.py --devices-file devices.json --profile fastest-reuse --profile ci
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import replace
+
+from appium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from appium_config import AppiumDriver, DeviceConfig, PROFILES, get_profile, options_for
+
+
+def _time_session(device: DeviceConfig, profile_name: str) -> dict:
+    start = time.perf_counter()
+    options = options_for(device, profile_name)
+    resolve_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    driver = webdriver.Remote(device.server_url or AppiumDriver.APPIUM_SERVER, options=options)
+    create_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    driver.quit()
+    return {"resolve_ms": resolve_ms, "create_ms": create_ms, "quit_ms": (time.perf_counter() - start) * 1000}
+
+
+def benchmark_profiles(device: DeviceConfig, profiles: list[str] = None, runs: int = 3) -> dict:
+    """Median/max session create and quit time per profile."""
+    profiles = [get_profile(name).name for name in (profiles or PROFILES)]
+    samples: dict[str, list[dict]] = {name: [] for name in profiles}
+    errors: dict[str, list[str]] = {name: [] for name in profiles}
+
+    for _ in range(runs):
+        for name in profiles:
+            try:
+                samples[name].append(_time_session(device, name))
+            except WebDriverException as e:
+                errors[name].append(e.msg or type(e).__name__)
+
+    report = {}
+    for name in profiles:
+        rows = samples[name]
+        report[name] = {"runs": len(rows), "errors": errors[name]}
+        if rows:
+            create = [row["create_ms"] for row in rows]
+            report[name].update(
+                create_p50_ms=round(statistics.median(create), 1),
+                create_max_ms=round(max(create), 1),
+                quit_p50_ms=round(statistics.median(row["quit_ms"] for row in rows), 1),
+                # first resolve builds the options, the rest hit the cache
+                resolve_first_ms=round(rows[0]["resolve_ms"], 3),
+                resolve_cached_ms=round(statistics.median(row["resolve_ms"] for row in rows[1:]), 3) if len(rows) > 1 else None,
+            )
+    return {
+        "device": device.key,
+        "profiles": report,
+        "fastest": min((n for n in profiles if samples[n]), key=lambda n: report[n]["create_p50_ms"], default=None),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Appium session start-up per capability profile")
+    parser.add_argument("--platform", default="android", choices=("android", "ios"))
+    parser.add_argument("--devices-file", default=os.getenv("DEVICES_FILE"), help="use the first device in this file")
+    parser.add_argument("--server", default=os.getenv("APPIUM_SERVER", AppiumDriver.APPIUM_SERVER))
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES), help="repeatable; default all")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    if args.devices_file:
+        with open(args.devices_file) as f:
+            device = DeviceConfig(**json.load(f)[0])
+    else:
+        device = AppiumDriver.ANDROID_EMULATOR if args.platform == "android" else AppiumDriver.IOS_SIMULATOR
+    if not device.server_url:
+        device = replace(device, server_url=args.server)
+
+    report = benchmark_profiles(device, args.profile, args.runs)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Appium Session Reuse.
+
+Creating an Appium session installs or checks the app and starts
+UiAutomator2/WDA, which takes tens of seconds. One session is kept per
+worker instead. Before each test the app is put back into a known state
+with one of the strategies below, picked with a marker:
+
+    @pytest.mark.app_reset("restart")      # terminate + activate (default)
+    @pytest.mark.app_reset("deep_link", url="myapp://home")
+    @pytest.mark.app_reset("clear_data")   # wipe app data, then activate
+    @pytest.mark.app_reset("none")         # continue where the last test left off
+    @pytest.mark.app_reset("fresh")        # new session, reused by the tests after it
+
+Each reuse is timed against the cost of creating and quitting a session,
+so the run can report the time it saved.
+"""
+
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import urllib3
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchDriverException, WebDriverException
+
+
+STRATEGIES = ("restart", "deep_link", "clear_data", "none", "fresh")
+
+# the session or the connection to the device is gone; any other failure
+# (missing element, widget timeout, assertion) is the app's or the test's
+DEVICE_ERRORS = (InvalidSessionIdException, NoSuchDriverException, ConnectionError, urllib3.exceptions.HTTPError)
+
+
+def is_device_error(error: Optional[BaseException]) -> bool:
+    return isinstance(error, DEVICE_ERRORS)
+
+
+class AppState:
+    """Reset or prepare the app under test within a running session."""
+
+    def __init__(self, driver, app_id: Optional[str] = None):
+        self.driver = driver
+        self._app_id = app_id
+
+    @property
+    def app_id(self) -> str:
+        """Package (Android) or bundle id (iOS) of the app under test."""
+        if self._app_id is None:
+            caps = self.driver.capabilities
+            self._app_id = (
+                caps.get("appium:appPackage") or caps.get("appPackage")
+                or caps.get("appium:bundleId") or caps.get("bundleId")
+                or self.driver.current_package
+            )
+        return self._app_id
+
+    def reset(self, strategy: str = "restart", url: Optional[str] = None) -> None:
+        if strategy == "restart":
+            self.reset_app()
+        elif strategy == "deep_link":
+            if not url:
+                raise ValueError("deep_link reset needs a url, e.g. app_reset('deep_link', url='myapp://home')")
+            self.open_deep_link(url)
+        elif strategy == "clear_data":
+            self.clear_app_data()
+        elif strategy != "none":
+            raise ValueError(f"Unknown reset strategy: {strategy} (expected one of {STRATEGIES})")
+
+    def reset_app(self):
+        """Reset app to initial state."""
+        self.driver.terminate_app(self.app_id)
+        self.driver.activate_app(self.app_id)
+
+    def open_deep_link(self, url: str):
+        """Jump straight to a screen; the app's navigation stack is rebuilt from the link."""
+        platform = str(self.driver.capabilities.get("platformName", "")).lower()
+        key = "package" if platform == "android" else "bundleId"
+        self.driver.execute_script("mobile: deepLink", {"url": url, key: self.app_id})
+
+    def clear_app_data(self):
+        """Clear all app data."""
+        self.driver.terminate_app(self.app_id)
+        self.driver.execute_script("mobile: clearApp", {"appId": self.app_id})
+        self.driver.activate_app(self.app_id)
+
+    def background_app(self, seconds: int = 5):
+        """Send app to background."""
+        self.driver.background_app(seconds)
+
+
+@dataclass
+class Reuse:
+    test: str
+    strategy: str
+    reset_ms: float
+
+
+class ReusableSession:
+    """
+    One Appium session handed to test after test.
+
+    `start` creates a driver, `stop(driver, failed)` quits it; both are
+    timed. A session is dropped (and the device reported as failed) when
+    a test lost the session or the connection to it, or the reset itself
+    fails.
+    """
+
+    def __init__(self, start: Callable[[], Any], stop: Callable[[Any, bool], None]):
+        self._start = start
+        self._stop = stop
+        self.driver = None
+        self.create_ms: list[float] = []
+        self.quit_ms: list[float] = []
+        self.reuses: list[Reuse] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, test: str, strategy: str = "restart", url: Optional[str] = None, app_id: Optional[str] = None):
+        """The shared driver with the app reset; a new session if there is none yet."""
+        if self.driver is None:
+            self.driver = self.create()
+            # a brand new session already starts on a clean app
+            return self.driver
+
+        start = time.perf_counter()
+        try:
+            AppState(self.driver, app_id).reset(strategy, url)
+        except WebDriverException:
+            # session or device went away between tests; start over once
+            self.discard(failed=True)
+            self.driver = self.create()
+            return self.driver
+        with self._lock:
+            self.reuses.append(Reuse(test, strategy, (time.perf_counter() - start) * 1000))
+        return self.driver
+
+    def create(self):
+        start = time.perf_counter()
+        driver = self._start()
+        with self._lock:
+            self.create_ms.append((time.perf_counter() - start) * 1000)
+        return driver
+
+    def destroy(self, driver, failed: bool = False) -> None:
+        start = time.perf_counter()
+        try:
+            self._stop(driver, failed)
+        except WebDriverException:
+            pass  # session already gone
+        with self._lock:
+            self.quit_ms.append((time.perf_counter() - start) * 1000)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """After a test: keep the session unless `error` says the session or device is gone."""
+        if is_device_error(error):
+            self.discard(failed=True)
+
+    def discard(self, failed: bool = False) -> None:
+        if self.driver is not None:
+            driver, self.driver = self.driver, None
+            self.destroy(driver, failed)
+
+    @property
+    def session_cost_ms(self) -> float:
+        """Typical create + quit time, what every reuse avoids."""
+        create = statistics.median(self.create_ms) if self.create_ms else 0.0
+        stop = statistics.median(self.quit_ms) if self.quit_ms else 0.0
+        return create + stop
+
+    def report(self) -> dict:
+        cost = self.session_cost_ms
+        with self._lock:
+            per_test = {
+                r.test: {"strategy": r.strategy, "reset_ms": round(r.reset_ms, 1), "saved_ms": round(cost - r.reset_ms, 1)}
+                for r in self.reuses
+            }
+            sessions = len(self.create_ms)
+        return {
+            "sessions": sessions,
+            "reused": len(per_test),
+            "session_cost_ms": round(cost, 1),
+            "saved_ms": round(sum(t["saved_ms"] for t in per_test.values()), 1),
+            "tests": per_test,
+        }
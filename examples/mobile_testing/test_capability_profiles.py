@@ -0,0 +1,84 @@
+"""
+Capability profile tests, run against a fake Appium server.
+"""
+
+from dataclasses import replace
+
+import pytest
+
+from appium_config import PROFILES, AppiumDriver, DeviceConfig, get_profile, options_for
+from fake_appium import FakeAppiumServer
+from profile_benchmark import benchmark_profiles
+
+
+@pytest.fixture
+def server():
+    fake = FakeAppiumServer(capability_latency_ms={"appium:fullReset": 150}).start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def device(server):
+    return DeviceConfig(
+        platform_name="Android",
+        device_name="emulator-5554",
+        platform_version="13.0",
+        app_path="./apps/app-debug.apk",
+        automation_name="UiAutomator2",
+        udid="emulator-5554",
+        server_url=server.url,
+    )
+
+
+class TestCapabilityProfiles:
+
+    def test_profiles_pin_reset_behaviour_on_both_platforms(self):
+        for profile in PROFILES.values():
+            for caps in (profile.android, profile.ios):
+                assert {"noReset", "fullReset"} <= caps.keys(), profile.name
+
+    def test_options_are_cached_per_profile_and_device(self, device):
+        assert options_for(device, "ci") is options_for(device, "ci")
+        assert options_for(device, "ci") is not options_for(device, "clean-install")
+
+        other = replace(device, udid="emulator-5556")
+        assert options_for(other, "ci") is not options_for(device, "ci")
+
+    def test_profile_capabilities_applied(self, device):
+        caps = options_for(device, "clean-install").to_capabilities()
+
+        assert caps["appium:fullReset"] is True
+        assert caps["appium:noReset"] is False
+        assert caps["appium:udid"] == "emulator-5554"
+
+    def test_factory_uses_profile(self, device, server):
+        driver = AppiumDriver.create_android_driver(device, profile="ci")
+        caps = driver.capabilities
+        driver.quit()
+
+        for name, value in PROFILES["ci"].android.items():
+            assert caps[f"appium:{name}"] == value
+
+    def test_default_profile(self, device):
+        assert get_profile().name == "standard"
+        assert options_for(device) is options_for(device, "standard")
+
+    def test_default_profile_works_on_a_fresh_device(self):
+        default = get_profile()
+        for flag in ("skipServerInstallation", "skipDeviceInitialization"):
+            assert flag not in default.android
+        assert "usePrebuiltWDA" not in default.ios
+
+    def test_unknown_profile(self, device):
+        with pytest.raises(ValueError, match="Unknown capability profile"):
+            options_for(device, "turbo")
+
+    def test_benchmark_ranks_profiles(self, device):
+        report = benchmark_profiles(device, runs=2)
+
+        profiles = report["profiles"]
+        assert set(profiles) == set(PROFILES)
+        assert all(p["runs"] == 2 and not p["errors"] for p in profiles.values())
+        assert profiles["clean-install"]["create_p50_ms"] > profiles["fastest-reuse"]["create_p50_ms"]
+        assert report["fastest"] != "clean-install"
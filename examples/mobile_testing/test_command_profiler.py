@@ -0,0 +1,101 @@
+"""
+Command profiler tests, run against a fake Appium server.
+"""
+
+import json
+
+import pytest
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+from command_profiler import CommandProfiler
+from fake_appium import FakeAppiumServer
+from session_reuse import AppState
+
+
+@pytest.fixture
+def server():
+    fake = FakeAppiumServer().start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def driver(server):
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    options.device_name = "emulator-5554"
+    options.app = "./apps/app-debug.apk"
+    remote = webdriver.Remote(server.url, options=options)
+    yield remote
+    try:
+        remote.quit()
+    except WebDriverException:
+        pass  # session killed by the test
+
+
+@pytest.fixture
+def profiler(driver):
+    profiler = CommandProfiler()
+    profiler.install(driver)
+    return profiler
+
+
+class TestCommandProfiler:
+
+    def test_attributes_commands_to_test_and_page_methods(self, request, driver, profiler):
+        AppState(driver, "com.example.app").reset_app()
+
+        lines = profiler.folded()
+        prefix = f"{request.node.nodeid};call;AppState.reset_app;"
+        assert any(line.startswith(prefix + "w3cExecuteScript_mobile:_terminateApp ") for line in lines)
+        assert any(line.startswith(prefix + "w3cExecuteScript_mobile:_activateApp ") for line in lines)
+
+    def test_folded_lines_are_flame_graph_input(self, driver, profiler):
+        AppState(driver, "com.example.app").clear_app_data()
+        driver.implicitly_wait(1)
+
+        for line in profiler.folded():
+            stack, weight = line.rsplit(" ", 1)
+            assert int(weight) > 0
+            assert " " not in stack and stack.count(";") >= 2
+
+    def test_per_command_percentiles(self, driver, profiler):
+        for _ in range(20):
+            driver.query_app_state("com.example.app")
+
+        stat = profiler.report()["commands"]["w3cExecuteScript mobile: queryAppState"]
+        assert stat["count"] == 20
+        assert 0 < stat["p50_ms"] <= stat["p95_ms"] <= stat["max_ms"]
+
+    def test_caller_totals(self, driver, profiler):
+        state = AppState(driver, "com.example.app")
+        state.reset_app()
+        driver.implicitly_wait(1)
+
+        callers = profiler.report()["callers"]
+        assert callers["AppState.reset_app"]["count"] == 2
+        assert callers["(no page object)"]["count"] == 1
+
+    def test_install_is_idempotent(self, driver, profiler):
+        profiler.install(driver)
+        driver.query_app_state("com.example.app")
+
+        assert profiler.report()["commands"]["w3cExecuteScript mobile: queryAppState"]["count"] == 1
+
+    def test_failed_commands_are_timed(self, driver, profiler, server):
+        server.kill_sessions()
+        with pytest.raises(InvalidSessionIdException):
+            driver.query_app_state("com.example.app")
+
+        assert profiler.report()["commands"]["w3cExecuteScript mobile: queryAppState"]["count"] == 1
+
+    def test_write(self, driver, profiler, tmp_path):
+        driver.implicitly_wait(1)
+        paths = profiler.write(str(tmp_path), "-gw0")
+
+        with open(paths["json"]) as f:
+            assert "setTimeouts" in json.load(f)["commands"]
+        with open(paths["folded"]) as f:
+            assert f.read().count("\n") == len(profiler.folded())
@@ -0,0 +1,217 @@
+"""
+Device pool tests, run against fake Appium servers.
+"""
+
+import threading
+import time
+
+import pytest
+
+from appium_config import AppiumDriver, DeviceConfig
+from device_pool import DevicePool, NoDeviceAvailable
+from fake_appium import FakeAppiumServer
+
+
+def _device(i: int, server: FakeAppiumServer) -> DeviceConfig:
+    return DeviceConfig(
+        platform_name="Android",
+        device_name=f"emulator-{5554 + 2 * i}",
+        platform_version="13.0",
+        app_path="./apps/app-debug.apk",
+        automation_name="UiAutomator2",
+        udid=f"emulator-{5554 + 2 * i}",
+        server_url=server.url,
+        system_port=8200 + i,
+    )
+
+
+@pytest.fixture
+def servers():
+    started = [FakeAppiumServer().start() for _ in range(3)]
+    yield started
+    for server in started:
+        server.stop()
+
+
+@pytest.fixture
+def devices(servers):
+    return [_device(i, server) for i, server in enumerate(servers)]
+
+
+class TestDevicePool:
+
+    def test_parallel_workers_get_distinct_devices(self, devices, servers):
+        pool = DevicePool(devices)
+        seen = []
+        lock = threading.Lock()
+
+        def worker():
+            with pool.leased("android") as device:
+                driver = AppiumDriver.create_android_driver(device)
+                with lock:
+                    seen.append(device.udid)
+                time.sleep(0.1)
+                driver.quit()
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(seen) == sorted(d.udid for d in devices)
+        # each device got its own server and driver port
+        for server, device in zip(servers, devices):
+            assert server.sessions_created == 1
+            assert server.command_log[0] == ("", "createSession")
+
+        report = pool.report()
+        assert all(d["leases"] == 1 for d in report["devices"].values())
+        assert report["utilization"] > 0
+
+    def test_capabilities_carry_device_identity(self, devices, servers):
+        driver = AppiumDriver.create_android_driver(devices[1])
+        caps = driver.capabilities
+        driver.quit()
+
+        assert caps["appium:udid"] == devices[1].udid
+        assert caps["appium:systemPort"] == devices[1].system_port
+        assert servers[1].sessions_created == 1
+        assert servers[0].sessions_created == 0
+
+    def test_lease_waits_for_release(self, devices):
+        pool = DevicePool(devices[:1])
+        device = pool.lease()
+
+        threading.Timer(0.2, pool.release, args=(device,)).start()
+        start = time.monotonic()
+        assert pool.lease(timeout=5) == device
+        assert time.monotonic() - start >= 0.15
+
+    def test_lease_times_out(self, devices):
+        pool = DevicePool(devices[:1])
+        pool.lease()
+        with pytest.raises(NoDeviceAvailable):
+            pool.lease(timeout=0.2)
+
+    def test_platform_filter(self, devices):
+        pool = DevicePool(devices)
+        with pytest.raises(NoDeviceAvailable):
+            pool.lease("ios", timeout=0.1)
+
+    def test_unhealthy_device_is_skipped(self, devices, servers):
+        servers[0].ready = False
+        servers[1].ready = False
+        pool = DevicePool(devices)
+
+        assert pool.lease().udid == devices[2].udid
+        report = pool.report()["devices"]
+        assert report[devices[0].udid]["health_failures"] == 1
+        assert report[devices[0].udid]["quarantined"]
+
+    def test_recycles_after_repeated_failures(self, devices):
+        recycled = []
+        pool = DevicePool(devices[:1], max_failures=2, recycle=recycled.append)
+
+        for _ in range(2):
+            pool.release(pool.lease(), failed=True)
+
+        assert recycled == [devices[0]]
+        stats = pool.report()["devices"][devices[0].udid]
+        assert stats["failures"] == 2
+        assert stats["recycles"] == 1
+        # recycled devices go straight back into rotation
+        assert pool.lease(timeout=0.1) == devices[0]
+
+    def test_quarantines_without_recycler(self, devices):
+        pool = DevicePool(devices[:1], max_failures=1, quarantine_s=0.3)
+        pool.release(pool.lease(), failed=True)
+
+        with pytest.raises(NoDeviceAvailable):
+            pool.lease(timeout=0.1)
+        assert pool.lease(timeout=2) == devices[0]
+
+    def test_success_resets_failure_streak(self, devices):
+        recycled = []
+        pool = DevicePool(devices[:1], max_failures=2, recycle=recycled.append)
+
+        pool.release(pool.lease(), failed=True)
+        pool.release(pool.lease())
+        pool.release(pool.lease(), failed=True)
+
+        assert recycled == []
+
+    def test_lock_dir_coordinates_processes(self, devices, tmp_path):
+        # two pools over the same lock dir behave like two xdist workers
+        first = DevicePool(devices[:1], lock_dir=str(tmp_path))
+        second = DevicePool(devices[:1], lock_dir=str(tmp_path))
+
+        device = first.lease()
+        with pytest.raises(NoDeviceAvailable):
+            second.lease(timeout=0.2)
+
+        first.release(device)
+        assert second.lease(timeout=1) == device
+
+    def test_leased_marks_failures(self, devices):
+        recycled = []
+        pool = DevicePool(devices[:1], max_failures=1, recycle=recycled.append)
+
+        with pytest.raises(RuntimeError):
+            with pool.leased():
+                raise RuntimeError("device dropped off adb")
+
+        assert recycled == [devices[0]]
+
+    def test_fails_fast_when_every_device_is_unhealthy(self, devices, servers):
+        for server in servers:
+            server.ready = False
+        pool = DevicePool(devices)
+
+        start = time.monotonic()
+        with pytest.raises(NoDeviceAvailable, match="failed its health check"):
+            pool.lease(timeout=30)
+        assert time.monotonic() - start < 5
+
+    def test_slow_health_check_does_not_block_the_pool(self, devices):
+        slow = threading.Event()
+
+        def health_check(device):
+            if device.udid == devices[0].udid:
+                slow.wait(5)
+            return True
+
+        pool = DevicePool(devices[:2], health_check=health_check)
+        # first lease sits in devices[0]'s health check
+        first = threading.Thread(target=pool.lease)
+        first.start()
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        assert pool.lease(timeout=2) == devices[1]
+        pool.release(devices[1])
+        assert time.monotonic() - start < 1
+        slow.set()
+        first.join()
+
+    def test_slow_recycle_does_not_block_the_pool(self, devices):
+        recycling = threading.Event()
+        done = threading.Event()
+
+        def recycle(device):
+            recycling.set()
+            done.wait(5)
+
+        pool = DevicePool(devices[:2], max_failures=1, recycle=recycle)
+        broken = pool.lease()
+        releaser = threading.Thread(target=pool.release, args=(broken,), kwargs={"failed": True})
+        releaser.start()
+        recycling.wait(2)
+
+        start = time.monotonic()
+        other = pool.lease(timeout=2)
+        assert other != broken
+        assert time.monotonic() - start < 1
+        done.set()
+        releaser.join()
+        assert pool.report()["devices"][broken.key]["recycles"] == 1
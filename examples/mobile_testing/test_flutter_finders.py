@@ -0,0 +1,139 @@
+"""
+Finder cache and native wait tests against a simulated Flutter app.
+"""
+
+import base64
+import json
+import time
+from typing import Optional
+
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchDriverException, WebDriverException
+
+from flutter_finders import FinderCache, FlutterWaits, WidgetTimeout
+from flutter_test import FlutterDriver
+
+
+class FakeFlutterApp:
+    """Widgets (by ValueKey) that appear or disappear at given offsets from now."""
+
+    def __init__(self, appear: dict[str, float] = None, disappear: dict[str, float] = None):
+        now = time.monotonic()
+        self.appear = {key: now + delay for key, delay in (appear or {}).items()}
+        self.disappear = {key: now + delay for key, delay in (disappear or {}).items()}
+        self.calls: list[tuple[str, str, int]] = []
+        self.session_alive = True
+        self.error: Optional[WebDriverException] = None
+
+    def _present(self, key: str, at: float) -> bool:
+        return self.appear.get(key, float("inf")) <= at < self.disappear.get(key, float("inf"))
+
+    def execute_script(self, command, finder, timeout_ms):
+        if not self.session_alive:
+            raise InvalidSessionIdException("session deleted")
+        if self.error is not None:
+            raise self.error
+        key = json.loads(base64.b64decode(finder))["keyValueString"]
+        self.calls.append((command, key, timeout_ms))
+        deadline = time.monotonic() + timeout_ms / 1000
+        wanted = command == "flutter:waitFor"
+        # the app-side wait: returns as soon as the tree matches
+        change = self.appear.get(key) if wanted else self.disappear.get(key)
+        if self._present(key, time.monotonic()) == wanted:
+            return None
+        if change is not None and change <= deadline:
+            time.sleep(max(change - time.monotonic(), 0))
+            return None
+        raise WebDriverException(f"Timeout while waiting for {key}")
+
+
+class TestFinderCache:
+
+    def test_finders_built_once(self):
+        cache = FinderCache(driver=None)
+
+        first = cache.element("key", "login_button")
+        assert cache.element("key", "login_button") is first
+        assert cache.element("text", "login_button") is not first
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_serialized_matches_flutter_finder(self):
+        cache = FinderCache(driver=None)
+        assert cache.serialized("key", "username_input") == cache.finder.by_value_key("username_input")
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError, match="Unknown finder kind"):
+            FinderCache(driver=None).element("xpath", "//button")
+
+
+class TestFlutterWaits:
+
+    def test_wait_for_returns_when_widget_appears(self):
+        app = FakeFlutterApp(appear={"home_screen_title": 0.1})
+        flutter = FlutterDriver(app)
+
+        start = time.monotonic()
+        element = flutter.wait_for("home_screen_title", timeout_s=2)
+
+        assert 0.08 <= time.monotonic() - start < 1
+        assert element is flutter.find_by_key("home_screen_title")
+        assert app.calls == [("flutter:waitFor", "home_screen_title", 2000)]
+
+    def test_wait_for_timeout(self):
+        flutter = FlutterDriver(FakeFlutterApp())
+
+        with pytest.raises(WidgetTimeout, match="home_screen_title did not appear within 500ms"):
+            flutter.wait_for("home_screen_title", timeout_s=0.5)
+
+    def test_wait_for_absent(self):
+        app = FakeFlutterApp(appear={"spinner": 0}, disappear={"spinner": 0.1})
+        flutter = FlutterDriver(app)
+
+        flutter.wait_for_absent("spinner", timeout_s=2)
+        assert app.calls[0][0] == "flutter:waitForAbsent"
+
+        app.disappear["spinner"] = float("inf")
+        with pytest.raises(WidgetTimeout, match="spinner did not go away"):
+            flutter.wait_for_absent("spinner", timeout_s=0.2)
+
+    def test_wait_for_all_shares_one_deadline(self):
+        keys = ("username_input", "password_input", "login_button")
+        app = FakeFlutterApp(appear={key: 0.15 for key in keys})
+        flutter = FlutterDriver(app)
+
+        start = time.monotonic()
+        elements = flutter.wait_for_all(*keys, timeout_s=1)
+
+        # one screen transition's wait, not one per widget
+        assert time.monotonic() - start < 0.4
+        assert elements == [flutter.find_by_key(key) for key in keys]
+        assert [key for _, key, _ in app.calls] == list(keys)
+        timeouts = [timeout for _, _, timeout in app.calls]
+        assert timeouts[0] > 900 and timeouts[1] < 900
+        assert flutter.waits.round_trips == 3
+
+    def test_wait_for_all_names_the_missing_widget(self):
+        app = FakeFlutterApp(appear={"username_input": 0, "login_button": 0})
+        flutter = FlutterDriver(app)
+
+        with pytest.raises(WidgetTimeout, match="password_input did not appear"):
+            flutter.wait_for_all("username_input", "password_input", "login_button", timeout_s=0.2)
+
+    def test_session_errors_are_not_timeouts(self):
+        app = FakeFlutterApp(appear={"login_button": 0})
+        app.session_alive = False
+
+        with pytest.raises(InvalidSessionIdException):
+            FlutterWaits(app).wait_for(FinderCache(app).element("key", "login_button"))
+
+    @pytest.mark.parametrize("error", [
+        NoSuchDriverException("driver went away"),
+        WebDriverException("Could not find a widget with key login_button"),
+    ])
+    def test_only_timeouts_become_widget_timeouts(self, error):
+        app = FakeFlutterApp(appear={"login_button": 0})
+        app.error = error
+
+        with pytest.raises(type(error)) as raised:
+            FlutterWaits(app).wait_for(FinderCache(app).element("key", "login_button"))
+        assert not isinstance(raised.value, WidgetTimeout)
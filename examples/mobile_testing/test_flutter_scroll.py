@@ -0,0 +1,208 @@
+"""
+Scroll engine tests against a simulated lazily built Flutter list.
+"""
+
+import base64
+import json
+
+import pytest
+from appium_flutter_finder.flutter_finder import FlutterFinder
+from selenium.common.exceptions import InvalidSessionIdException, UnknownMethodException, WebDriverException
+
+from flutter_scroll import ScrollEngine, ScrollStats, ScrollTimeout
+
+
+finder = FlutterFinder()
+LIST = finder.by_value_key("list")
+
+
+class FakeFlutterList:
+    """A ListView of `count` 100px items in a 600px viewport, built 250px beyond each edge."""
+
+    ITEM = 100
+    VIEWPORT = 600
+    CACHE_EXTENT = 250
+
+    def __init__(self, count: int = 200, native: bool = True, scroll_into_view: bool = True):
+        self.count = count
+        self.native = native
+        self.scroll_into_view = scroll_into_view
+        self.offset = 0.0
+        self.calls: list[str] = []
+        self.session_alive = True
+
+    @property
+    def max_offset(self) -> float:
+        return self.count * self.ITEM - self.VIEWPORT
+
+    def _index(self, serialized: str) -> int:
+        key = json.loads(base64.b64decode(serialized))["keyValueString"]
+        if not key.startswith("item_"):
+            raise WebDriverException(f"no widget {key}")
+        return int(key.split("_")[1])
+
+    def _top(self, i: int) -> float:
+        return i * self.ITEM - self.offset
+
+    def built(self, i: int) -> bool:
+        top = self._top(i)
+        return i < self.count and -self.CACHE_EXTENT < top + self.ITEM and top < self.VIEWPORT + self.CACHE_EXTENT
+
+    def visible(self, i: int) -> bool:
+        top = self._top(i)
+        return top >= 0 and top + self.ITEM <= self.VIEWPORT
+
+    def _scroll(self, dy: float) -> None:
+        self.offset = min(max(self.offset - dy, 0), self.max_offset)
+
+    def execute_script(self, command, *args):
+        self.calls.append(command)
+        if not self.session_alive:
+            raise InvalidSessionIdException("session deleted")
+        if command in ("flutter:getTopLeft", "flutter:getBottomRight", "flutter:scroll") and args[0] != LIST:
+            raise WebDriverException("no scrollable widget found")
+        if command == "flutter:getTopLeft":
+            return {"dx": 0, "dy": 100}
+        if command == "flutter:getBottomRight":
+            return {"dx": 400, "dy": 100 + self.VIEWPORT}
+        if command == "flutter:scroll":
+            self._scroll(args[1]["dy"])
+            return None
+        if command == "flutter:waitFor":
+            if not self.built(self._index(args[0])):
+                raise WebDriverException("Timeout while waiting for widget")
+            return None
+        if command == "flutter:scrollIntoView":
+            if not self.scroll_into_view:
+                raise WebDriverException("Command flutter:scrollIntoView is not supported")
+            i = self._index(args[0])
+            if not self.built(i):
+                raise WebDriverException("Timeout while waiting for widget")
+            self.offset = min(max(i * self.ITEM - args[1]["alignment"] * self.VIEWPORT, 0), self.max_offset)
+            return None
+        if command == "flutter:scrollUntilVisible":
+            if not self.native:
+                raise UnknownMethodException("Unknown command flutter:scrollUntilVisible")
+            i = self._index(args[1]["item"])
+            while not self.visible(i):
+                before = self.offset
+                self._scroll(args[1]["dyScroll"])
+                if self.offset == before:
+                    raise WebDriverException("Timeout while waiting for widget")
+            return None
+        raise UnknownMethodException(command)
+
+
+@pytest.fixture
+def stats():
+    return ScrollStats()
+
+
+class TestScrollEngine:
+
+    def test_built_widget_takes_one_round_trip(self, stats):
+        flutter = FakeFlutterList()
+        engine = ScrollEngine(flutter, stats=stats)
+
+        engine.scroll_until_visible(LIST, finder.by_value_key("item_7"))
+
+        assert flutter.calls == ["flutter:scrollIntoView"]
+        assert flutter.visible(7)
+        assert stats.lookups[0].strategy == "scrollIntoView"
+
+    def test_far_item_uses_native_scroll_until_visible(self, stats):
+        flutter = FakeFlutterList()
+        engine = ScrollEngine(flutter, stats=stats)
+
+        engine.scroll_until_visible(LIST, finder.by_value_key("item_150"), label="item_150")
+
+        assert flutter.visible(150)
+        assert flutter.calls.count("flutter:scrollUntilVisible") == 1
+        lookup = stats.lookups[0]
+        assert lookup.strategy == "scrollUntilVisible"
+        # probe + viewport size + one scroll command
+        assert lookup.round_trips == 4
+
+    def test_delta_adapts_to_viewport(self):
+        engine = ScrollEngine(FakeFlutterList(), overlap=0.25)
+
+        assert engine.viewport_delta(LIST) == 450
+        # measured once per scroll view
+        engine.viewport_delta(LIST)
+        assert engine.driver.calls.count("flutter:getTopLeft") == 1
+
+    def test_falls_back_to_stepped_scrolling(self, stats):
+        flutter = FakeFlutterList(native=False)
+        engine = ScrollEngine(flutter, stats=stats)
+
+        engine.scroll_until_visible(LIST, finder.by_value_key("item_60"))
+        assert flutter.visible(60)
+        assert stats.lookups[0].strategy == "stepped"
+        # 6000px at 480px per step, not dozens of fixed 300px scrolls
+        assert flutter.calls.count("flutter:scroll") <= 13
+
+        flutter.calls.clear()
+        engine.scroll_until_visible(LIST, finder.by_value_key("item_120"))
+        assert "flutter:scrollUntilVisible" not in flutter.calls
+
+    def test_probe_without_scroll_into_view(self, stats):
+        flutter = FakeFlutterList(native=False, scroll_into_view=False)
+        engine = ScrollEngine(flutter, stats=stats)
+
+        engine.scroll_until_visible(LIST, finder.by_value_key("item_30"))
+        assert flutter.built(30)
+        assert flutter.calls.count("flutter:scrollIntoView") == 1
+
+    def test_time_cap_raises_with_round_trips(self, stats):
+        flutter = FakeFlutterList(count=20, native=False)
+        engine = ScrollEngine(flutter, stats=stats)
+
+        with pytest.raises(ScrollTimeout, match=r"item_500 not visible after 0.2s .*round trips, stepped"):
+            engine.scroll_until_visible(LIST, finder.by_value_key("item_500"), timeout_s=0.2, label="item_500")
+
+        lookup = stats.lookups[0]
+        assert not lookup.found
+        assert lookup.round_trips > 2
+        assert stats.report()["not_found"] == 1
+
+    def test_scroll_errors_propagate(self, stats):
+        flutter = FakeFlutterList(native=False)
+        engine = ScrollEngine(flutter, stats=stats)
+
+        # only "not there yet" is retried; a missing scroll view is a real error
+        with pytest.raises(WebDriverException, match="no scrollable"):
+            engine.scroll_until_visible(finder.by_text("no such list"), finder.by_value_key("item_90"))
+
+    def test_session_errors_are_not_misses(self, stats):
+        flutter = FakeFlutterList()
+        flutter.session_alive = False
+        engine = ScrollEngine(flutter, stats=stats)
+
+        with pytest.raises(InvalidSessionIdException):
+            engine.scroll_until_visible(LIST, finder.by_value_key("item_150"))
+        assert flutter.calls == ["flutter:scrollIntoView"]
+        assert not engine.unsupported
+
+    def test_unexpected_probe_errors_propagate(self, stats):
+        engine = ScrollEngine(FakeFlutterList(), stats=stats)
+
+        with pytest.raises(WebDriverException, match="no widget"):
+            engine.scroll_until_visible(LIST, finder.by_value_key("header"))
+
+    def test_scroll_up(self, stats):
+        flutter = FakeFlutterList()
+        flutter.offset = flutter.max_offset
+        engine = ScrollEngine(flutter, stats=stats)
+
+        engine.scroll_until_visible(LIST, finder.by_value_key("item_3"), direction="up")
+        assert flutter.visible(3)
+
+    def test_report(self, stats):
+        engine = ScrollEngine(FakeFlutterList(), stats=stats)
+        for i in (2, 80, 150):
+            engine.scroll_until_visible(LIST, finder.by_value_key(f"item_{i}"), label=f"item_{i}")
+
+        report = stats.report()
+        assert report["lookups"] == 3
+        assert report["by_strategy"] == {"scrollIntoView": 1, "scrollUntilVisible": 2}
+        assert report["round_trips_max"] == 4
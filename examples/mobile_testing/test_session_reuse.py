@@ -0,0 +1,166 @@
+"""
+Session reuse tests, run against a fake Appium server with slow session start.
+"""
+
+import pytest
+import urllib3
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from selenium.common.exceptions import (
+    InvalidSessionIdException,
+    NoSuchDriverException,
+    NoSuchElementException,
+    TimeoutException,
+)
+
+from appium_config import AppiumDriver, DeviceConfig
+from device_pool import DevicePool
+from fake_appium import NOT_RUNNING, FakeAppiumServer
+from flutter_finders import WidgetTimeout
+from flutter_scroll import ScrollTimeout
+from session_reuse import AppState, ReusableSession, is_device_error
+
+
+@pytest.fixture
+def server():
+    fake = FakeAppiumServer(session_latency_ms=300).start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def session(server):
+    def start():
+        options = UiAutomator2Options()
+        options.platform_name = "Android"
+        options.device_name = "emulator-5554"
+        options.app = "./apps/app-debug.apk"
+        return webdriver.Remote(server.url, options=options)
+
+    reusable = ReusableSession(start, lambda driver, failed: driver.quit())
+    yield reusable
+    reusable.discard()
+
+
+class TestSessionReuse:
+
+    def test_one_session_for_many_tests(self, session, server):
+        drivers = {session.acquire(f"test_{i}").session_id for i in range(4)}
+
+        assert len(drivers) == 1
+        assert server.sessions_created == 1
+        # first test gets the fresh session, the other three a restart
+        assert server.commands("mobile: terminateApp") == 3
+        assert server.commands("mobile: activateApp") == 3
+
+    def test_reports_time_saved_per_test(self, session):
+        for i in range(3):
+            session.acquire(f"test_{i}")
+        session.discard()
+
+        report = session.report()
+        assert report["sessions"] == 1
+        assert report["reused"] == 2
+        assert report["session_cost_ms"] >= 300
+        for reuse in report["tests"].values():
+            assert reuse["strategy"] == "restart"
+            assert reuse["saved_ms"] > 250
+        assert report["saved_ms"] == pytest.approx(sum(t["saved_ms"] for t in report["tests"].values()))
+
+    def test_deep_link_strategy(self, session, server):
+        session.acquire("test_first")
+        session.acquire("test_second", "deep_link", url="myapp://home")
+
+        assert server.commands("mobile: deepLink") == 1
+        assert server.commands("mobile: terminateApp") == 0
+
+    def test_deep_link_needs_url(self, session):
+        session.acquire("test_first")
+        with pytest.raises(ValueError, match="url"):
+            session.acquire("test_second", "deep_link")
+
+    def test_clear_data_strategy(self, session, server):
+        session.acquire("test_first")
+        driver = session.acquire("test_second", "clear_data")
+
+        assert server.commands("mobile: clearApp") == 1
+        assert driver.query_app_state("com.example.app") != NOT_RUNNING
+
+    def test_none_strategy_leaves_app_alone(self, session, server):
+        session.acquire("test_first")
+        session.acquire("test_second", "none")
+
+        assert len(server.command_log) == server.commands("createSession")
+
+    def test_unknown_strategy(self, session):
+        session.acquire("test_first")
+        with pytest.raises(ValueError, match="Unknown reset strategy"):
+            session.acquire("test_second", "reinstall")
+
+    def test_dead_session_is_replaced(self, session, server):
+        first = session.acquire("test_first")
+        server.kill_sessions()
+
+        second = session.acquire("test_second")
+        assert second is not first
+        assert server.sessions_created == 2
+        assert "test_second" not in session.report()["tests"]
+
+    def test_app_id_from_current_package(self, session, server):
+        driver = session.acquire("test_first")
+        assert AppState(driver).app_id == server.app_package
+
+
+class TestDeviceErrors:
+
+    @pytest.mark.parametrize("error, device_error", [
+        (InvalidSessionIdException("session deleted"), True),
+        (NoSuchDriverException("driver went away"), True),
+        (ConnectionRefusedError(111, "Connection refused"), True),
+        (urllib3.exceptions.MaxRetryError(None, "/session", "refused"), True),
+        (NoSuchElementException("no login button"), False),
+        (TimeoutException("spinner still visible"), False),
+        (WidgetTimeout("login_button did not appear within 10000ms"), False),
+        (ScrollTimeout("item_90 not visible after 10s of scrolling"), False),
+        (AssertionError("wrong greeting"), False),
+        (None, False),
+    ])
+    def test_only_lost_sessions_count(self, error, device_error):
+        assert is_device_error(error) is device_error
+
+    def test_widget_timeouts_do_not_quarantine_the_device(self, server):
+        device = DeviceConfig(
+            platform_name="Android",
+            device_name="emulator-5554",
+            platform_version="13.0",
+            app_path="./apps/app-debug.apk",
+            automation_name="UiAutomator2",
+            server_url=server.url,
+        )
+        pool = DevicePool([device], max_failures=2, health_check=lambda d: True)
+        leases = {}
+
+        def start():
+            config = pool.lease("android", timeout=1)
+            driver = AppiumDriver.create_android_driver(config)
+            leases[id(driver)] = config
+            return driver
+
+        def stop(driver, failed):
+            driver.quit()
+            pool.release(leases.pop(id(driver)), failed=failed)
+
+        session = ReusableSession(start, stop)
+        for i in range(3):
+            session.acquire(f"test_{i}")
+            session.finish(WidgetTimeout("login_button did not appear within 10000ms"))
+        session.discard()
+
+        stats = pool.report()["devices"][device.key]
+        assert (stats["failures"], stats["quarantined"]) == (0, False)
+        assert server.sessions_created == 1
+
+        for i in range(2):
+            session.acquire(f"test_lost_{i}")
+            session.finish(InvalidSessionIdException("session deleted"))
+        assert pool.report()["devices"][device.key]["quarantined"]
@@ -0,0 +1,151 @@
+"""Failure artifacts captured off the test's critical path"""
+
+import base64
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+@dataclass
+class Capture:
+    """One capture: where its files will be once written, and what it cost."""
+    name: str
+    paths: dict[str, str]
+    grab_ms: float
+    write_ms: float = 0.0
+    bytes_written: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def artifact_name(nodeid: str) -> str:
+    """
+    Filesystem-safe name for a test id, keeping the parametrization so
+    test_x[chrome] and test_x[firefox] don't overwrite each other.
+    """
+    path, _, rest = nodeid.partition("::")
+    module = os.path.splitext(os.path.basename(path))[0]
+    name = f"{module}.{rest.replace('::', '.')}" if rest else module
+    return re.sub(r"[^\w.\-]+", "-", name).strip("-")
+
+
+class ArtifactCapture:
+    """
+    Grabs screenshot, page source and console log from the driver on
+    the calling thread (those need the browser as it is right now),
+    then decodes, compresses and writes them on a background pool.
+
+    Call flush() before reading the files; report() sums up what
+    capturing cost the tests.
+    """
+
+    def __init__(self, directory: str = "screenshots", workers: int = 2):
+        self.directory = directory
+        self.workers = workers
+        self.captures: list[Capture] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: list[Future] = []
+        self._used_names: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def capture(self, driver: WebDriver, name: str, source: bool = True, console: bool = True) -> Capture:
+        start = time.perf_counter()
+        errors = []
+        screenshot = self._grab(errors, "screenshot", driver.get_screenshot_as_base64)
+        page_source = self._grab(errors, "page source", lambda: driver.page_source) if source else None
+        console_log = self._grab(errors, "console log", lambda: driver.get_log("browser")) if console else None
+        grab_ms = (time.perf_counter() - start) * 1000
+
+        base = os.path.join(self.directory, self._unique(name))
+        paths = {}
+        if screenshot is not None:
+            paths["screenshot"] = f"{base}.png"
+        if page_source is not None:
+            paths["page_source"] = f"{base}.html.gz"
+        if console_log is not None:
+            paths["console"] = f"{base}.console.json"
+
+        result = Capture(name=name, paths=paths, grab_ms=grab_ms, errors=errors)
+        with self._lock:
+            self.captures.append(result)
+            self._pending.append(
+                self._executor().submit(self._write, result, screenshot, page_source, console_log)
+            )
+        return result
+
+    def screenshot(self, driver: WebDriver, name: str) -> str:
+        """Screenshot only; returns the path the PNG will be written to."""
+        return self.capture(driver, name, source=False, console=False).paths.get("screenshot", "")
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        self.flush()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def report(self) -> dict:
+        grabs = [c.grab_ms for c in self.captures]
+        return {
+            "captures": len(self.captures),
+            "avg_grab_ms": round(sum(grabs) / len(grabs), 1) if grabs else 0.0,
+            "max_grab_ms": round(max(grabs), 1) if grabs else 0.0,
+            "background_write_ms": round(sum(c.write_ms for c in self.captures), 1),
+            "bytes_written": sum(c.bytes_written for c in self.captures),
+            "errors": sum(len(c.errors) for c in self.captures),
+        }
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="artifacts")
+        return self._pool
+
+    def _unique(self, name: str) -> str:
+        # reruns of the same case in one process get -2, -3, ...
+        with self._lock:
+            count = self._used_names.get(name, 0) + 1
+            self._used_names[name] = count
+        return name if count == 1 else f"{name}-{count}"
+
+    @staticmethod
+    def _grab(errors: list[str], what: str, read):
+        try:
+            return read()
+        except (WebDriverException, AttributeError, ValueError) as e:
+            # e.g. Firefox drivers have no get_log()
+            errors.append(f"{what}: {e.__class__.__name__}")
+            return None
+
+    def _write(self, result: Capture, screenshot, page_source, console_log) -> None:
+        start = time.perf_counter()
+        os.makedirs(self.directory, exist_ok=True)
+        payloads = {
+            "screenshot": lambda: base64.b64decode(screenshot),
+            "page_source": lambda: gzip.compress(page_source.encode("utf-8"), compresslevel=6),
+            "console": lambda: json.dumps(console_log, indent=2).encode("utf-8"),
+        }
+        for kind, path in result.paths.items():
+            try:
+                data = payloads[kind]()
+                with open(path, "wb") as f:
+                    f.write(data)
+                result.bytes_written += len(data)
+            except (OSError, ValueError) as e:
+                result.errors.append(f"{kind}: {e}")
+        result.write_ms = (time.perf_counter() - start) * 1000
+
+
+ARTIFACTS = ArtifactCapture(os.getenv("ARTIFACTS_DIR", "screenshots"))
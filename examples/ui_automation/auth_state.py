@@ -0,0 +1,100 @@
+"""Reusable logged-in browser state"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+_READ_STORAGE = """
+return {
+    origin: window.location.origin,
+    local: Object.assign({}, window.localStorage),
+    session: Object.assign({}, window.sessionStorage)
+};
+"""
+
+_WRITE_STORAGE = """
+const [local, session] = arguments;
+for (const [k, v] of Object.entries(local)) window.localStorage.setItem(k, v);
+for (const [k, v] of Object.entries(session)) window.sessionStorage.setItem(k, v);
+"""
+
+
+@dataclass
+class AuthSnapshot:
+    """Everything the app keeps client-side after a login."""
+    origin: str
+    landing_url: str
+    cookies: list[dict]
+    local_storage: dict[str, str]
+    session_storage: dict[str, str]
+
+
+def capture(driver: WebDriver) -> AuthSnapshot:
+    """Snapshot the current page's cookies and web storage."""
+    storage = driver.execute_script(_READ_STORAGE)
+    return AuthSnapshot(
+        origin=storage["origin"],
+        landing_url=driver.current_url,
+        cookies=driver.get_cookies(),
+        local_storage=storage["local"],
+        session_storage=storage["session"],
+    )
+
+
+def inject(driver: WebDriver, snapshot: AuthSnapshot, bootstrap_path: str = "/favicon.ico") -> None:
+    """
+    Restore a snapshot into a fresh browser and open the page login
+    would have landed on.
+
+    Cookies and storage can only be set for the page's own origin, so a
+    cheap same-origin resource is opened first instead of an app page.
+    """
+    driver.get(f"{snapshot.origin}{bootstrap_path}")
+    for cookie in snapshot.cookies:
+        driver.add_cookie(cookie)
+    driver.execute_script(_WRITE_STORAGE, snapshot.local_storage, snapshot.session_storage)
+    driver.get(snapshot.landing_url)
+
+
+def _same_page(a: str, b: str) -> bool:
+    return a.split("?")[0].rstrip("/") == b.split("?")[0].rstrip("/")
+
+
+class AuthStateCache:
+    """
+    Log in through the UI once per (browser, user), then inject the
+    captured state everywhere else.
+    """
+
+    def __init__(self):
+        self._snapshots: dict[tuple[str, str], AuthSnapshot] = {}
+        self.ui_logins = 0
+        self.injections = 0
+        self.stale = 0
+
+    def login(
+        self,
+        driver: WebDriver,
+        username: str,
+        ui_login: Callable[[WebDriver], None]
+    ) -> None:
+        key = (driver.capabilities.get("browserName", ""), username)
+        snapshot: Optional[AuthSnapshot] = self._snapshots.get(key)
+
+        if snapshot is not None:
+            inject(driver, snapshot)
+            if _same_page(driver.current_url, snapshot.landing_url):
+                self.injections += 1
+                return
+            # bounced (e.g. to /login): the captured session is no longer valid
+            self.stale += 1
+
+        ui_login(driver)
+        self._snapshots[key] = capture(driver)
+        self.ui_logins += 1
+
+    def forget(self, driver: WebDriver, username: str) -> None:
+        """Drop a snapshot, e.g. after the session was invalidated server-side."""
+        self._snapshots.pop((driver.capabilities.get("browserName", ""), username), None)
@@ -1,51 +1,219 @@
 """Base page object"""
 
+import os
+from typing import Any, Callable, Optional, TypeVar, Union
+
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from artifacts import ARTIFACTS
+from element_cache import ElementCache
+from round_trips import ROUND_TRIPS, page_action
+from waits import WaitEngine, js_query
+
+
+T = TypeVar("T")
+
+_FIND = """
+const find = ([by, value]) => by === "xpath"
+    ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(value);
+"""
+
+# sets values the way a user edit would look to the app: through the
+# prototype's value setter (so React & co. notice) plus input/change events
+_FILL_FORM = _FIND + """
+const skipped = [];
+arguments[0].forEach(([query, value], i) => {
+    const el = query && find(query);
+    if (!el || el.disabled || el.readOnly || !("value" in el) || el.type === "file") {
+        skipped.push(i);
+        return;
+    }
+    if (typeof value === "boolean") {
+        if (el.checked !== value) el.click();
+        return;
+    }
+    el.focus();
+    const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value");
+    if (setter && setter.set) setter.set.call(el, value); else el.value = value;
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    el.blur();
+});
+return skipped;
+"""
+
+_READ_TEXTS = _FIND + """
+return arguments[0].map(query => {
+    const el = query && find(query);
+    return el ? el.innerText.trim() : null;
+});
+"""
+
+_VISIBILITY = _FIND + """
+return arguments[0].map(query => {
+    const el = query && find(query);
+    if (!el || !el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== "hidden" && style.opacity !== "0";
+});
+"""
 
 
 class BasePage:
 
+    # wait for elements with an in-page MutationObserver instead of polling
+    USE_DOM_OBSERVER = False
+    # set on pages whose inputs only react to real key events
+    NATIVE_INPUT = False
+    # locators whose element stays the same node while the page is open;
+    # anything that gets re-rendered (errors, list rows) doesn't belong here
+    CACHEABLE: tuple[tuple, ...] = ()
+    # {action: {metric: max ms}} checked by @measured actions, see page_metrics
+    BUDGETS: dict[str, dict[str, float]] = {}
+
     def __init__(self, driver: WebDriver, timeout: int = 10):
         self.driver = driver
+        self.base_url = os.getenv("BASE_URL", "http://localhost:8080")
         self.timeout = timeout
-        self.wait = WebDriverWait(driver, timeout)
+        self.wait = WaitEngine(driver, timeout)
+        self.elements = ElementCache(driver, self.CACHEABLE, type(self).__name__)
+        ROUND_TRIPS.install(driver)
 
     def find_element(self, locator: tuple) -> WebElement:
-        return self.wait.until(EC.presence_of_element_located(locator))
+        """
+        A fresh lookup: callers keep the element, so the cache can't
+        swap in a new one if it goes stale. The result refreshes the
+        cache for the page's own actions.
+        """
+        return self._resolve(locator)
+
+    def _resolve(self, locator: tuple) -> WebElement:
+        if self.USE_DOM_OBSERVER:
+            # most elements are already there: one lookup, the observer only on a miss
+            found = self.driver.find_elements(*locator)
+            if found:
+                element = found[0]
+            else:
+                self.wait.until_present_in_dom(locator)
+                element = self.driver.find_element(*locator)
+        else:
+            element = self.wait.until(EC.presence_of_element_located(locator))
+        self.elements.put(locator, element)
+        return element
+
+    def _with_element(self, locator: tuple, action: Callable[[WebElement], T]) -> T:
+        """Run `action` on the cached element, resolving again if it went stale."""
+        cached = self.elements.get(locator)
+        if cached is not None:
+            try:
+                return action(cached)
+            except StaleElementReferenceException:
+                self.elements.discard(locator)
+        return action(self._resolve(locator))
 
     def find_elements(self, locator: tuple) -> list[WebElement]:
         return self.wait.until(EC.presence_of_all_elements_located(locator))
 
+    @page_action
     def click(self, locator: tuple) -> None:
+        cached = self.elements.get(locator)
+        if cached is not None:
+            try:
+                cached.click()
+                return
+            except StaleElementReferenceException:
+                self.elements.discard(locator)
+            except (ElementNotInteractableException, ElementClickInterceptedException):
+                pass  # not clickable yet, wait for it below
+
         element = self.wait.until(EC.element_to_be_clickable(locator))
+        self.elements.put(locator, element)
         element.click()
 
+    @page_action
     def type_text(self, locator: tuple, text: str, clear: bool = True) -> None:
-        element = self.find_element(locator)
-        if clear:
-            element.clear()
-        element.send_keys(text)
+        def type_into(element: WebElement) -> None:
+            if clear:
+                element.clear()
+            element.send_keys(text)
+
+        self._with_element(locator, type_into)
 
+    @page_action
     def get_text(self, locator: tuple) -> str:
-        return self.find_element(locator).text
+        return self._with_element(locator, lambda element: element.text)
 
+    @page_action
     def is_visible(self, locator: tuple, timeout: int = None) -> bool:
         try:
-            wait = WebDriverWait(self.driver, timeout or self.timeout)
-            wait.until(EC.visibility_of_element_located(locator))
+            self.wait.until(EC.visibility_of_element_located(locator), timeout=timeout)
             return True
         except TimeoutException:
             return False
 
+    @page_action
+    def fill_form(self, values: dict[tuple, Union[str, bool]], native: Optional[bool] = None) -> None:
+        """
+        Fill several fields in one round trip.
+
+        Strings set an input's value, booleans set a checkbox. No key
+        events fire, so use it for setup forms, not for the input a test
+        is about. Fields the script can't handle (not rendered yet, disabled, file inputs,
+        locators JS can't express) are typed natively with the usual
+        waits, and so is everything when `native` or NATIVE_INPUT is set.
+        """
+        items = list(values.items())
+        if native is None:
+            native = self.NATIVE_INPUT
+
+        if native:
+            skipped = range(len(items))
+        else:
+            fields = [[js_query(locator), value] for locator, value in items]
+            skipped = self.driver.execute_script(_FILL_FORM, fields)
+
+        for i in skipped:
+            locator, value = items[i]
+            if isinstance(value, bool):
+                if self._with_element(locator, lambda element: element.is_selected()) != value:
+                    self.click(locator)
+            else:
+                self.type_text(locator, value)
+
+    @page_action
+    def get_texts(self, locators: list[tuple]) -> list[Optional[str]]:
+        """Visible text of each locator in one round trip, None where nothing matches."""
+        return self._read_many(_READ_TEXTS, locators, lambda el: el.text)
+
+    @page_action
+    def visibility(self, locators: list[tuple]) -> list[bool]:
+        """Whether each locator is currently displayed, without waiting."""
+        return self._read_many(_VISIBILITY, locators, lambda el: el.is_displayed())
+
+    def _read_many(self, script: str, locators: list[tuple], native_read) -> list[Any]:
+        queries = [js_query(locator) for locator in locators]
+        results = self.driver.execute_script(script, queries)
+        # locators JS can't express are read natively, one by one
+        for i, query in enumerate(queries):
+            if query is None:
+                elements = self.driver.find_elements(*locators[i])
+                if elements:
+                    results[i] = native_read(elements[0])
+        return results
+
+    @page_action
     def wait_for_url_contains(self, partial_url: str) -> bool:
         return self.wait.until(EC.url_contains(partial_url))
 
-    # TODO: move this to a utils module
     def take_screenshot(self, name: str) -> str:
-        filepath = f"screenshots/{name}.png"
-        self.driver.save_screenshot(filepath)
-        return filepath
+        """path the PNG is written to in the background (ARTIFACTS.flush() to wait)"""
+        return ARTIFACTS.screenshot(self.driver, name)
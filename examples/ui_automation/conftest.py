@@ -1,9 +1,27 @@
 import pytest
+import json
 import os
+import sys
 from dataclasses import dataclass
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from artifacts import ARTIFACTS, artifact_name
+from auth_state import AuthStateCache
+from driver_pool import DriverPool
+from element_cache import CACHE_STATS
+from network import PROFILES, LoadTimes, apply_profile, remove_stub, stub_response
+from page_metrics import PAGE_METRICS
+from round_trips import ROUND_TRIPS
+from waits import WAIT_METRICS
+from warm_profile import PROFILE_COPIES
+
+# shared helpers live in examples/utilities
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "utilities"))
+from command_profiler import PROFILER  # noqa: E402
 
 
 @dataclass
@@ -17,38 +35,133 @@ class TestUser:
 def config():
     return {
         "base_url": os.getenv("BASE_URL", "http://localhost:8080"),
-        "implicit_wait": int(os.getenv("IMPLICIT_WAIT", "10")),
+        # page objects wait explicitly; an implicit wait on top multiplies timeouts
+        "implicit_wait": int(os.getenv("IMPLICIT_WAIT", "0")),
         "headless": os.getenv("HEADLESS", "true").lower() == "true",
+        "reuse_browser": os.getenv("REUSE_BROWSER", "false").lower() == "true",
+        "browser_max_uses": int(os.getenv("BROWSER_MAX_USES", "50")),
+        "hub_url": os.getenv("SELENIUM_HUB_URL"),
+        # none | default | strict, see network.PROFILES
+        "block_profile": os.getenv("BLOCK_PROFILE", "none"),
+        "block_urls": tuple(p for p in os.getenv("BLOCK_URLS", "").split(",") if p),
+        "load_baseline": os.getenv("UI_LOAD_BASELINE", ".ui_load_baseline.json"),
+        # page load timing costs a script round trip per get(); only when asked for
+        "measure_loads": bool(os.getenv("BLOCK_PROFILE") or os.getenv("UI_LOAD_BASELINE")),
+        # template built by warm_profile.py; each chrome gets a copy of its caches
+        "warm_profile": os.getenv("WARM_PROFILE"),
+        # directory for the command profile (flame graph + percentiles)
+        "profile_commands": os.getenv("PROFILE_COMMANDS"),
     }
 
 
-@pytest.fixture(params=["chrome", "firefox"])
-def browser(request, config):
-    browser_name = request.param
-
+def create_driver(browser_name: str, config: dict):
     if browser_name == "chrome":
         options = ChromeOptions()
         if config["headless"]:
             options.add_argument("--headless")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
-        driver = webdriver.Chrome(options=options)
+        if config["warm_profile"] and not config["hub_url"]:
+            options.add_argument(f"--user-data-dir={PROFILE_COPIES.copy(config['warm_profile'])}")
 
     elif browser_name == "firefox":
         options = FirefoxOptions()
         if config["headless"]:
             options.add_argument("--headless")
-        driver = webdriver.Firefox(options=options)
 
     else:
         raise ValueError(f"Unsupported browser: {browser_name}")
 
+    if config["hub_url"]:
+        driver = webdriver.Remote(command_executor=config["hub_url"], options=options)
+    elif browser_name == "chrome":
+        driver = webdriver.Chrome(options=options)
+    else:
+        driver = webdriver.Firefox(options=options)
+
     driver.implicitly_wait(config["implicit_wait"])
     driver.maximize_window()
+    apply_profile(driver, PROFILES[config["block_profile"]], config["block_urls"])
+    return driver
+
+
+@pytest.fixture(scope="session")
+def driver_pool(config):
+    """warm browsers reused across tests when REUSE_BROWSER=true"""
+    if not config["reuse_browser"]:
+        yield None
+        return
+
+    pool = DriverPool(
+        lambda name: create_driver(name, config),
+        max_uses=config["browser_max_uses"]
+    )
+    yield pool
 
+    pool.close_all()
+    print(f"\nBrowser pool: {pool.report()}")
+
+
+_load_times_key = pytest.StashKey[LoadTimes]()
+
+
+@pytest.fixture(scope="session")
+def load_times(request, config):
+    """
+    page load times per test when BLOCK_PROFILE or UI_LOAD_BASELINE is set;
+    an unblocked run (BLOCK_PROFILE=none) records the baseline
+    """
+    if not config["measure_loads"]:
+        yield None
+        return
+
+    times = LoadTimes(config["load_baseline"], record_baseline=config["block_profile"] == "none")
+    request.config.stash[_load_times_key] = times
+    yield times
+    times.save()
+
+
+@pytest.fixture(params=["chrome", "firefox"])
+def browser(request, config, driver_pool, load_times):
+    browser_name = request.param
+
+    if driver_pool is None:
+        driver = create_driver(browser_name, config)
+        if config["profile_commands"]:
+            PROFILER.install(driver)
+        if load_times is not None:
+            load_times.install(driver)
+        yield driver
+        driver.quit()
+        return
+
+    driver = driver_pool.acquire(browser_name)
+    if config["profile_commands"]:
+        PROFILER.install(driver)
+    if load_times is not None:
+        load_times.install(driver)
     yield driver
+    driver_pool.release(browser_name, driver)
+
+
+@pytest.fixture
+def stub_backend(browser):
+    """
+    stub_backend("*/api/users*", [{"id": 1}]) answers matching fetch/XHR
+    calls on pages loaded afterwards. chromium only; skips elsewhere.
+    """
+    stub_ids = []
 
-    driver.quit()
+    def stub(url_pattern, body, status=200, method=None):
+        stub_id = stub_response(browser, url_pattern, body, status, method)
+        if stub_id is None:
+            pytest.skip("backend stubs need a chromium driver")
+        stub_ids.append(stub_id)
+
+    yield stub
+
+    for stub_id in stub_ids:
+        remove_stub(browser, stub_id)
 
 
 @pytest.fixture
@@ -60,18 +173,157 @@ def test_user():
     )
 
 
-@pytest.fixture
-def authenticated_user(browser, test_user):
-    """already logged in browser session"""
+@pytest.fixture(scope="session")
+def auth_states():
+    """logged-in browser state captured once per browser and user"""
+    cache = AuthStateCache()
+    yield cache
+    print(f"\nAuth state: {cache.ui_logins} ui logins, {cache.injections} injected")
+
+
+def _ui_login(driver, test_user):
     from login_page import LoginPage
 
-    login_page = LoginPage(browser)
+    login_page = LoginPage(driver)
     login_page.navigate()
+    login_url = driver.current_url
     login_page.login(test_user.username, test_user.password)
+    WebDriverWait(driver, 10).until(EC.url_changes(login_url))
+
+
+@pytest.fixture
+def authenticated_user(request, browser, test_user, auth_states):
+    """
+    already logged in browser session.
+    restores captured cookies/storage instead of logging in through
+    the ui; mark a test with @pytest.mark.ui_login to force the real flow.
+    """
+    if request.node.get_closest_marker("ui_login"):
+        _ui_login(browser, test_user)
+    else:
+        auth_states.login(browser, test_user.username, lambda d: _ui_login(d, test_user))
 
     yield browser
 
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "ui_login: log in through the login page instead of restoring state")
+    block_profile = os.getenv("BLOCK_PROFILE", "none")
+    if block_profile not in PROFILES:
+        raise pytest.UsageError(
+            f"BLOCK_PROFILE={block_profile!r} is not a block profile; use one of: {', '.join(PROFILES)}"
+        )
+    PAGE_METRICS.configure(
+        enabled=os.getenv("PERF_METRICS", "false").lower() == "true",
+        history_path=os.getenv("PERF_HISTORY", ".ui_perf_history.jsonl"),
+        budgets_path=os.getenv("PERF_BUDGETS"),
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """fail tests whose page actions went over their performance budget"""
+    result = yield
+    violations = PAGE_METRICS.take_violations(item.nodeid)
+    if violations:
+        raise AssertionError("performance budget exceeded:\n  " + "\n  ".join(violations))
+    return result
+
+
+_durations: dict[str, float] = {}
+
+
+def pytest_runtest_logreport(report):
+    """per-test durations (setup + call + teardown) for parallel_runner.py"""
+    if os.getenv("UI_DURATIONS_PATH"):
+        _durations[report.nodeid] = _durations.get(report.nodeid, 0.0) + report.duration
+
+
+def pytest_sessionfinish(session):
+    ARTIFACTS.close()
+    PAGE_METRICS.save()
+    PROFILE_COPIES.cleanup()
+
+    directory = os.getenv("PROFILE_COMMANDS")
+    if directory and PROFILER.durations:
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        PROFILER.write(directory, f"-{worker}" if worker else "")
+
+    path = os.getenv("UI_DURATIONS_PATH")
+    if path and _durations:
+        with open(path, "w") as f:
+            json.dump(_durations, f)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """where page objects spent their time waiting and talking to the driver"""
+    top = WAIT_METRICS.top(10)
+    if top:
+        terminalreporter.section("page object waits")
+        for label, stat in top:
+            terminalreporter.write_line(
+                f"{label:<40} {stat.calls:>5} calls  {stat.total_ms:>9.0f}ms total  "
+                f"{stat.max_ms:>7.0f}ms max  {stat.timeouts} timeouts"
+            )
+
+    top = ROUND_TRIPS.top(10)
+    if top:
+        terminalreporter.section("webdriver round trips per page action")
+        for label, stat in top:
+            terminalreporter.write_line(
+                f"{label:<40} {stat.calls:>5} calls  {stat.avg_round_trips:>6.1f} avg  "
+                f"{stat.max_round_trips:>4} max  {stat.round_trips:>6} total"
+            )
+
+    if ARTIFACTS.captures:
+        stats = ARTIFACTS.report()
+        terminalreporter.section("failure artifacts")
+        terminalreporter.write_line(
+            f"{stats['captures']} captures in {ARTIFACTS.directory}/  "
+            f"{stats['avg_grab_ms']}ms avg / {stats['max_grab_ms']}ms max on the test's path  "
+            f"{stats['background_write_ms']}ms writing in the background  "
+            f"{stats['bytes_written'] / 1024:.0f} KiB  {stats['errors']} errors"
+        )
+
+    times = config.stash.get(_load_times_key, None)
+    if times is not None and times.tests:
+        totals = times.totals()
+        terminalreporter.section("page load time")
+        terminalreporter.write_line(
+            f"{totals['page_loads']} page loads, {totals['load_ms'] / 1000:.1f}s total, "
+            f"{totals['saved_ms'] / 1000:.1f}s saved vs baseline ({totals['compared']} compared)"
+        )
+        by_saving = sorted(times.tests.items(), key=lambda kv: kv[1].saved_ms, reverse=True)
+        for test, loads in by_saving[:10]:
+            terminalreporter.write_line(
+                f"{test:<60} {len(loads.loads):>3} loads  {loads.load_ms:>8.0f}ms  {loads.saved_ms:>8.0f}ms saved"
+            )
+
+    if PAGE_METRICS.samples:
+        terminalreporter.section("page performance (p50 / p95 ms, incl. history)")
+        for key, metrics in PAGE_METRICS.report().items():
+            cells = "  ".join(f"{m} {v['p50']:.0f}/{v['p95']:.0f}" for m, v in metrics.items())
+            terminalreporter.write_line(f"{key:<32} {cells}")
+
+    commands = PROFILER.report()["commands"]
+    if commands:
+        terminalreporter.section("webdriver command latency")
+        for name, stat in list(commands.items())[:10]:
+            terminalreporter.write_line(
+                f"{name:<40} {stat['count']:>6}x  {stat['total_ms']:>9.0f}ms total  "
+                f"p50 {stat['p50_ms']:>7.1f}  p95 {stat['p95_ms']:>7.1f}  max {stat['max_ms']:>7.1f}"
+            )
+
+    cached = CACHE_STATS.items()
+    if cached:
+        terminalreporter.section("element cache")
+        for page, stat in cached:
+            terminalreporter.write_line(
+                f"{page:<40} {stat.hits:>6} hits  {stat.misses:>6} misses  "
+                f"{stat.hit_rate:>4.0%}  {stat.stale} stale  {stat.flushes} flushes"
+            )
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """capture screenshot on failure"""
@@ -81,6 +333,6 @@ def pytest_runtest_makereport(item, call):
     if report.when == "call" and report.failed:
         driver = item.funcargs.get("browser")
         if driver:
-            screenshot_path = f"screenshots/{item.name}.png"
-            driver.save_screenshot(screenshot_path)
-            print(f"\nScreenshot: {screenshot_path}")
+            # grabs from the browser here, writes to disk in the background
+            capture = ARTIFACTS.capture(driver, artifact_name(item.nodeid))
+            print(f"\nArtifacts ({capture.grab_ms:.0f}ms): {', '.join(capture.paths.values())}")
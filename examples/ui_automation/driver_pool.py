@@ -0,0 +1,132 @@
+"""Warm browser pool shared by tests in one worker"""
+
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    launches: int = 0
+    recycled: int = 0
+    crashed: int = 0
+    resets: int = 0
+    reset_ms_total: float = 0.0
+
+    @property
+    def avg_reset_ms(self) -> float:
+        return self.reset_ms_total / self.resets if self.resets else 0.0
+
+
+@dataclass
+class _PooledDriver:
+    driver: WebDriver
+    uses: int = 0
+
+
+class DriverPool:
+    """
+    Keeps browser instances alive between tests instead of launching
+    one per test. State is wiped on release (cookies, local/session
+    storage, extra windows, back to about:blank). Drivers are replaced
+    after `max_uses` tests or as soon as they stop responding.
+
+    One pool per pytest process, so each xdist worker has its own.
+    """
+
+    def __init__(self, factory: Callable[[str], WebDriver], max_uses: int = 50):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.stats = PoolStats()
+        self._idle: dict[str, list[_PooledDriver]] = defaultdict(list)
+        self._in_use: dict[int, _PooledDriver] = {}
+
+    def acquire(self, browser_name: str) -> WebDriver:
+        idle = self._idle[browser_name]
+        while idle:
+            pooled = idle.pop()
+            if self._is_alive(pooled.driver):
+                self.stats.hits += 1
+                self._in_use[id(pooled.driver)] = pooled
+                return pooled.driver
+            self.stats.crashed += 1
+            self._quit(pooled.driver)
+
+        pooled = _PooledDriver(self.factory(browser_name))
+        self.stats.launches += 1
+        self._in_use[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def release(self, browser_name: str, driver: WebDriver) -> None:
+        pooled = self._in_use.pop(id(driver))
+        pooled.uses += 1
+
+        if pooled.uses >= self.max_uses:
+            self.stats.recycled += 1
+            self._quit(driver)
+            return
+
+        try:
+            self.reset(driver)
+        except WebDriverException:
+            self.stats.crashed += 1
+            self._quit(driver)
+            return
+        self._idle[browser_name].append(pooled)
+
+    def reset(self, driver: WebDriver) -> None:
+        """Wipe per-test state so the next test starts clean."""
+        start = time.perf_counter()
+
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # storage is per origin, so clear it before leaving the page
+        driver.delete_all_cookies()
+        if driver.current_url.startswith("http"):
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get("about:blank")
+
+        self.stats.resets += 1
+        self.stats.reset_ms_total += (time.perf_counter() - start) * 1000
+
+    def close_all(self) -> None:
+        for idle in self._idle.values():
+            for pooled in idle:
+                self._quit(pooled.driver)
+            idle.clear()
+        for pooled in self._in_use.values():
+            self._quit(pooled.driver)
+        self._in_use.clear()
+
+    def report(self) -> dict:
+        return {
+            "hits": self.stats.hits,
+            "launches": self.stats.launches,
+            "recycled": self.stats.recycled,
+            "crashed": self.stats.crashed,
+            "avg_reset_ms": round(self.stats.avg_reset_ms, 1),
+        }
+
+    @staticmethod
+    def _is_alive(driver: WebDriver) -> bool:
+        try:
+            driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _quit(driver: WebDriver) -> None:
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,132 @@
+"""Per-page cache of resolved elements"""
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+
+# commands after which every element reference may point at a dead document
+NAVIGATION_COMMANDS = frozenset({
+    Command.GET,
+    Command.GO_BACK,
+    Command.GO_FORWARD,
+    Command.REFRESH,
+    Command.SWITCH_TO_WINDOW,
+    Command.SWITCH_TO_FRAME,
+    Command.SWITCH_TO_PARENT_FRAME,
+    Command.CLOSE,
+    Command.NEW_WINDOW,
+})
+
+
+@dataclass
+class CacheStat:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    flushes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheStats:
+    """Cache counters summed per page class."""
+
+    def __init__(self):
+        self.stats: dict[str, CacheStat] = defaultdict(CacheStat)
+        self._lock = threading.Lock()
+
+    def add(self, page: str, **deltas: int) -> None:
+        with self._lock:
+            stat = self.stats[page]
+            for name, delta in deltas.items():
+                setattr(stat, name, getattr(stat, name) + delta)
+
+    def items(self) -> list[tuple[str, CacheStat]]:
+        with self._lock:
+            return sorted(self.stats.items())
+
+
+CACHE_STATS = CacheStats()
+
+
+def track_navigation(driver: WebDriver) -> None:
+    """Bump driver._navigation_epoch on every navigation command (installed once per driver)."""
+    if hasattr(driver, "_navigation_epoch"):
+        return
+    driver._navigation_epoch = 0
+    execute = driver.execute
+
+    def tracked(command, params=None):
+        if command in NAVIGATION_COMMANDS:
+            driver._navigation_epoch += 1
+        return execute(command, params)
+
+    driver.execute = tracked
+
+
+class ElementCache:
+    """
+    Resolved elements for the locators a page declares as CACHEABLE.
+
+    Everything is dropped when the driver navigates (get, back, refresh,
+    window or frame switches). Navigation the cache can't see, like a
+    form submit, shows up as a StaleElementReferenceException on use;
+    callers discard() the entry and resolve again.
+    """
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        cacheable: Iterable[tuple],
+        page: str,
+        stats: CacheStats = CACHE_STATS
+    ):
+        self.driver = driver
+        self.cacheable = frozenset(cacheable)
+        self.page = page
+        self.stats = stats
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.flushes = 0
+        self._elements: dict[tuple, WebElement] = {}
+        track_navigation(driver)
+        self._epoch = driver._navigation_epoch
+
+    def get(self, locator: tuple) -> Optional[WebElement]:
+        if locator not in self.cacheable:
+            return None
+        if self._epoch != self.driver._navigation_epoch:
+            self._epoch = self.driver._navigation_epoch
+            if self._elements:
+                self._elements.clear()
+                self._count("flushes")
+
+        element = self._elements.get(locator)
+        self._count("misses" if element is None else "hits")
+        return element
+
+    def put(self, locator: tuple, element: WebElement) -> None:
+        if locator in self.cacheable:
+            self._elements[locator] = element
+
+    def discard(self, locator: tuple) -> None:
+        """Drop an entry that turned out to be stale."""
+        if self._elements.pop(locator, None) is not None:
+            self._count("stale")
+
+    def clear(self) -> None:
+        self._elements.clear()
+
+    def _count(self, name: str) -> None:
+        setattr(self, name, getattr(self, name) + 1)
+        self.stats.add(self.page, **{name: 1})
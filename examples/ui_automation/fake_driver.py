@@ -0,0 +1,201 @@
+"""
+Fake WebDriver for unit tests.
+
+An in-process stand-in for the parts of a Selenium driver the page
+objects and helpers use: navigation, windows, cookies, scripts, script
+timeouts and element lookup. Every method goes through execute(), like
+the real driver, so the execute() wrappers installed by ElementCache,
+LoadTimes and RoundTripCounter see the same commands they would in a
+browser.
+"""
+
+from typing import Any, Callable, Optional, Union
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+from selenium.webdriver.remote.command import Command
+
+
+class FakeElement:
+    """An element that goes stale once `stale` is set, like a re-rendered node."""
+
+    def __init__(self, name: str, text: str = "", displayed: bool = True):
+        self.name = name
+        self.stale = False
+        self.clicks = 0
+        self.value = ""
+        self.keys: list[str] = []
+        self.selected = False
+        self._text = text
+        self.displayed = displayed
+
+    def _check(self) -> None:
+        if self.stale:
+            raise StaleElementReferenceException(f"{self.name} is no longer attached to the DOM")
+
+    @property
+    def text(self) -> str:
+        self._check()
+        return self._text
+
+    def is_enabled(self) -> bool:
+        self._check()
+        return True
+
+    def is_displayed(self) -> bool:
+        self._check()
+        return self.displayed
+
+    def is_selected(self) -> bool:
+        self._check()
+        return self.selected
+
+    def click(self) -> None:
+        self._check()
+        self.clicks += 1
+        self.selected = not self.selected
+
+    def clear(self) -> None:
+        self._check()
+        self.value = ""
+
+    def send_keys(self, *keys: str) -> None:
+        self._check()
+        self.keys.extend(keys)
+        self.value += "".join(keys)
+
+
+class _Timeouts:
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    @property
+    def script(self) -> float:
+        return self._driver.execute(Command.GET_TIMEOUTS)["script"] / 1000
+
+
+class _SwitchTo:
+    def __init__(self, driver: "FakeDriver"):
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        self._driver.execute(Command.SWITCH_TO_WINDOW, {"handle": handle})
+
+
+class FakeDriver:
+    """
+    Usage:
+        driver = FakeDriver(scripts={"performance.timeOrigin": [0, 0]})
+        driver.elements[(By.ID, "login")] = FakeElement("login")
+
+    `scripts` maps a substring of a script to its result, or to a
+    callable taking the script's arguments. `commands` lists every
+    command sent; `alive = False` makes the next one fail.
+    """
+
+    def __init__(self, scripts: Optional[dict[str, Union[Any, Callable]]] = None, browser_name: str = "chrome"):
+        self.scripts = scripts or {}
+        self.capabilities = {"browserName": browser_name}
+        self.elements: dict[tuple, FakeElement] = {}
+        self.commands: list[str] = []
+        self.alive = True
+        self.quits = 0
+        self.url = "about:blank"
+        self.visited: list[str] = []
+        self.handles = ["window-0"]
+        self.current_handle = "window-0"
+        self.cookies = {"session": "abc"}
+        self.script_timeout_ms = 30000
+        self.switch_to = _SwitchTo(self)
+        self.timeouts = _Timeouts(self)
+
+    def execute(self, command: str, params: Optional[dict] = None) -> Any:
+        self.commands.append(command)
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        params = params or {}
+
+        if command == Command.GET:
+            self.url = params["url"]
+            self.visited.append(self.url)
+        elif command == Command.W3C_GET_WINDOW_HANDLES:
+            return list(self.handles)
+        elif command == Command.SWITCH_TO_WINDOW:
+            self.current_handle = params["handle"]
+        elif command == Command.CLOSE:
+            self.handles.remove(self.current_handle)
+        elif command == Command.DELETE_ALL_COOKIES:
+            self.cookies.clear()
+        elif command == Command.GET_ALL_COOKIES:
+            return [{"name": name, "value": value} for name, value in self.cookies.items()]
+        elif command == Command.ADD_COOKIE:
+            self.cookies[params["cookie"]["name"]] = params["cookie"]["value"]
+        elif command == Command.GET_TIMEOUTS:
+            return {"script": self.script_timeout_ms}
+        elif command == Command.SET_TIMEOUTS:
+            self.script_timeout_ms = params.get("script", self.script_timeout_ms)
+        elif command in (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC):
+            return self._run_script(params["script"], params["args"])
+        elif command == Command.FIND_ELEMENTS:
+            element = self.elements.get((params["using"], params["value"]))
+            return [element] if element is not None else []
+        elif command == Command.QUIT:
+            self.quits += 1
+            self.alive = False
+        return None
+
+    def _run_script(self, script: str, args: list) -> Any:
+        for marker, result in self.scripts.items():
+            if marker in script:
+                return result(*args) if callable(result) else result
+        return None
+
+    # --- the WebDriver methods the suite calls ---
+
+    def get(self, url: str) -> None:
+        self.execute(Command.GET, {"url": url})
+
+    @property
+    def current_url(self) -> str:
+        self.execute(Command.GET_CURRENT_URL)
+        return self.url
+
+    @property
+    def window_handles(self) -> list[str]:
+        return self.execute(Command.W3C_GET_WINDOW_HANDLES)
+
+    def close(self) -> None:
+        self.execute(Command.CLOSE)
+
+    def quit(self) -> None:
+        self.execute(Command.QUIT)
+
+    def delete_all_cookies(self) -> None:
+        self.execute(Command.DELETE_ALL_COOKIES)
+
+    def get_cookies(self) -> list[dict]:
+        return self.execute(Command.GET_ALL_COOKIES)
+
+    def add_cookie(self, cookie: dict) -> None:
+        self.execute(Command.ADD_COOKIE, {"cookie": cookie})
+
+    def set_script_timeout(self, time_to_wait: float) -> None:
+        self.execute(Command.SET_TIMEOUTS, {"script": int(time_to_wait * 1000)})
+
+    def execute_script(self, script: str, *args) -> Any:
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)})
+
+    def execute_async_script(self, script: str, *args) -> Any:
+        return self.execute(Command.W3C_EXECUTE_SCRIPT_ASYNC, {"script": script, "args": list(args)})
+
+    def find_elements(self, by: str, value: str) -> list[FakeElement]:
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"no element {by}={value}")
+        return found[0]
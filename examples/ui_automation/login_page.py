@@ -2,6 +2,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from base_page import BasePage
+from page_metrics import measured
+from round_trips import page_action
 
 
 class LoginPage(BasePage):
@@ -13,41 +15,60 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = (By.CLASS_NAME, "error-message")
     REMEMBER_ME_CHECKBOX = (By.ID, "remember-me")
 
+    # the form itself is static; ERROR_MESSAGE is re-rendered on each attempt
+    CACHEABLE = (USERNAME_INPUT, PASSWORD_INPUT, LOGIN_BUTTON, REMEMBER_ME_CHECKBOX)
+
     URL = "/login"
 
+    BUDGETS = {
+        "navigate": {"ttfb": 800, "fcp": 1800, "lcp": 2500, "load": 4000},
+        "click_login": {"long_task_ms": 200},
+    }
+
     def __init__(self, driver: WebDriver):
         super().__init__(driver)
 
+    @page_action
+    @measured(navigation=True)
     def navigate(self) -> "LoginPage":
         self.driver.get(f"{self.base_url}{self.URL}")
         return self
 
+    @page_action
     def enter_username(self, username: str) -> "LoginPage":
         self.type_text(self.USERNAME_INPUT, username)
         return self
 
+    @page_action
     def enter_password(self, password: str) -> "LoginPage":
         self.type_text(self.PASSWORD_INPUT, password)
         return self
 
+    @page_action
+    @measured
     def click_login(self) -> None:
         self.click(self.LOGIN_BUTTON)
 
+    @page_action
     def check_remember_me(self) -> "LoginPage":
         self.click(self.REMEMBER_ME_CHECKBOX)
         return self
 
+    @page_action
     def login(self, username: str, password: str) -> None:
-        """do the whole login flow"""
+        """do the whole login flow, typed with real key events: this is the UI under test"""
         self.enter_username(username)
         self.enter_password(password)
         self.click_login()
 
+    @page_action
     def get_error_message(self) -> str:
         return self.get_text(self.ERROR_MESSAGE)
 
+    @page_action
     def is_error_displayed(self) -> bool:
         return self.is_visible(self.ERROR_MESSAGE, timeout=3)
 
+    @page_action
     def is_login_page(self) -> bool:
         return self.is_visible(self.LOGIN_BUTTON)
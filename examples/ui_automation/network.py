@@ -0,0 +1,272 @@
+"""
+Network shaping for UI tests: block resources and stub backend calls.
+
+Blocking uses the Chrome DevTools Protocol (Network.setBlockedURLs), so
+the browser never opens the connection and the page's load event
+doesn't wait for analytics, fonts or tag managers. Resource types are
+blocked by their file extensions, because setBlockedURLs only matches
+URLs.
+
+Backend stubs are injected with Page.addScriptToEvaluateOnNewDocument.
+The script answers matching fetch/XHR calls in the page, and it must
+be registered before the navigation it should affect.
+
+Both need a local Chromium driver (execute_cdp_cmd). On Firefox or a
+Remote driver they report themselves as unsupported and do nothing.
+
+LoadTimes reads the navigation timing after every driver.get and, with
+a baseline recorded by an unblocked run, reports the time saved per
+test.
+"""
+
+import json
+import os
+import re
+import statistics
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+RESOURCE_TYPE_PATTERNS = {
+    "font": ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"),
+    # no *.ico: auth_state.inject opens /favicon.ico to get onto the origin
+    "image": ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg"),
+    "media": ("*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav"),
+}
+
+THIRD_PARTY_TAGS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*cdn.segment.com*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+)
+
+
+@dataclass(frozen=True)
+class BlockProfile:
+    name: str
+    url_patterns: tuple[str, ...] = ()
+    resource_types: tuple[str, ...] = ()
+
+    def patterns(self) -> list[str]:
+        patterns = list(self.url_patterns)
+        for resource_type in self.resource_types:
+            patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+        return patterns
+
+
+PROFILES = {
+    "none": BlockProfile("none"),
+    "default": BlockProfile("default", THIRD_PARTY_TAGS, ("font",)),
+    "strict": BlockProfile("strict", THIRD_PARTY_TAGS, ("font", "image", "media")),
+}
+
+
+def supports_cdp(driver: WebDriver) -> bool:
+    return hasattr(driver, "execute_cdp_cmd")
+
+
+def apply_profile(driver: WebDriver, profile: BlockProfile, extra_patterns: tuple[str, ...] = ()) -> bool:
+    """Block the profile's URLs for the rest of the session; False if the driver can't."""
+    patterns = profile.patterns() + list(extra_patterns)
+    if not patterns or not supports_cdp(driver):
+        return False
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return True
+
+
+# --- backend stubs ---
+
+_STUB_SCRIPT = """
+(() => {
+const stubs = window.__uiStubs = window.__uiStubs || [];
+stubs.push(%s);
+if (window.__uiStubsInstalled) return;
+window.__uiStubsInstalled = true;
+
+const match = (url, method) => {
+    const absolute = String(new URL(url, location.href));
+    return stubs.find(s => new RegExp(s.pattern).test(absolute) && (!s.method || s.method === method));
+};
+
+const realFetch = window.fetch;
+window.fetch = function (input, init) {
+    const url = typeof input === "string" ? input : input.url;
+    const method = ((init && init.method) || (input && input.method) || "GET").toUpperCase();
+    const stub = match(url, method);
+    if (!stub) return realFetch.apply(this, arguments);
+    return Promise.resolve(new Response(stub.body, {
+        status: stub.status, headers: {"Content-Type": stub.contentType}
+    }));
+};
+
+const open = XMLHttpRequest.prototype.open;
+const send = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.open = function (method, url) {
+    this.__stub = match(url, method.toUpperCase());
+    return open.apply(this, arguments);
+};
+XMLHttpRequest.prototype.send = function () {
+    const stub = this.__stub;
+    if (!stub) return send.apply(this, arguments);
+    const define = (name, value) => Object.defineProperty(this, name, {value, configurable: true});
+    define("readyState", 4);
+    define("status", stub.status);
+    define("responseText", stub.body);
+    define("response", this.responseType === "json" ? JSON.parse(stub.body) : stub.body);
+    this.getResponseHeader = name => name.toLowerCase() === "content-type" ? stub.contentType : null;
+    setTimeout(() => ["readystatechange", "load", "loadend"].forEach(
+        type => this.dispatchEvent(new Event(type))
+    ));
+};
+})();
+"""
+
+
+def glob_to_regex(pattern: str) -> str:
+    """'*/api/users*' -> a JS-compatible anchored regex"""
+    return "^" + ".*".join(re.escape(part) for part in pattern.split("*")) + "$"
+
+
+def stub_response(
+    driver: WebDriver,
+    url_pattern: str,
+    body: Any,
+    status: int = 200,
+    method: Optional[str] = None,
+    content_type: str = "application/json"
+) -> Optional[str]:
+    """
+    Answer fetch/XHR calls matching `url_pattern` (glob) with `body` on
+    every page loaded from now on. Returns an id for remove_stub, or
+    None when the driver has no CDP.
+    """
+    if not supports_cdp(driver):
+        return None
+    stub = {
+        "pattern": glob_to_regex(url_pattern),
+        "method": method.upper() if method else None,
+        "status": status,
+        "body": body if isinstance(body, str) else json.dumps(body),
+        "contentType": content_type,
+    }
+    result = driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {"source": _STUB_SCRIPT % json.dumps(stub)}
+    )
+    return result["identifier"]
+
+
+def remove_stub(driver: WebDriver, stub_id: str) -> None:
+    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": stub_id})
+
+
+# --- load time accounting ---
+
+_NAVIGATION_TIMING = """
+const nav = performance.getEntriesByType("navigation")[0];
+return nav ? {url: location.href, load_ms: nav.loadEventEnd - nav.startTime} : null;
+"""
+
+
+@dataclass
+class PageLoad:
+    path: str
+    load_ms: float
+    baseline_ms: Optional[float]
+
+    @property
+    def saved_ms(self) -> Optional[float]:
+        return None if self.baseline_ms is None else self.baseline_ms - self.load_ms
+
+
+@dataclass
+class PerTestLoads:
+    loads: list[PageLoad] = field(default_factory=list)
+
+    @property
+    def load_ms(self) -> float:
+        return sum(load.load_ms for load in self.loads)
+
+    @property
+    def saved_ms(self) -> float:
+        return sum(load.saved_ms for load in self.loads if load.saved_ms is not None)
+
+
+class LoadTimes:
+    """
+    Page load durations per test, compared against a baseline.
+
+    Run once with BLOCK_PROFILE=none and record_baseline=True to store
+    per-page medians; later runs with a blocking profile report how
+    much load time each test saved against them.
+    """
+
+    def __init__(self, baseline_path: str, record_baseline: bool, keep: int = 20):
+        self.baseline_path = baseline_path
+        self.record_baseline = record_baseline
+        self.keep = keep
+        self.tests: dict[str, PerTestLoads] = defaultdict(PerTestLoads)
+        self._samples: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(baseline_path):
+            with open(baseline_path) as f:
+                self._samples = json.load(f)
+        self._baseline = {path: statistics.median(s) for path, s in self._samples.items() if s}
+
+    def install(self, driver: WebDriver) -> None:
+        """Time every driver.get on this driver (once per driver)."""
+        if getattr(driver, "_load_times", None) is self:
+            return
+        execute = driver.execute
+
+        def timed(command, params=None):
+            result = execute(command, params)
+            if command == Command.GET:
+                self._record(driver.execute_script(_NAVIGATION_TIMING))
+            return result
+
+        driver.execute = timed
+        driver._load_times = self
+
+    def _record(self, timing: Optional[dict]) -> None:
+        if not timing or timing["load_ms"] <= 0:
+            return  # about:blank, or the load event hasn't fired
+        path = urlsplit(timing["url"]).path or "/"
+        current = os.getenv("PYTEST_CURRENT_TEST")
+        test = current.rsplit(" ", 1)[0] if current else "(no test)"
+        with self._lock:
+            self.tests[test].loads.append(PageLoad(path, timing["load_ms"], self._baseline.get(path)))
+
+    def totals(self) -> dict:
+        loads = [load for t in self.tests.values() for load in t.loads]
+        compared = [load for load in loads if load.saved_ms is not None]
+        return {
+            "page_loads": len(loads),
+            "load_ms": round(sum(load.load_ms for load in loads), 1),
+            "compared": len(compared),
+            "saved_ms": round(sum(load.saved_ms for load in compared), 1),
+        }
+
+    def save(self) -> None:
+        if not self.record_baseline or not self.tests:
+            return
+        with self._lock:
+            for test in self.tests.values():
+                for load in test.loads:
+                    self._samples.setdefault(load.path, []).append(round(load.load_ms, 1))
+            samples = {path: s[-self.keep:] for path, s in self._samples.items()}
+        os.makedirs(os.path.dirname(self.baseline_path) or ".", exist_ok=True)
+        with open(self.baseline_path, "w") as f:
+            json.dump(samples, f, indent=2, sort_keys=True)
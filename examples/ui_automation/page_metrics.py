@@ -0,0 +1,216 @@
+"""
+Page performance metrics for page objects.
+
+Actions decorated with @measured read Navigation Timing, Paint Timing,
+Largest Contentful Paint and Long Tasks once they finish. An action that
+loaded a new document reports TTFB, DOMContentLoaded, load, FCP and
+LCP. An action that stayed on the same document, e.g. a client-side
+submit, reports only the long tasks that ran during it. Every action
+also records its wall time.
+
+Samples are appended to a JSON-lines history, so percentiles cover
+earlier runs too. Budgets come from the page class's BUDGETS and an
+optional JSON file; conftest fails the test when one is exceeded.
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Optional, TypeVar
+
+
+F = TypeVar("F", bound=Callable)
+
+METRICS = ("ttfb", "dcl", "load", "fcp", "lcp", "long_task_ms", "duration")
+
+_MARK = "return [performance.timeOrigin, performance.now()];"
+
+# LCP and long tasks are only exposed to observers; buffered:true replays
+# what already happened, delivered on the next task (hence the timeout)
+_COLLECT = """
+const [originBefore, markBefore, done] = [arguments[0], arguments[1], arguments[arguments.length - 1]];
+const sameDocument = performance.timeOrigin === originBefore;
+const since = sameDocument ? markBefore : 0;
+const nav = performance.getEntriesByType("navigation")[0];
+const fcp = performance.getEntriesByName("first-contentful-paint")[0];
+const result = {
+    same_document: sameDocument,
+    url: location.href,
+    ttfb: nav ? nav.responseStart - nav.startTime : null,
+    dcl: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load: nav ? nav.loadEventEnd - nav.startTime : null,
+    fcp: fcp ? fcp.startTime : null,
+    lcp: null,
+    long_tasks: 0,
+    long_task_ms: 0,
+};
+const observe = (type, handle) => {
+    try {
+        new PerformanceObserver(list => list.getEntries().forEach(handle)).observe({type, buffered: true});
+    } catch (e) { /* entry type not supported by this browser */ }
+};
+observe("largest-contentful-paint", entry => { result.lcp = entry.startTime; });
+observe("longtask", entry => {
+    if (entry.startTime >= since) { result.long_tasks += 1; result.long_task_ms += entry.duration; }
+});
+setTimeout(() => done(result), 50);
+"""
+
+
+@dataclass
+class PageSample:
+    page: str
+    action: str
+    url: str
+    duration: float
+    ttfb: Optional[float] = None
+    dcl: Optional[float] = None
+    load: Optional[float] = None
+    fcp: Optional[float] = None
+    lcp: Optional[float] = None
+    long_tasks: int = 0
+    long_task_ms: float = 0.0
+    test: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def key(self) -> str:
+        return f"{self.page}.{self.action}"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+class PageMetrics:
+    """Collects samples, checks budgets and keeps the cross-run history."""
+
+    def __init__(self):
+        self.enabled = False
+        self.history_path: Optional[str] = None
+        self.budgets: dict[str, dict[str, dict[str, float]]] = {}
+        self.samples: list[PageSample] = []
+        self._saved = 0
+        self._violations: dict[str, list[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, history_path: Optional[str] = None, budgets_path: Optional[str] = None) -> None:
+        self.enabled = enabled
+        self.history_path = history_path
+        if budgets_path and os.path.exists(budgets_path):
+            with open(budgets_path) as f:
+                self.budgets = json.load(f)
+
+    def budget_for(self, page, action: str) -> dict[str, float]:
+        """class BUDGETS, overridden per metric by the budgets file"""
+        budget = dict(getattr(page, "BUDGETS", {}).get(action, {}))
+        budget.update(self.budgets.get(type(page).__name__, {}).get(action, {}))
+        return budget
+
+    def record(self, page, sample: PageSample) -> None:
+        violations = [
+            f"{sample.key} {metric} {value:.0f}ms > budget {limit:.0f}ms"
+            for metric, limit in self.budget_for(page, sample.action).items()
+            if (value := getattr(sample, metric)) is not None and value > limit
+        ]
+        with self._lock:
+            self.samples.append(sample)
+            if violations:
+                self._violations[sample.test or ""].extend(violations)
+
+    def take_violations(self, test: str) -> list[str]:
+        with self._lock:
+            return self._violations.pop(test, [])
+
+    def save(self) -> None:
+        if not self.history_path or not self.samples:
+            return
+        os.makedirs(os.path.dirname(self.history_path) or ".", exist_ok=True)
+        with self._lock, open(self.history_path, "a") as f:
+            for sample in self.samples[self._saved:]:
+                f.write(json.dumps(asdict(sample)) + "\n")
+            self._saved = len(self.samples)
+
+    def report(self, keep: int = 200) -> dict[str, dict[str, dict[str, float]]]:
+        """p50/p75/p95 per page action and metric over history plus this run"""
+        by_key: dict[str, list[dict]] = defaultdict(list)
+        if self.history_path and os.path.exists(self.history_path):
+            with open(self.history_path) as f:
+                for line in f:
+                    row = json.loads(line)
+                    by_key[f"{row['page']}.{row['action']}"].append(row)
+        with self._lock:
+            unsaved = self.samples if not self.history_path else self.samples[self._saved:]
+            for sample in unsaved:
+                by_key[sample.key].append(asdict(sample))
+
+        report = {}
+        for key, rows in sorted(by_key.items()):
+            rows = rows[-keep:]
+            report[key] = {}
+            for metric in METRICS:
+                values = [row[metric] for row in rows if row.get(metric) is not None]
+                if values:
+                    report[key][metric] = {
+                        "n": len(values),
+                        "p50": round(percentile(values, 50), 1),
+                        "p75": round(percentile(values, 75), 1),
+                        "p95": round(percentile(values, 95), 1),
+                    }
+        return report
+
+
+PAGE_METRICS = PageMetrics()
+
+
+def measured(method: Optional[F] = None, *, navigation: bool = False):
+    """
+    Collect page metrics after this page action (when PAGE_METRICS is enabled).
+
+    Use @measured(navigation=True) on actions that always load a new
+    document; they skip marking the old one first, saving a round trip.
+    """
+    if method is None:
+        return lambda m: _measured(m, navigation)
+    return _measured(method, navigation)
+
+
+def _measured(method: F, navigation: bool) -> F:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not PAGE_METRICS.enabled:
+            return method(self, *args, **kwargs)
+
+        origin, mark = (None, 0) if navigation else self.driver.execute_script(_MARK)
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        duration = (time.perf_counter() - start) * 1000
+
+        timing = self.driver.execute_async_script(_COLLECT, origin, mark)
+        if timing["same_document"]:
+            # still the old document: its load metrics say nothing about this action
+            timing.update(ttfb=None, dcl=None, load=None, fcp=None, lcp=None)
+        current = os.getenv("PYTEST_CURRENT_TEST")
+        PAGE_METRICS.record(self, PageSample(
+            page=type(self).__name__,
+            action=method.__name__,
+            url=timing["url"],
+            duration=duration,
+            ttfb=timing["ttfb"],
+            dcl=timing["dcl"],
+            load=timing["load"],
+            fcp=timing["fcp"],
+            lcp=timing["lcp"],
+            long_tasks=timing["long_tasks"],
+            long_task_ms=timing["long_task_ms"],
+            test=current.rsplit(" ", 1)[0] if current else None,
+        ))
+        return result
+    return wrapper
@@ -0,0 +1,360 @@
+"""
+Parallel cross-browser runner for the UI suite.
+
+The browser fixture runs every test once per browser, one after the
+other. This runner collects the (test x browser) items, packs them into
+per-browser jobs balanced by how long each test took last time, and
+runs the jobs as separate pytest processes, longest first, without
+going over a per-browser concurrency cap. Browsers come from the local
+machine or from a Selenium Grid when SELENIUM_HUB_URL is set (cap each
+browser at its node's max sessions).
+
+Durations are recorded by conftest.py into UI_DURATIONS_PATH and merged
+into the history file after every run, so balancing improves over time.
+
+Usage:
+    python parallel_runner.py --workers 6 --cap chrome=4 --cap firefox=2
+    python parallel_runner.py -k login --history .ui_durations.json
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BROWSERS = ("chrome", "firefox")
+DEFAULT_ESTIMATE_S = 10.0
+
+
+def browser_of(nodeid: str) -> str:
+    """Browser a parametrized test id runs on, e.g. test_x[chrome] -> chrome."""
+    match = re.search(r"\[([^\]]*)\]$", nodeid)
+    if match:
+        for part in match.group(1).split("-"):
+            if part in BROWSERS:
+                return part
+    return "none"
+
+
+class DurationHistory:
+    """Per-test durations from earlier runs, smoothed so one slow run doesn't dominate."""
+
+    def __init__(self, path: str, alpha: float = 0.5):
+        self.path = path
+        self.alpha = alpha
+        self.durations: dict[str, float] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.durations = json.load(f)
+
+    def estimate(self, nodeid: str) -> float:
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        # unseen test: assume it's typical
+        return statistics.median(self.durations.values()) if self.durations else DEFAULT_ESTIMATE_S
+
+    def update(self, measured: dict[str, float]) -> None:
+        for nodeid, seconds in measured.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = (
+                seconds if previous is None
+                else self.alpha * seconds + (1 - self.alpha) * previous
+            )
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class Job:
+    browser: str
+    nodeids: list[str]
+    estimate_s: float
+    worker: int = -1
+    started_at: float = 0.0
+    duration_s: float = 0.0
+    returncode: Optional[int] = None
+    log_path: str = ""
+
+
+@dataclass
+class RunReport:
+    tests: int
+    jobs: list[Job]
+    workers: int
+    caps: dict[str, int]
+    wall_s: float
+    serial_s: float
+    test_durations: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def speedup(self) -> float:
+        return self.serial_s / self.wall_s if self.wall_s else 0.0
+
+    @property
+    def failed_jobs(self) -> list[Job]:
+        # 5 = nothing collected, e.g. a -k filter excluded the whole chunk
+        return [j for j in self.jobs if j.returncode not in (0, 5)]
+
+    def to_dict(self) -> dict:
+        per_browser: dict[str, dict] = defaultdict(lambda: {"tests": 0, "jobs": 0, "busy_s": 0.0})
+        for job in self.jobs:
+            stats = per_browser[job.browser]
+            stats["tests"] += len(job.nodeids)
+            stats["jobs"] += 1
+            stats["busy_s"] = round(stats["busy_s"] + job.duration_s, 2)
+        busy = sum(j.duration_s for j in self.jobs)
+        return {
+            "tests": self.tests,
+            "jobs": len(self.jobs),
+            "workers": self.workers,
+            "caps": self.caps,
+            "wall_s": round(self.wall_s, 2),
+            "serial_s": round(self.serial_s, 2),
+            "speedup": round(self.speedup, 2),
+            "worker_utilization": round(busy / (self.wall_s * self.workers), 2) if self.wall_s else 0.0,
+            "per_browser": dict(per_browser),
+            "failed_jobs": [{"browser": j.browser, "log": j.log_path} for j in self.failed_jobs],
+        }
+
+
+def _pytest_cmd(*args: str) -> list[str]:
+    # rootdir pinned so collected ids and job arguments line up
+    return [sys.executable, "-m", "pytest", "--rootdir", HERE, "-p", "no:cacheprovider", *args]
+
+
+def collect(paths: list[str], selection: list[str]) -> list[str]:
+    result = subprocess.run(
+        _pytest_cmd("--collect-only", "-q", *selection, *paths),
+        cwd=HERE, capture_output=True, text=True
+    )
+    if result.returncode not in (0, 5):
+        raise RuntimeError(f"Collection failed:\n{result.stdout}\n{result.stderr}")
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+
+def plan(
+    nodeids: list[str],
+    history: DurationHistory,
+    workers: int,
+    chunks_per_worker: int = 3,
+    min_job_s: float = 20.0
+) -> list[Job]:
+    """
+    Split tests into per-browser jobs of similar estimated length.
+
+    Aims for a few jobs per worker so the tail can still be balanced
+    dynamically, but no shorter than `min_job_s` so pytest startup
+    doesn't eat the gain. Tests are packed longest-first into the
+    currently lightest job of their browser.
+    """
+    by_browser: dict[str, list[str]] = defaultdict(list)
+    for nodeid in nodeids:
+        by_browser[browser_of(nodeid)].append(nodeid)
+
+    total = sum(history.estimate(n) for n in nodeids)
+    target = max(total / max(workers * chunks_per_worker, 1), min_job_s)
+
+    jobs: list[Job] = []
+    for browser, ids in by_browser.items():
+        estimates = {n: history.estimate(n) for n in ids}
+        count = min(len(ids), max(1, math.ceil(sum(estimates.values()) / target)))
+        bins = [(0.0, i, []) for i in range(count)]
+        for nodeid in sorted(ids, key=estimates.get, reverse=True):
+            load, i, members = heapq.heappop(bins)
+            members.append(nodeid)
+            heapq.heappush(bins, (load + estimates[nodeid], i, members))
+        jobs.extend(Job(browser, members, load) for load, _, members in bins if members)
+
+    return sorted(jobs, key=lambda j: j.estimate_s, reverse=True)
+
+
+class Scheduler:
+    """Runs jobs as pytest processes on `workers` slots, honoring per-browser caps."""
+
+    def __init__(
+        self,
+        workers: int,
+        caps: dict[str, int],
+        selection: list[str],
+        log_dir: str,
+        poll_s: float = 0.05
+    ):
+        # a browser capped at 0 could never start its jobs and the loop would spin
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, not {workers}")
+        for browser, cap in caps.items():
+            if cap < 1:
+                raise ValueError(f"cap for {browser} must be at least 1, not {cap}")
+        self.workers = workers
+        self.caps = caps
+        self.selection = selection
+        self.log_dir = log_dir
+        self.poll_s = poll_s
+        os.makedirs(log_dir, exist_ok=True)
+
+    def _start(self, job: Job, worker: int, durations_path: str) -> subprocess.Popen:
+        job.worker = worker
+        job.log_path = os.path.join(self.log_dir, f"worker{worker}-{job.browser}-{int(time.time() * 1000)}.log")
+        env = {**os.environ, "UI_DURATIONS_PATH": durations_path, "UI_WORKER_ID": str(worker)}
+        job.started_at = time.perf_counter()
+        with open(job.log_path, "w") as log:
+            return subprocess.Popen(
+                _pytest_cmd("-q", *self.selection, *job.nodeids),
+                cwd=HERE, env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+
+    def run(self, jobs: list[Job]) -> tuple[float, dict[str, float]]:
+        """Run all jobs; returns wall time and the per-test durations the jobs measured."""
+        pending = list(jobs)
+        running: dict[subprocess.Popen, tuple[Job, str]] = {}
+        free = list(range(self.workers))
+        active: dict[str, int] = defaultdict(int)
+        durations: dict[str, float] = {}
+        start = time.perf_counter()
+
+        while pending or running:
+            for job in list(pending):
+                if not free:
+                    break
+                if active[job.browser] >= self.caps.get(job.browser, self.workers):
+                    continue
+                pending.remove(job)
+                fd, durations_path = tempfile.mkstemp(prefix="ui-durations-", suffix=".json")
+                os.close(fd)
+                running[self._start(job, free.pop(0), durations_path)] = (job, durations_path)
+                active[job.browser] += 1
+
+            for proc in [p for p in running if p.poll() is not None]:
+                job, durations_path = running.pop(proc)
+                job.returncode = proc.returncode
+                job.duration_s = time.perf_counter() - job.started_at
+                active[job.browser] -= 1
+                free.append(job.worker)
+                durations.update(_read_durations(durations_path))
+                status = "ok" if job.returncode in (0, 5) else f"FAILED (rc={job.returncode}) see {job.log_path}"
+                print(f"[worker {job.worker}] {job.browser:<8} {len(job.nodeids):>3} tests "
+                      f"{job.duration_s:>6.1f}s (est {job.estimate_s:.1f}s) {status}")
+
+            time.sleep(self.poll_s)
+
+        return time.perf_counter() - start, durations
+
+
+def _read_durations(path: str) -> dict[str, float]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def run(
+    paths: list[str],
+    selection: list[str],
+    workers: int,
+    caps: dict[str, int],
+    history_path: str,
+    log_dir: str
+) -> RunReport:
+    history = DurationHistory(history_path)
+    scheduler = Scheduler(workers, caps, selection, log_dir)
+    nodeids = collect(paths, selection)
+    jobs = plan(nodeids, history, workers)
+
+    wall_s, durations = scheduler.run(jobs)
+
+    serial_s = serial_estimate(nodeids, history, durations)
+    history.update(durations)
+    history.save()
+    return RunReport(
+        tests=len(nodeids),
+        jobs=jobs,
+        workers=workers,
+        caps=caps,
+        wall_s=wall_s,
+        serial_s=serial_s,
+        test_durations=durations,
+    )
+
+
+def serial_estimate(nodeids: list[str], history: DurationHistory, measured: dict[str, float]) -> float:
+    """
+    What the tests take back to back, from the durations recorded by
+    earlier runs. This run's own timings are inflated by the workers
+    contending for CPU, so they only fill in tests without a history.
+    """
+    return sum(history.durations.get(n, measured.get(n, 0.0)) for n in nodeids)
+
+
+def _parse_caps(values: list[str]) -> dict[str, int]:
+    caps = {}
+    for value in values:
+        name, _, limit = value.partition("=")
+        if not name or not limit.isdigit() or int(limit) < 1:
+            raise ValueError(f"--cap expects BROWSER=N with N >= 1, got {value!r}")
+        caps[name] = int(limit)
+    return caps
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the UI suite across browsers in parallel")
+    parser.add_argument("paths", nargs="*", default=["."])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--cap", action="append", default=[], metavar="BROWSER=N",
+                        help="max concurrent sessions per browser (repeatable)")
+    parser.add_argument("-k", dest="keyword")
+    parser.add_argument("-m", dest="markexpr")
+    parser.add_argument("--history", default=os.path.join(HERE, ".ui_durations.json"))
+    parser.add_argument("--log-dir", default=os.path.join(HERE, "parallel-logs"))
+    parser.add_argument("--out", help="write the run report as JSON")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error(f"--workers must be at least 1, not {args.workers}")
+    try:
+        caps = _parse_caps(args.cap)
+    except ValueError as e:
+        parser.error(str(e))
+
+    selection = []
+    if args.keyword:
+        selection += ["-k", args.keyword]
+    if args.markexpr:
+        selection += ["-m", args.markexpr]
+
+    report = run(args.paths, selection, args.workers, caps, args.history, args.log_dir)
+    summary = report.to_dict()
+
+    print(f"\n{summary['tests']} tests in {summary['jobs']} jobs on {summary['workers']} workers")
+    print(f"wall {summary['wall_s']}s vs serial {summary['serial_s']}s -> {summary['speedup']}x "
+          f"(utilization {summary['worker_utilization']:.0%})")
+    for browser, stats in summary["per_browser"].items():
+        print(f"  {browser:<8} {stats['tests']:>4} tests  {stats['jobs']:>3} jobs  {stats['busy_s']}s busy")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    return 1 if report.failed_jobs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""WebDriver round trips per page action"""
+
+import functools
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass
+class ActionStat:
+    calls: int = 0
+    round_trips: int = 0
+    max_round_trips: int = 0
+    commands: Counter = field(default_factory=Counter)
+
+    @property
+    def avg_round_trips(self) -> float:
+        return self.round_trips / self.calls if self.calls else 0.0
+
+
+class RoundTripCounter:
+    """
+    Counts WebDriver commands (one HTTP round trip each) issued while a
+    page action runs. Nested actions roll up into the outermost one, so
+    LoginPage.login includes the type_text and click calls it makes.
+    """
+
+    def __init__(self):
+        self.stats: dict[str, ActionStat] = defaultdict(ActionStat)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self, driver: WebDriver) -> None:
+        """Route the driver's commands through the counter (once per driver)."""
+        if getattr(driver, "_round_trip_counter", None) is self:
+            return
+        execute = driver.execute
+
+        def counted(command, params=None):
+            commands = getattr(self._local, "commands", None)
+            if commands is not None:
+                commands[command] += 1
+            return execute(command, params)
+
+        driver.execute = counted
+        driver._round_trip_counter = self
+
+    @contextmanager
+    def action(self, label: str):
+        if getattr(self._local, "commands", None) is not None:
+            yield
+            return
+
+        commands = self._local.commands = Counter()
+        try:
+            yield
+        finally:
+            self._local.commands = None
+            total = sum(commands.values())
+            with self._lock:
+                stat = self.stats[label]
+                stat.calls += 1
+                stat.round_trips += total
+                stat.max_round_trips = max(stat.max_round_trips, total)
+                stat.commands.update(commands)
+
+    def top(self, n: int = 10) -> list[tuple[str, ActionStat]]:
+        with self._lock:
+            return sorted(self.stats.items(), key=lambda kv: kv[1].round_trips, reverse=True)[:n]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+
+ROUND_TRIPS = RoundTripCounter()
+
+
+def page_action(method: F) -> F:
+    """Count the round trips of a page object method under Class.method."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with ROUND_TRIPS.action(f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,78 @@
+"""
+Failure artifact tests with a fake driver.
+"""
+
+import base64
+import gzip
+import json
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from artifacts import ArtifactCapture, artifact_name
+from fake_driver import FakeDriver
+
+
+class CapturingDriver(FakeDriver):
+    page_source = "<html><body>Dashboard</body></html>"
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(b"\x89PNG fake").decode()
+
+    def get_log(self, log_type):
+        return [{"level": "SEVERE", "message": "Uncaught TypeError"}]
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    capture = ArtifactCapture(str(tmp_path))
+    yield capture
+    capture.close()
+
+
+class TestArtifactName:
+
+    @pytest.mark.parametrize("nodeid, name", [
+        ("test_login.py::TestLogin::test_ok[chrome]", "test_login.TestLogin.test_ok-chrome"),
+        ("tests/ui/test_login.py::test_ok[firefox]", "test_login.test_ok-firefox"),
+        ("test_search.py::test_query[a b/c-chrome]", "test_search.test_query-a-b-c-chrome"),
+        ("test_login.py", "test_login"),
+    ])
+    def test_names(self, nodeid, name):
+        assert artifact_name(nodeid) == name
+
+    def test_browsers_do_not_collide(self):
+        assert artifact_name("t.py::test_x[chrome]") != artifact_name("t.py::test_x[firefox]")
+
+
+class TestArtifactCapture:
+
+    def test_files_written_in_background(self, artifacts):
+        capture = artifacts.capture(CapturingDriver(), "test_login.test_ok-chrome")
+        artifacts.flush()
+
+        with open(capture.paths["screenshot"], "rb") as f:
+            assert f.read() == b"\x89PNG fake"
+        with open(capture.paths["page_source"], "rb") as f:
+            assert b"Dashboard" in gzip.decompress(f.read())
+        with open(capture.paths["console"]) as f:
+            assert json.load(f)[0]["level"] == "SEVERE"
+        assert capture.errors == []
+        assert artifacts.report()["bytes_written"] == capture.bytes_written > 0
+
+    def test_reruns_get_unique_names(self, artifacts):
+        first = artifacts.screenshot(CapturingDriver(), "t.test_x-chrome")
+        second = artifacts.screenshot(CapturingDriver(), "t.test_x-chrome")
+
+        assert first.endswith("t.test_x-chrome.png")
+        assert second.endswith("t.test_x-chrome-2.png")
+
+    def test_missing_pieces_are_reported_not_raised(self, artifacts):
+        class NoLogDriver(CapturingDriver):
+            def get_log(self, log_type):
+                raise WebDriverException("get_log not supported")
+
+        capture = artifacts.capture(NoLogDriver(), "t.test_x-firefox")
+
+        assert "console" not in capture.paths
+        assert capture.errors == ["console log: WebDriverException"]
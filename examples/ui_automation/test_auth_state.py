@@ -0,0 +1,108 @@
+"""
+Auth state reuse tests against a fake app with server-side sessions.
+"""
+
+import pytest
+
+from auth_state import AuthStateCache
+from fake_driver import FakeDriver
+
+
+ORIGIN = "http://app"
+
+
+class AppServer:
+    """Valid session tokens; pages other than /login and /favicon.ico need one."""
+
+    def __init__(self):
+        self.sessions: dict[str, str] = {}
+        self.logins: list[tuple[str, str]] = []
+
+    def ui_login(self, username: str):
+        def login(driver: "AppBrowser") -> None:
+            token = f"token-{len(self.logins)}"
+            self.sessions[token] = username
+            self.logins.append((driver.capabilities["browserName"], username))
+            driver.cookies["session"] = token
+            driver.local_storage["user"] = username
+            driver.url = f"{ORIGIN}/dashboard"
+
+        return login
+
+
+class AppBrowser(FakeDriver):
+    """A browser on the fake app: web storage, and a redirect to /login without a session."""
+
+    def __init__(self, server: AppServer, browser_name: str = "chrome"):
+        super().__init__(browser_name=browser_name, scripts={
+            "Object.assign({}, window.localStorage)": lambda: {
+                "origin": ORIGIN, "local": dict(self.local_storage), "session": {},
+            },
+            "localStorage.setItem": lambda local, session: self.local_storage.update(local),
+        })
+        self.server = server
+        self.cookies = {}
+        self.local_storage: dict[str, str] = {}
+
+    def get(self, url: str) -> None:
+        super().get(url)
+        path = url[len(ORIGIN):]
+        if path not in ("/login", "/favicon.ico") and self.cookies.get("session") not in self.server.sessions:
+            self.url = f"{ORIGIN}/login"
+
+
+@pytest.fixture
+def server():
+    return AppServer()
+
+
+@pytest.fixture
+def cache():
+    return AuthStateCache()
+
+
+class TestAuthStateCache:
+
+    def test_later_browsers_get_the_state_injected(self, server, cache):
+        cache.login(AppBrowser(server), "alice", server.ui_login("alice"))
+
+        browser = AppBrowser(server)
+        cache.login(browser, "alice", server.ui_login("alice"))
+
+        assert (cache.ui_logins, cache.injections) == (1, 1)
+        assert len(server.logins) == 1
+        assert browser.url == f"{ORIGIN}/dashboard"
+        assert browser.cookies == {"session": "token-0"}
+        assert browser.local_storage == {"user": "alice"}
+        # onto the origin through a cheap resource, not an app page
+        assert browser.visited == [f"{ORIGIN}/favicon.ico", f"{ORIGIN}/dashboard"]
+
+    def test_stale_state_falls_back_to_the_ui(self, server, cache):
+        cache.login(AppBrowser(server), "alice", server.ui_login("alice"))
+        server.sessions.clear()  # logged out server-side
+
+        browser = AppBrowser(server)
+        cache.login(browser, "alice", server.ui_login("alice"))
+
+        assert (cache.ui_logins, cache.injections, cache.stale) == (2, 0, 1)
+        assert browser.url == f"{ORIGIN}/dashboard"
+
+        # the fresh login replaced the stale snapshot
+        cache.login(AppBrowser(server), "alice", server.ui_login("alice"))
+        assert cache.injections == 1
+
+    def test_keyed_per_browser_and_user(self, server, cache):
+        for browser_name, username in [("chrome", "alice"), ("chrome", "bob"), ("firefox", "alice")] * 2:
+            cache.login(AppBrowser(server, browser_name), username, server.ui_login(username))
+
+        assert server.logins == [("chrome", "alice"), ("chrome", "bob"), ("firefox", "alice")]
+        assert cache.injections == 3
+
+    def test_forget(self, server, cache):
+        browser = AppBrowser(server)
+        cache.login(browser, "alice", server.ui_login("alice"))
+
+        cache.forget(browser, "alice")
+        cache.login(AppBrowser(server), "alice", server.ui_login("alice"))
+
+        assert cache.ui_logins == 2
@@ -0,0 +1,155 @@
+"""
+Batched form fills and reads: the page scripts run in node against a
+stub DOM, the Python side against a fake driver.
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from base_page import _FILL_FORM, _READ_TEXTS, _VISIBILITY, BasePage
+from fake_driver import FakeDriver, FakeElement
+from login_page import LoginPage
+from waits import js_query
+
+
+# just enough DOM for the scripts: querySelector / evaluate over a fixed
+# set of nodes, computed style, and the events fill_form dispatches
+_STUB_DOM = """
+const input = JSON.parse(require("fs").readFileSync(0, "utf8"));
+const events = [];
+global.Event = class { constructor(type) { this.type = type; } };
+global.XPathResult = {FIRST_ORDERED_NODE_TYPE: 9};
+const nodes = {};
+for (const [query, spec] of Object.entries(input.dom)) {
+    nodes[query] = Object.assign({
+        innerText: "",
+        rects: 1,
+        style: {visibility: "visible", opacity: "1"},
+        getClientRects() { return {length: this.rects}; },
+        focus() {},
+        blur() {},
+        click() { this.checked = !this.checked; },
+        dispatchEvent(event) { events.push(`${query}:${event.type}`); },
+    }, spec);
+}
+global.document = {
+    querySelector: query => nodes[query] || null,
+    evaluate: query => ({singleNodeValue: nodes[query] || null}),
+};
+global.window = {getComputedStyle: el => el.style};
+const result = new Function(input.script)(...input.args);
+const state = Object.fromEntries(Object.entries(nodes).map(([q, n]) => [q, {value: n.value, checked: n.checked}]));
+process.stdout.write(JSON.stringify({result, events, state}));
+"""
+
+
+def run_in_page(script: str, args: list, dom: dict) -> dict:
+    if shutil.which("node") is None:
+        pytest.skip("page scripts need node")
+    payload = json.dumps({"script": script, "args": args, "dom": dom})
+    out = subprocess.run(["node", "-e", _STUB_DOM], input=payload, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+USERNAME = (By.ID, "username")
+REMEMBER = (By.ID, "remember-me")
+AVATAR = (By.CSS_SELECTOR, "input[type=file]")
+GREETING = (By.XPATH, "//h1")
+SIGN_OUT = (By.LINK_TEXT, "Sign out")
+
+
+def css(locator):
+    return js_query(locator)[1]
+
+
+class TestPageScripts:
+
+    def test_fill_form_sets_values_and_fires_events(self):
+        dom = {
+            css(USERNAME): {"value": ""},
+            css(REMEMBER): {"value": "on", "type": "checkbox", "checked": False},
+            css(AVATAR): {"value": "", "type": "file"},
+        }
+        fields = [[js_query(USERNAME), "alice"], [js_query(REMEMBER), True], [js_query(AVATAR), "me.png"],
+                  [None, "x"], [js_query((By.ID, "missing")), "y"]]
+
+        out = run_in_page(_FILL_FORM, [fields], dom)
+
+        assert out["state"][css(USERNAME)]["value"] == "alice"
+        assert out["state"][css(REMEMBER)]["checked"] is True
+        assert out["events"] == [f"{css(USERNAME)}:input", f"{css(USERNAME)}:change"]
+        # file inputs, locators JS can't express and missing fields are left to native typing
+        assert out["result"] == [2, 3, 4]
+
+    def test_read_texts(self):
+        dom = {"//h1": {"innerText": "  Welcome, Alice \n"}}
+
+        out = run_in_page(_READ_TEXTS, [[js_query(GREETING), None, js_query((By.ID, "gone"))]], dom)
+
+        assert out["result"] == ["Welcome, Alice", None, None]
+
+    def test_visibility(self):
+        dom = {
+            "#shown": {},
+            "#detached": {"rects": 0},
+            "#hidden": {"style": {"visibility": "hidden", "opacity": "1"}},
+            "#transparent": {"style": {"visibility": "visible", "opacity": "0"}},
+        }
+        queries = [["css", q] for q in ("#shown", "#detached", "#hidden", "#transparent", "#missing")]
+
+        assert run_in_page(_VISIBILITY, [queries], dom)["result"] == [True, False, False, False, False]
+
+    def test_quoted_selectors_reach_the_page_intact(self):
+        tricky = (By.ID, 'say "hi"')
+        dom = {css(tricky): {"innerText": "hi"}}
+
+        assert run_in_page(_READ_TEXTS, [[js_query(tricky)]], dom)["result"] == ["hi"]
+
+
+class TestBatchedMethods:
+
+    def test_fill_form_types_skipped_fields_natively(self):
+        driver = FakeDriver(scripts={"skipped.push": [1]})
+        driver.elements[AVATAR] = FakeElement("avatar")
+        page = BasePage(driver, timeout=1)
+
+        page.fill_form({USERNAME: "alice", AVATAR: "me.png"})
+
+        assert driver.commands.count("w3cExecuteScript") == 1
+        assert driver.elements[AVATAR].keys == ["me.png"]
+
+    def test_native_fill(self):
+        driver = FakeDriver()
+        driver.elements[USERNAME] = FakeElement("username")
+        driver.elements[REMEMBER] = FakeElement("remember")
+        page = BasePage(driver, timeout=1)
+
+        page.fill_form({USERNAME: "alice", REMEMBER: True}, native=True)
+
+        assert "w3cExecuteScript" not in driver.commands
+        assert driver.elements[USERNAME].value == "alice"
+        assert driver.elements[REMEMBER].selected
+
+    def test_reads_fall_back_for_link_text(self):
+        driver = FakeDriver(scripts={"innerText": ["Welcome", None], "getComputedStyle": [True, False]})
+        driver.elements[SIGN_OUT] = FakeElement("sign out", text="Sign out")
+        page = BasePage(driver, timeout=1)
+
+        assert page.get_texts([GREETING, SIGN_OUT]) == ["Welcome", "Sign out"]
+        assert page.visibility([GREETING, SIGN_OUT]) == [True, True]
+
+    def test_login_types_with_key_events(self):
+        driver = FakeDriver()
+        for locator in (LoginPage.USERNAME_INPUT, LoginPage.PASSWORD_INPUT, LoginPage.LOGIN_BUTTON):
+            driver.elements[locator] = FakeElement(locator[1])
+
+        LoginPage(driver).login("alice", "s3cret")
+
+        assert driver.elements[LoginPage.USERNAME_INPUT].keys == ["alice"]
+        assert driver.elements[LoginPage.PASSWORD_INPUT].keys == ["s3cret"]
+        assert driver.elements[LoginPage.LOGIN_BUTTON].clicks == 1
+        assert "w3cExecuteScript" not in driver.commands
@@ -0,0 +1,94 @@
+"""
+Browser pool tests with fake drivers.
+"""
+
+import pytest
+
+from driver_pool import DriverPool
+from fake_driver import FakeDriver
+
+
+@pytest.fixture
+def launched():
+    return []
+
+
+@pytest.fixture
+def pool(launched):
+    def factory(browser_name):
+        driver = FakeDriver()
+        launched.append((browser_name, driver))
+        return driver
+
+    return DriverPool(factory, max_uses=3)
+
+
+class TestDriverPool:
+
+    def test_released_driver_is_reused(self, pool, launched):
+        driver = pool.acquire("chrome")
+        pool.release("chrome", driver)
+
+        assert pool.acquire("chrome") is driver
+        assert pool.report()["launches"] == 1
+        assert pool.report()["hits"] == 1
+
+    def test_browsers_are_pooled_separately(self, pool, launched):
+        chrome = pool.acquire("chrome")
+        pool.release("chrome", chrome)
+
+        assert pool.acquire("firefox") is not chrome
+        assert [name for name, _ in launched] == ["chrome", "firefox"]
+
+    def test_release_wipes_state(self, pool):
+        driver = pool.acquire("chrome")
+        driver.handles.append("popup")
+        driver.url = "http://localhost:8080/dashboard"
+
+        pool.release("chrome", driver)
+
+        assert driver.handles == ["window-0"]
+        assert driver.cookies == {}
+        assert driver.url == "about:blank"
+        assert "w3cExecuteScript" in driver.commands  # local/session storage
+        assert pool.stats.resets == 1
+
+    def test_recycled_after_max_uses(self, pool):
+        driver = pool.acquire("chrome")
+        for _ in range(2):
+            pool.release("chrome", driver)
+            assert pool.acquire("chrome") is driver
+        pool.release("chrome", driver)
+
+        assert driver.quits == 1
+        assert pool.acquire("chrome") is not driver
+        assert pool.report()["recycled"] == 1
+
+    def test_dead_idle_driver_is_replaced(self, pool):
+        driver = pool.acquire("chrome")
+        pool.release("chrome", driver)
+        driver.alive = False
+
+        replacement = pool.acquire("chrome")
+
+        assert replacement is not driver
+        assert pool.report()["crashed"] == 1
+        assert pool.report()["launches"] == 2
+
+    def test_failed_reset_evicts(self, pool):
+        driver = pool.acquire("chrome")
+        driver.alive = False
+
+        pool.release("chrome", driver)
+
+        assert pool.report()["crashed"] == 1
+        assert pool.acquire("chrome") is not driver
+
+    def test_close_all(self, pool, launched):
+        idle = pool.acquire("chrome")
+        busy = pool.acquire("chrome")
+        pool.release("chrome", idle)
+
+        pool.close_all()
+
+        assert idle.quits == busy.quits == 1
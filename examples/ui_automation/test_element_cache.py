@@ -0,0 +1,109 @@
+"""
+Element cache tests with a fake driver.
+"""
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from base_page import BasePage
+from element_cache import CacheStats, ElementCache
+from fake_driver import FakeDriver, FakeElement
+
+
+USERNAME = (By.ID, "username")
+ERROR = (By.CSS_SELECTOR, ".error")
+
+
+class LoginForm(BasePage):
+    CACHEABLE = (USERNAME,)
+
+
+@pytest.fixture
+def driver():
+    driver = FakeDriver()
+    driver.elements[USERNAME] = FakeElement("username")
+    return driver
+
+
+@pytest.fixture
+def stats():
+    return CacheStats()
+
+
+class TestElementCache:
+
+    def test_hit_after_put(self, driver, stats):
+        cache = ElementCache(driver, [USERNAME], "LoginForm", stats)
+        element = driver.elements[USERNAME]
+
+        assert cache.get(USERNAME) is None
+        cache.put(USERNAME, element)
+
+        assert cache.get(USERNAME) is element
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert dict(stats.items())["LoginForm"].hit_rate == 0.5
+
+    def test_only_cacheable_locators(self, driver, stats):
+        cache = ElementCache(driver, [USERNAME], "LoginForm", stats)
+        cache.put(ERROR, FakeElement("error"))
+
+        assert cache.get(ERROR) is None
+        assert cache.misses == 0
+
+    def test_navigation_flushes(self, driver, stats):
+        cache = ElementCache(driver, [USERNAME], "LoginForm", stats)
+        cache.put(USERNAME, driver.elements[USERNAME])
+
+        driver.get("http://localhost:8080/login")
+
+        assert cache.get(USERNAME) is None
+        assert cache.flushes == 1
+
+    def test_discard_counts_stale(self, driver, stats):
+        cache = ElementCache(driver, [USERNAME], "LoginForm", stats)
+        cache.put(USERNAME, driver.elements[USERNAME])
+
+        cache.discard(USERNAME)
+        cache.discard(USERNAME)
+
+        assert cache.stale == 1
+        assert cache.get(USERNAME) is None
+
+    def test_navigation_tracked_once_per_driver(self, driver, stats):
+        first = ElementCache(driver, [USERNAME], "LoginForm", stats)
+        second = ElementCache(driver, [USERNAME], "LoginForm", stats)
+        first.put(USERNAME, driver.elements[USERNAME])
+        second.put(USERNAME, driver.elements[USERNAME])
+
+        driver.get("http://localhost:8080/login")
+        first.get(USERNAME)
+        second.get(USERNAME)
+
+        assert driver._navigation_epoch == 1
+        assert first.flushes == second.flushes == 1
+
+
+class TestFindElement:
+
+    def test_always_looks_up(self, driver):
+        page = LoginForm(driver, timeout=1)
+
+        page.find_element(USERNAME)
+        page.find_element(USERNAME)
+
+        assert driver.commands.count("findElements") == 2
+        assert page.elements.hits == 0
+
+    def test_refreshes_the_cache_for_actions(self, driver):
+        page = LoginForm(driver, timeout=1)
+        page.click(USERNAME)
+        old = driver.elements[USERNAME]
+
+        # re-rendered without a navigation the cache could see
+        old.stale = True
+        driver.elements[USERNAME] = FakeElement("username")
+
+        assert page.find_element(USERNAME) is driver.elements[USERNAME]
+        page.click(USERNAME)
+        assert driver.elements[USERNAME].clicks == 1
+        assert page.elements.stale == 0
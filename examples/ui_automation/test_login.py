@@ -63,6 +63,8 @@ class TestLogin:
         assert dashboard.is_dashboard_loaded()
 
 
+# logging out may end the server-side session, so don't share one
+@pytest.mark.ui_login
 class TestLogout:
 
     def test_logout(self, browser, authenticated_user):
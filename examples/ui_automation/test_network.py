@@ -0,0 +1,125 @@
+"""
+Network shaping and load time tests with a fake driver.
+"""
+
+import re
+
+import pytest
+
+from fake_driver import FakeDriver
+from network import PROFILES, LoadTimes, apply_profile, glob_to_regex, stub_response
+
+
+class CdpDriver(FakeDriver):
+    """A local Chromium driver: records CDP commands."""
+
+    def __init__(self):
+        super().__init__()
+        self.cdp: list[tuple[str, dict]] = []
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.cdp.append((cmd, cmd_args))
+        return {"identifier": str(len(self.cdp))}
+
+
+def navigation_timing(loads: dict[str, float]):
+    """A driver whose pages take loads[url] ms to load."""
+    driver = FakeDriver()
+    driver.scripts["loadEventEnd"] = lambda: {"url": driver.url, "load_ms": loads[driver.url]}
+    return driver
+
+
+class TestGlobToRegex:
+
+    @pytest.mark.parametrize("pattern, url, matches", [
+        ("*/api/users*", "http://localhost:8080/api/users?page=2", True),
+        ("*/api/users*", "http://localhost:8080/api/orders", False),
+        ("*.woff2", "https://cdn.example.com/font.woff2", True),
+        ("*.woff2", "https://cdn.example.com/font.woff2?v=1", False),
+        ("*example.com/a+b*", "https://example.com/a+b/c", True),
+        ("*example.com/a+b*", "https://example.com/aab/c", False),
+    ])
+    def test_matches(self, pattern, url, matches):
+        assert bool(re.match(glob_to_regex(pattern), url)) is matches
+
+
+class TestBlocking:
+
+    def test_profile_sent_over_cdp(self):
+        driver = CdpDriver()
+
+        assert apply_profile(driver, PROFILES["default"], ("*/beacon*",))
+
+        cmd, args = driver.cdp[-1]
+        assert cmd == "Network.setBlockedURLs"
+        assert "*googletagmanager.com*" in args["urls"] and "*.woff2" in args["urls"]
+        assert "*/beacon*" in args["urls"]
+        assert "*.png" not in args["urls"]
+
+    def test_nothing_to_block(self):
+        driver = CdpDriver()
+        assert not apply_profile(driver, PROFILES["none"])
+        assert driver.cdp == []
+
+    def test_without_cdp(self):
+        driver = FakeDriver()
+        assert not apply_profile(driver, PROFILES["strict"])
+        assert stub_response(driver, "*/api/*", {"ok": True}) is None
+
+
+class TestLoadTimes:
+
+    def test_records_each_get(self, request, tmp_path):
+        driver = navigation_timing({"http://app/login": 800.0, "http://app/home": 1200.0})
+        times = LoadTimes(str(tmp_path / "baseline.json"), record_baseline=False)
+        times.install(driver)
+        times.install(driver)
+
+        driver.get("http://app/login")
+        driver.get("http://app/home")
+
+        loads = times.tests[request.node.nodeid].loads
+        assert [(load.path, load.load_ms) for load in loads] == [("/login", 800.0), ("/home", 1200.0)]
+        assert driver.commands.count("w3cExecuteScript") == 2
+
+    def test_blank_pages_are_skipped(self, tmp_path):
+        driver = navigation_timing({"about:blank": 0})
+        times = LoadTimes(str(tmp_path / "baseline.json"), record_baseline=False)
+        times.install(driver)
+
+        driver.get("about:blank")
+        assert times.totals()["page_loads"] == 0
+
+    def test_compare_against_baseline(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        loads = {"http://app/login": 900.0, "http://app/home": 2000.0}
+
+        unblocked = LoadTimes(path, record_baseline=True)
+        driver = navigation_timing(loads)
+        unblocked.install(driver)
+        driver.get("http://app/login")
+        driver.get("http://app/home")
+        unblocked.save()
+
+        loads.update({"http://app/login": 600.0, "http://app/home": 1500.0, "http://app/new": 100.0})
+        blocked = LoadTimes(path, record_baseline=False)
+        driver = navigation_timing(loads)
+        blocked.install(driver)
+        for url in loads:
+            driver.get(url)
+        blocked.save()
+
+        assert blocked.totals() == {"page_loads": 3, "load_ms": 2200.0, "compared": 2, "saved_ms": 800.0}
+        # only the unblocked run writes the baseline
+        assert LoadTimes(path, record_baseline=False)._baseline == {"/login": 900.0, "/home": 2000.0}
+
+    def test_baseline_keeps_recent_samples(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        for load_ms in (100.0, 200.0, 300.0, 400.0):
+            times = LoadTimes(path, record_baseline=True, keep=3)
+            driver = navigation_timing({"http://app/login": load_ms})
+            times.install(driver)
+            driver.get("http://app/login")
+            times.save()
+
+        assert LoadTimes(path, record_baseline=False)._baseline == {"/login": 300.0}
@@ -0,0 +1,128 @@
+"""
+Page metrics and budget tests with a fake driver.
+"""
+
+import json
+
+import pytest
+
+import page_metrics
+from fake_driver import FakeDriver
+from page_metrics import PageMetrics, PageSample, measured
+
+
+class DashboardPage:
+    BUDGETS = {"navigate": {"load": 2000, "lcp": 2500}}
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @measured(navigation=True)
+    def navigate(self):
+        self.driver.get("http://app/dashboard")
+
+    @measured(navigation=True)
+    def open_reports(self):
+        self.driver.get("http://app/reports")
+
+    @measured
+    def refresh_widgets(self):
+        pass
+
+
+def sample(action="navigate", test="t.py::test_x", **metrics) -> PageSample:
+    return PageSample(page="DashboardPage", action=action, url="http://app/dashboard",
+                      duration=metrics.pop("duration", 100.0), test=test, **metrics)
+
+
+@pytest.fixture
+def metrics(tmp_path):
+    metrics = PageMetrics()
+    metrics.configure(enabled=True, history_path=str(tmp_path / "history.jsonl"))
+    return metrics
+
+
+class TestBudgets:
+
+    def test_class_budgets_overridden_by_file(self, tmp_path):
+        budgets = tmp_path / "budgets.json"
+        budgets.write_text(json.dumps({"DashboardPage": {"navigate": {"load": 1500, "fcp": 800}}}))
+        metrics = PageMetrics()
+        metrics.configure(enabled=True, budgets_path=str(budgets))
+
+        assert metrics.budget_for(DashboardPage(None), "navigate") == {"load": 1500, "lcp": 2500, "fcp": 800}
+        assert metrics.budget_for(DashboardPage(None), "refresh_widgets") == {}
+
+    def test_violations_per_test(self, metrics):
+        page = DashboardPage(None)
+        metrics.record(page, sample(load=2400.0, lcp=1000.0))
+        metrics.record(page, sample(load=1800.0, lcp=None))
+        metrics.record(page, sample(load=5000.0, test="t.py::test_other"))
+
+        assert metrics.take_violations("t.py::test_x") == ["DashboardPage.navigate load 2400ms > budget 2000ms"]
+        assert metrics.take_violations("t.py::test_x") == []
+        assert len(metrics.take_violations("t.py::test_other")) == 1
+
+
+class TestHistory:
+
+    def test_percentiles_include_earlier_runs(self, metrics):
+        page = DashboardPage(None)
+        for load in (1000.0, 1100.0):
+            metrics.record(page, sample(load=load))
+        metrics.save()
+        metrics.save()  # nothing new, nothing appended
+
+        later = PageMetrics()
+        later.configure(enabled=True, history_path=metrics.history_path)
+        later.record(page, sample(load=4000.0))
+
+        load = later.report()["DashboardPage.navigate"]["load"]
+        assert load == {"n": 3, "p50": 1100.0, "p75": 4000.0, "p95": 4000.0}
+
+
+class TestMeasured:
+
+    @pytest.fixture
+    def driver(self, metrics, monkeypatch):
+        monkeypatch.setattr(page_metrics, "PAGE_METRICS", metrics)
+        return FakeDriver(scripts={
+            "timeOrigin, performance.now": [1000.0, 50.0],
+            "PerformanceObserver": lambda origin, mark: {
+                "same_document": origin is not None, "url": "http://app/dashboard",
+                "ttfb": 80.0, "dcl": 600.0, "load": 900.0, "fcp": 400.0, "lcp": 700.0,
+                "long_tasks": 1, "long_task_ms": 120.0,
+            },
+        })
+
+    def test_navigation_reports_load_metrics(self, request, metrics, driver):
+        DashboardPage(driver).navigate()
+
+        (recorded,) = metrics.samples
+        assert (recorded.action, recorded.load, recorded.lcp) == ("navigate", 900.0, 700.0)
+        assert recorded.test == request.node.nodeid
+
+    def test_navigation_is_flagged_not_named(self, metrics, driver):
+        DashboardPage(driver).open_reports()
+        assert driver.commands[0] == "get"
+
+        driver.commands.clear()
+        DashboardPage(driver).refresh_widgets()
+        assert driver.commands[0] == "w3cExecuteScript"
+
+        assert [s.action for s in metrics.samples] == ["open_reports", "refresh_widgets"]
+        assert metrics.samples[0].load == 900.0
+
+    def test_same_document_action_reports_only_long_tasks(self, metrics, driver):
+        DashboardPage(driver).refresh_widgets()
+
+        (recorded,) = metrics.samples
+        assert recorded.load is None and recorded.lcp is None
+        assert recorded.long_task_ms == 120.0
+
+    def test_disabled_sends_nothing(self, metrics, driver):
+        metrics.enabled = False
+        DashboardPage(driver).refresh_widgets()
+
+        assert driver.commands == []
+        assert metrics.samples == []
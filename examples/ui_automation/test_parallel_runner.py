@@ -0,0 +1,108 @@
+"""
+Parallel runner unit tests: planning and reporting, no browsers started.
+"""
+
+import pytest
+
+from parallel_runner import (
+    DEFAULT_ESTIMATE_S,
+    DurationHistory,
+    Scheduler,
+    _parse_caps,
+    browser_of,
+    plan,
+    serial_estimate,
+)
+
+
+@pytest.fixture
+def history(tmp_path):
+    return DurationHistory(str(tmp_path / "durations.json"))
+
+
+class TestBrowserOf:
+
+    @pytest.mark.parametrize("nodeid, browser", [
+        ("test_login.py::TestLogin::test_ok[chrome]", "chrome"),
+        ("test_login.py::test_roles[firefox-admin]", "firefox"),
+        ("test_login.py::test_roles[admin-chrome]", "chrome"),
+        ("test_login.py::test_roles[admin]", "none"),
+        ("test_api.py::test_health", "none"),
+    ])
+    def test_browser_from_parametrization(self, nodeid, browser):
+        assert browser_of(nodeid) == browser
+
+
+class TestDurationHistory:
+
+    def test_estimates(self, history):
+        assert history.estimate("t.py::new") == DEFAULT_ESTIMATE_S
+
+        history.update({"t.py::a": 1.0, "t.py::b": 3.0, "t.py::c": 8.0})
+        assert history.estimate("t.py::b") == 3.0
+        # unseen tests are assumed typical
+        assert history.estimate("t.py::new") == 3.0
+
+    def test_smoothing(self, history):
+        history.update({"t.py::a": 10.0})
+        history.update({"t.py::a": 2.0})
+        assert history.estimate("t.py::a") == 6.0
+
+    def test_round_trip(self, history):
+        history.update({"t.py::a": 1.5})
+        history.save()
+
+        assert DurationHistory(history.path).durations == {"t.py::a": 1.5}
+
+
+class TestPlan:
+
+    def test_jobs_never_mix_browsers(self, history):
+        nodeids = [f"t.py::test_{i}[{browser}]" for i in range(10) for browser in ("chrome", "firefox")]
+
+        jobs = plan(nodeids, history, workers=2, min_job_s=1)
+
+        for job in jobs:
+            assert {browser_of(n) for n in job.nodeids} == {job.browser}
+        assert sorted(n for job in jobs for n in job.nodeids) == sorted(nodeids)
+
+    def test_balanced_longest_first(self, history):
+        history.durations = {f"t.py::test_{i}[chrome]": float(s) for i, s in enumerate([6, 5, 4, 3, 2, 2])}
+
+        jobs = plan(list(history.durations), history, workers=1, chunks_per_worker=2, min_job_s=1)
+
+        assert [job.estimate_s for job in jobs] == [11.0, 11.0]
+
+    def test_min_job_length(self, history):
+        history.durations = {f"t.py::test_{i}[chrome]": 1.0 for i in range(12)}
+
+        jobs = plan(list(history.durations), history, workers=4, min_job_s=5)
+
+        # 12s of tests in jobs of at least ~5s, not 12 one-second processes
+        assert len(jobs) == 3
+        assert jobs == sorted(jobs, key=lambda j: j.estimate_s, reverse=True)
+
+
+class TestScheduler:
+
+    @pytest.mark.parametrize("caps, workers", [({"chrome": 0}, 2), ({"firefox": -1}, 2), ({}, 0)])
+    def test_rejects_limits_below_one(self, tmp_path, caps, workers):
+        with pytest.raises(ValueError, match="at least 1"):
+            Scheduler(workers, caps, [], str(tmp_path))
+
+    def test_parse_caps(self):
+        assert _parse_caps(["chrome=4", "firefox=2"]) == {"chrome": 4, "firefox": 2}
+        for bad in ("chrome=0", "chrome", "=2", "chrome=two"):
+            with pytest.raises(ValueError, match="BROWSER=N"):
+                _parse_caps([bad])
+
+
+class TestSerialEstimate:
+
+    def test_uses_recorded_durations_over_contended_ones(self, history):
+        history.durations = {"t.py::a[chrome]": 2.0, "t.py::b[chrome]": 3.0}
+        measured = {"t.py::a[chrome]": 5.0, "t.py::b[chrome]": 7.0, "t.py::c[chrome]": 1.5}
+
+        nodeids = ["t.py::a[chrome]", "t.py::b[chrome]", "t.py::c[chrome]"]
+        # c has no history yet, so this run's timing stands in for it
+        assert serial_estimate(nodeids, history, measured) == 6.5
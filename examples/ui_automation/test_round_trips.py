@@ -0,0 +1,79 @@
+"""
+Round trip counter tests with a fake driver.
+"""
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from fake_driver import FakeDriver
+from round_trips import RoundTripCounter
+
+
+@pytest.fixture
+def counter():
+    return RoundTripCounter()
+
+
+class Page:
+
+    def __init__(self, driver, counter):
+        self.driver = driver
+        self.counter = counter
+
+    def open(self):
+        with self.counter.action("Page.open"):
+            self.driver.get("http://app/login")
+            self.fill()
+
+    def fill(self):
+        with self.counter.action("Page.fill"):
+            self.driver.execute_script("return 1")
+
+
+class TestRoundTripCounter:
+
+    def test_counts_commands_per_action(self, counter):
+        driver = FakeDriver()
+        counter.install(driver)
+        page = Page(driver, counter)
+
+        page.fill()
+        page.fill()
+
+        stat = dict(counter.top())["Page.fill"]
+        assert (stat.calls, stat.round_trips, stat.max_round_trips) == (2, 2, 1)
+        assert stat.avg_round_trips == 1.0
+        assert stat.commands == {"w3cExecuteScript": 2}
+
+    def test_nested_actions_roll_up(self, counter):
+        driver = FakeDriver()
+        counter.install(driver)
+
+        Page(driver, counter).open()
+
+        assert [label for label, _ in counter.top()] == ["Page.open"]
+        assert dict(counter.top())["Page.open"].commands == {"get": 1, "w3cExecuteScript": 1}
+
+    def test_commands_outside_actions_are_not_counted(self, counter):
+        driver = FakeDriver()
+        counter.install(driver)
+        counter.install(driver)
+
+        driver.get("http://app/login")
+        with counter.action("Page.fill"):
+            driver.execute_script("return 1")
+
+        assert dict(counter.top())["Page.fill"].round_trips == 1
+
+    def test_failed_action_still_counted(self, counter):
+        driver = FakeDriver()
+        counter.install(driver)
+        driver.alive = False
+
+        with pytest.raises(WebDriverException), counter.action("Page.fill"):
+            driver.execute_script("return 1")
+
+        assert dict(counter.top())["Page.fill"].round_trips == 1
+
+        counter.clear()
+        assert counter.top() == []
@@ -0,0 +1,164 @@
+"""
+Wait engine tests with a fake driver.
+"""
+
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from base_page import BasePage
+from fake_driver import FakeDriver, FakeElement
+from waits import WAIT_METRICS, WaitEngine, WaitMetrics, js_query
+
+
+@pytest.fixture
+def metrics():
+    return WaitMetrics()
+
+
+class Page:
+    """Just enough of a page object for the wait labels."""
+
+    def __init__(self, driver, metrics):
+        self.driver = driver
+        self.wait = WaitEngine(driver, timeout=1, metrics=metrics)
+
+    def wait_for_banner(self, timeout=None):
+        return self.wait.until(lambda d: d.find_element(By.ID, "banner"), timeout=timeout)
+
+
+class ObserverPage(BasePage):
+    USE_DOM_OBSERVER = True
+
+
+class TestWaitEngine:
+
+    def test_returns_the_condition_value(self, metrics):
+        engine = WaitEngine(FakeDriver(), metrics=metrics)
+        assert engine.until(lambda d: "ready") == "ready"
+
+    def test_ignores_missing_elements_until_they_appear(self, metrics):
+        driver = FakeDriver()
+        page = Page(driver, metrics)
+        polls = []
+
+        def appear_on_third_poll(by, value):
+            polls.append(value)
+            if len(polls) < 3:
+                raise NoSuchElementException(value)
+            return FakeElement("banner")
+
+        driver.find_element = appear_on_third_poll
+        assert page.wait_for_banner().name == "banner"
+        assert len(polls) == 3
+
+    def test_polling_backs_off(self, metrics):
+        engine = WaitEngine(FakeDriver(), initial_poll=0.01, max_poll=0.04, backoff=2, metrics=metrics)
+        polled_at = []
+
+        with pytest.raises(TimeoutException):
+            engine.until(lambda d: polled_at.append(time.perf_counter()), timeout=0.3)
+
+        gaps = [b - a for a, b in zip(polled_at, polled_at[1:])]
+        assert gaps[0] < 0.03
+        assert max(gaps) < 0.1
+        # capped at max_poll: neither one poll per ms nor a handful
+        assert 5 < len(polled_at) < 30
+
+    def test_timeout_is_recorded_under_the_page_method(self, metrics):
+        page = Page(FakeDriver(), metrics)
+
+        with pytest.raises(TimeoutException, match="within 0.1s"):
+            page.wait_for_banner(timeout=0.1)
+
+        (label, stat), = metrics.top()
+        assert label == "Page.wait_for_banner"
+        assert (stat.calls, stat.timeouts) == (1, 1)
+        assert stat.total_ms >= 100
+
+    def test_default_metrics_are_shared(self):
+        assert WaitEngine(FakeDriver()).metrics is WAIT_METRICS
+
+
+class TestWaitMetrics:
+
+    def test_top_by_total_time(self, metrics):
+        metrics.record("A.fast", 5, False)
+        metrics.record("B.slow", 300, True)
+        metrics.record("A.fast", 10, False)
+
+        assert [label for label, _ in metrics.top()] == ["B.slow", "A.fast"]
+        fast = dict(metrics.top())["A.fast"]
+        assert (fast.calls, fast.total_ms, fast.max_ms, fast.timeouts) == (2, 15, 10, 0)
+        assert len(metrics.top(1)) == 1
+
+        metrics.clear()
+        assert metrics.top() == []
+
+
+class TestDomObserverWait:
+
+    def test_script_timeout_read_once(self, metrics):
+        driver = FakeDriver(scripts={"MutationObserver": True})
+        engine = WaitEngine(driver, timeout=2, metrics=metrics)
+
+        assert engine.until_present_in_dom((By.ID, "banner"))
+        assert engine.until_present_in_dom((By.ID, "footer"))
+
+        # the session's 30s already covers a 2s wait: nothing to set or restore
+        assert driver.commands == ["getTimeouts", "w3cExecuteScriptAsync", "w3cExecuteScriptAsync"]
+
+    def test_long_wait_stretches_and_restores_the_script_timeout(self, metrics):
+        driver = FakeDriver(scripts={"MutationObserver": False})
+        engine = WaitEngine(driver, timeout=60, metrics=metrics)
+
+        with pytest.raises(TimeoutException, match="not present within 60s"):
+            engine.until_present_in_dom((By.ID, "banner"))
+
+        assert driver.commands.count("setTimeouts") == 2
+        assert driver.script_timeout_ms == 30000
+        assert metrics.top()[0][1].timeouts == 1
+
+    def test_present_element_costs_one_lookup(self, metrics):
+        driver = FakeDriver()
+        driver.elements[(By.ID, "banner")] = FakeElement("banner")
+
+        ObserverPage(driver).find_element((By.ID, "banner"))
+
+        assert driver.commands == ["findElements"]
+
+    def test_late_element_costs_the_same_however_long_it_takes(self, metrics):
+        driver = FakeDriver()
+
+        def render_later(*args):
+            time.sleep(0.3)
+            driver.elements[(By.ID, "banner")] = FakeElement("banner")
+            return True
+
+        driver.scripts["MutationObserver"] = render_later
+        ObserverPage(driver).find_element((By.ID, "banner"))
+
+        # polling every 50-500ms would have sent a lookup per poll
+        assert driver.commands == ["findElements", "getTimeouts", "w3cExecuteScriptAsync", "findElements"]
+
+    def test_falls_back_to_polling(self, metrics):
+        driver = FakeDriver()
+        driver.elements[(By.LINK_TEXT, "Sign out")] = FakeElement("sign out")
+        engine = WaitEngine(driver, timeout=1, metrics=metrics)
+
+        assert engine.until_present_in_dom((By.LINK_TEXT, "Sign out"))
+        assert "w3cExecuteScriptAsync" not in driver.commands
+
+    @pytest.mark.parametrize("locator, query", [
+        ((By.ID, "user"), ("css", '[id="user"]')),
+        ((By.NAME, "email"), ("css", '[name="email"]')),
+        ((By.CLASS_NAME, "error"), ("css", '[class~="error"]')),
+        ((By.ID, 'say "hi"\\'), ("css", '[id="say \\"hi\\"\\\\"]')),
+        ((By.CSS_SELECTOR, "form > button"), ("css", "form > button")),
+        ((By.XPATH, "//h1"), ("xpath", "//h1")),
+        ((By.LINK_TEXT, "Home"), None),
+    ])
+    def test_js_query(self, locator, query):
+        assert js_query(locator) == query
@@ -0,0 +1,106 @@
+"""
+Warm profile copy tests on a fake Chrome profile directory.
+"""
+
+import os
+import stat
+
+import pytest
+
+from warm_profile import CACHE_DIRS, MARKER, ProfileCopies, _copy_caches
+
+
+def _write(path: str, content: str = "x") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+@pytest.fixture
+def profile(tmp_path):
+    """A used Chrome profile: caches next to cookies, storage and history."""
+    root = tmp_path / "profile"
+    for relative in CACHE_DIRS:
+        _write(os.path.join(root, relative, "data_0"), relative)
+    _write(os.path.join(root, "Default", "Code Cache", "js", "index"), "v8")
+    for private in ("Cookies", "History", os.path.join("Local Storage", "leveldb", "000003.log")):
+        _write(os.path.join(root, "Default", private))
+    return str(root)
+
+
+@pytest.fixture
+def template(tmp_path, profile):
+    target = str(tmp_path / "template")
+    _copy_caches(profile, target)
+    _write(os.path.join(target, MARKER), "{}")
+    return target
+
+
+class TestCopyCaches:
+
+    def test_only_cache_dirs_are_copied(self, tmp_path, profile):
+        target = str(tmp_path / "copy")
+        _copy_caches(profile, target)
+
+        for relative in CACHE_DIRS:
+            with open(os.path.join(target, relative, "data_0")) as f:
+                assert f.read() == relative
+        assert os.path.exists(os.path.join(target, "Default", "Code Cache", "js", "index"))
+        for private in ("Cookies", "History", "Local Storage"):
+            assert not os.path.exists(os.path.join(target, "Default", private))
+
+    def test_missing_cache_dirs_are_skipped(self, tmp_path):
+        source = str(tmp_path / "sparse")
+        _write(os.path.join(source, "Default", "Cache", "data_0"))
+
+        target = str(tmp_path / "copy")
+        _copy_caches(source, target)
+
+        assert os.listdir(target) == ["Default"]
+        assert os.listdir(os.path.join(target, "Default")) == ["Cache"]
+
+    def test_copies_are_writable(self, tmp_path, profile):
+        cached = os.path.join(profile, "Default", "Cache", "data_0")
+        os.chmod(cached, stat.S_IRUSR)
+
+        target = str(tmp_path / "copy")
+        _copy_caches(profile, target)
+
+        with open(os.path.join(target, "Default", "Cache", "data_0"), "a") as f:
+            f.write("more")
+
+
+class TestProfileCopies:
+
+    def test_each_session_gets_its_own_copy(self, template):
+        copies = ProfileCopies()
+        first, second = copies.copy(template), copies.copy(template)
+
+        assert first != second
+        for copy in (first, second):
+            assert os.path.exists(os.path.join(copy, "Default", "Code Cache", "js", "index"))
+            assert not os.path.exists(os.path.join(copy, MARKER))
+        assert len(copies.copy_ms) == 2
+        copies.cleanup()
+
+    def test_template_is_never_written(self, template):
+        copies = ProfileCopies()
+        copy = copies.copy(template)
+        _write(os.path.join(copy, "Default", "Cache", "data_1"))
+
+        assert not os.path.exists(os.path.join(template, "Default", "Cache", "data_1"))
+        copies.cleanup()
+
+    def test_cleanup_removes_copies(self, template):
+        copies = ProfileCopies()
+        made = [copies.copy(template) for _ in range(3)]
+
+        copies.cleanup()
+        copies.cleanup()
+
+        assert not any(os.path.exists(path) for path in made)
+        assert os.path.exists(template)
+
+    def test_rejects_a_directory_that_is_not_a_template(self, profile):
+        with pytest.raises(FileNotFoundError, match="not a profile template"):
+            ProfileCopies().copy(profile)
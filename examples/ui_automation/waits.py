@@ -0,0 +1,216 @@
+"""Wait engine used by page objects"""
+
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+T = TypeVar("T")
+
+IGNORED = (NoSuchElementException, StaleElementReferenceException)
+
+# resolves once the locator matches, re-checking on every DOM mutation
+_MUTATION_WAIT = """
+const [by, value, timeoutMs, done] = arguments;
+const find = () => by === "xpath"
+    ? document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(value);
+if (find()) return done(true);
+const observer = new MutationObserver(() => {
+    if (find()) { observer.disconnect(); clearTimeout(timer); done(true); }
+});
+const timer = setTimeout(() => { observer.disconnect(); done(false); }, timeoutMs);
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+"""
+
+
+@dataclass
+class WaitStat:
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    timeouts: int = 0
+
+
+class WaitMetrics:
+    """Time spent waiting, keyed by the page object method that waited."""
+
+    def __init__(self):
+        self.stats: dict[str, WaitStat] = defaultdict(WaitStat)
+        self._lock = threading.Lock()
+
+    def record(self, label: str, elapsed_ms: float, timed_out: bool) -> None:
+        with self._lock:
+            stat = self.stats[label]
+            stat.calls += 1
+            stat.total_ms += elapsed_ms
+            stat.max_ms = max(stat.max_ms, elapsed_ms)
+            stat.timeouts += int(timed_out)
+
+    def top(self, n: int = 10) -> list[tuple[str, WaitStat]]:
+        with self._lock:
+            return sorted(self.stats.items(), key=lambda kv: kv[1].total_ms, reverse=True)[:n]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+
+WAIT_METRICS = WaitMetrics()
+
+
+def _css_string(value: str) -> str:
+    """`value` as a quoted CSS string, whatever quotes or backslashes it holds."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\a ")
+    return f'"{escaped}"'
+
+
+def js_query(locator: tuple) -> Optional[tuple[str, str]]:
+    """
+    ("css" | "xpath", query) for finding `locator` from page JS, None if
+    it can't be expressed. The query is passed to scripts as an argument;
+    id, name and class values are quoted so any character in them is safe.
+    """
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.ID:
+        return "css", f"[id={_css_string(value)}]"
+    if by == By.CLASS_NAME:
+        return "css", f"[class~={_css_string(value)}]"
+    if by == By.NAME:
+        return "css", f"[name={_css_string(value)}]"
+    if by == By.TAG_NAME:
+        return "css", value
+    return None
+
+
+def _caller_label() -> str:
+    """Outermost page-object method in the current call chain, e.g. LoginPage.login."""
+    frame = sys._getframe(2)
+    label = None
+    page = None
+    while frame is not None:
+        owner = frame.f_locals.get("self")
+        # only the page's own methods count, not decorator wrappers around them
+        is_page_method = (
+            owner is not None and hasattr(owner, "driver") and not isinstance(owner, WaitEngine)
+            and hasattr(type(owner), frame.f_code.co_name)
+        )
+        if is_page_method:
+            if page is None or owner is page:
+                page = owner
+                label = f"{type(owner).__name__}.{frame.f_code.co_name}"
+            else:
+                break
+        elif page is not None and owner is not page:
+            break
+        frame = frame.f_back
+    return label or "unknown"
+
+
+class WaitEngine:
+    """
+    Explicit waits with adaptive polling.
+
+    Polls fast at first (most conditions are met almost immediately)
+    and backs off towards `max_poll` so long waits don't hammer the
+    driver. Each call gets one timeout budget; run it with implicit
+    waits at 0 so element lookups inside a condition can't stretch it.
+
+    Drop-in for WebDriverWait: until(method, message) works the same.
+    """
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        timeout: float = 10,
+        initial_poll: float = 0.05,
+        max_poll: float = 0.5,
+        backoff: float = 1.5,
+        metrics: WaitMetrics = WAIT_METRICS
+    ):
+        self.driver = driver
+        self.timeout = timeout
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.metrics = metrics
+        # the session's script timeout, read on the first DOM observer wait
+        self._script_timeout: Optional[float] = None
+
+    def until(
+        self,
+        method: Callable[[WebDriver], T],
+        message: str = "",
+        timeout: Optional[float] = None
+    ) -> T:
+        budget = self.timeout if timeout is None else timeout
+        label = _caller_label()
+        start = time.perf_counter()
+        deadline = start + budget
+        interval = self.initial_poll
+
+        timed_out = False
+        try:
+            while True:
+                try:
+                    value = method(self.driver)
+                    if value:
+                        return value
+                except IGNORED:
+                    pass
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    timed_out = True
+                    raise TimeoutException(message or f"Condition not met within {budget}s")
+                time.sleep(min(interval, remaining))
+                interval = min(interval * self.backoff, self.max_poll)
+        finally:
+            self.metrics.record(label, (time.perf_counter() - start) * 1000, timed_out)
+
+    def until_present_in_dom(self, locator: tuple, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for `locator` with a MutationObserver in the page instead of
+        polling over the wire: one round trip however long it takes.
+        The session's script timeout is read once per engine and only
+        stretched (then put back) for waits longer than it. Falls back to
+        polling for locator types CSS/XPath can't express.
+        """
+        budget = self.timeout if timeout is None else timeout
+        query = js_query(locator)
+        if query is None:
+            return bool(self.until(lambda d: d.find_elements(*locator), timeout=budget))
+
+        label = _caller_label()
+        start = time.perf_counter()
+        if self._script_timeout is None:
+            current = self.driver.timeouts.script
+            self._script_timeout = float("inf") if current is None else current
+        # the script timeout belongs to the test; only stretch it for this wait
+        stretch = self._script_timeout < budget + 1
+        if stretch:
+            self.driver.set_script_timeout(budget + 1)
+        try:
+            found = bool(self.driver.execute_async_script(_MUTATION_WAIT, *query, int(budget * 1000)))
+        finally:
+            if stretch:
+                self.driver.set_script_timeout(self._script_timeout)
+        self.metrics.record(label, (time.perf_counter() - start) * 1000, not found)
+        if not found:
+            raise TimeoutException(f"{locator} not present within {budget}s")
+        return True
@@ -0,0 +1,212 @@
+"""
+Warm-start Chrome from a pre-built template profile.
+
+A fresh profile has an empty HTTP cache and no V8 code cache, so the
+first page of every test downloads and compiles the app's JS and CSS
+again. The template is built once by opening the app a few times; V8
+only writes code cache for scripts it has seen more than once. Each
+session then gets its own copy of the cache directories only, so no
+cookies or storage leak between tests and the template itself is never
+written to.
+
+Usage:
+    python warm_profile.py build --template .chrome-template --url http://localhost:8080/login
+    python warm_profile.py bench --template .chrome-template --runs 10
+
+    WARM_PROFILE=.chrome-template pytest   # browser fixture starts warm
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+
+# what makes a start warm; cookies, storage and history stay behind
+CACHE_DIRS = (
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "GPUCache"),
+    "GrShaderCache",
+    "ShaderCache",
+)
+MARKER = "template.json"
+
+_RESOURCES = """
+const entries = performance.getEntriesByType("resource");
+const nav = performance.getEntriesByType("navigation")[0];
+return {
+    load_ms: nav ? nav.loadEventEnd - nav.startTime : null,
+    resources: entries.length,
+    from_cache: entries.filter(e => e.transferSize === 0 && e.decodedBodySize > 0).length,
+    transferred: entries.reduce((sum, e) => sum + e.transferSize, 0),
+};
+"""
+
+
+def chrome_options(user_data_dir: str, headless: bool = True) -> ChromeOptions:
+    options = ChromeOptions()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+    return options
+
+
+def build_template(template_dir: str, urls: list[str], visits: int = 3, headless: bool = True) -> dict:
+    """Open `urls` `visits` times in a throwaway profile and keep its caches as the template."""
+    work_dir = tempfile.mkdtemp(prefix="chrome-template-")
+    driver = webdriver.Chrome(options=chrome_options(work_dir, headless))
+    try:
+        for _ in range(visits):
+            for url in urls:
+                driver.get(url)
+                # code cache is written off the main thread after load
+                time.sleep(0.5)
+        version = driver.capabilities.get("browserVersion", "")
+    finally:
+        driver.quit()
+
+    if os.path.exists(template_dir):
+        shutil.rmtree(template_dir)
+    _copy_caches(work_dir, template_dir)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    meta = {"urls": urls, "visits": visits, "browser_version": version, "built_at": time.time()}
+    with open(os.path.join(template_dir, MARKER), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def _copy_caches(source: str, target: str) -> None:
+    os.makedirs(target, exist_ok=True)
+    for relative in CACHE_DIRS:
+        src = os.path.join(source, relative)
+        if os.path.isdir(src):
+            # copyfile: keep the copy writable whatever the template's mode
+            shutil.copytree(src, os.path.join(target, relative), copy_function=shutil.copyfile)
+
+
+class ProfileCopies:
+    """Per-session copies of a template, removed at the end of the run."""
+
+    def __init__(self):
+        self._dirs: list[str] = []
+        self._lock = threading.Lock()
+        self.copy_ms: list[float] = []
+
+    def copy(self, template_dir: str) -> str:
+        if not os.path.exists(os.path.join(template_dir, MARKER)):
+            raise FileNotFoundError(
+                f"{template_dir} is not a profile template; build it with "
+                f"`python warm_profile.py build --template {template_dir} --url ...`"
+            )
+        start = time.perf_counter()
+        target = tempfile.mkdtemp(prefix="chrome-profile-")
+        _copy_caches(template_dir, target)
+        with self._lock:
+            self._dirs.append(target)
+            self.copy_ms.append((time.perf_counter() - start) * 1000)
+        return target
+
+    def cleanup(self) -> None:
+        with self._lock:
+            dirs, self._dirs = self._dirs, []
+        for path in dirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+PROFILE_COPIES = ProfileCopies()
+
+
+def _first_navigation(user_data_dir: str, base_url: str, headless: bool) -> dict:
+    from login_page import LoginPage
+
+    start = time.perf_counter()
+    driver = webdriver.Chrome(options=chrome_options(user_data_dir, headless))
+    launch_ms = (time.perf_counter() - start) * 1000
+    try:
+        page = LoginPage(driver)
+        page.base_url = base_url
+        start = time.perf_counter()
+        page.navigate()
+        navigate_ms = (time.perf_counter() - start) * 1000
+        return {"launch_ms": launch_ms, "navigate_ms": navigate_ms, **driver.execute_script(_RESOURCES)}
+    finally:
+        driver.quit()
+
+
+def benchmark(template_dir: str, base_url: str, runs: int = 5, headless: bool = True) -> dict:
+    """Cold (empty profile) vs warm (template copy) first LoginPage.navigate, alternating runs."""
+    results: dict[str, list[dict]] = {"cold": [], "warm": []}
+    copies = ProfileCopies()
+    try:
+        for _ in range(runs):
+            cold_dir = tempfile.mkdtemp(prefix="chrome-cold-")
+            try:
+                results["cold"].append(_first_navigation(cold_dir, base_url, headless))
+            finally:
+                shutil.rmtree(cold_dir, ignore_errors=True)
+            results["warm"].append(_first_navigation(copies.copy(template_dir), base_url, headless))
+    finally:
+        copies.cleanup()
+
+    def summarize(samples: list[dict]) -> dict:
+        return {
+            metric: round(statistics.median(s[metric] for s in samples), 1)
+            for metric in ("launch_ms", "navigate_ms", "load_ms", "resources", "from_cache", "transferred")
+            if all(s.get(metric) is not None for s in samples)
+        }
+
+    cold, warm = summarize(results["cold"]), summarize(results["warm"])
+    return {
+        "runs": runs,
+        "cold": cold,
+        "warm": {**warm, "copy_ms": round(statistics.median(copies.copy_ms), 1)},
+        "navigate_speedup": round(cold["navigate_ms"] / warm["navigate_ms"], 2) if warm.get("navigate_ms") else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build and benchmark a warm Chrome profile template")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build")
+    build.add_argument("--template", required=True)
+    build.add_argument("--url", action="append", required=True, help="page to warm (repeatable)")
+    build.add_argument("--visits", type=int, default=3)
+
+    bench = sub.add_parser("bench")
+    bench.add_argument("--template", required=True)
+    bench.add_argument("--base-url", default=os.getenv("BASE_URL", "http://localhost:8080"))
+    bench.add_argument("--runs", type=int, default=5)
+    bench.add_argument("--out")
+
+    for p in (build, bench):
+        p.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        meta = build_template(args.template, args.url, args.visits, headless=not args.headed)
+        print(json.dumps(meta, indent=2))
+        return 0
+
+    report = benchmark(args.template, args.base_url, args.runs, headless=not args.headed)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
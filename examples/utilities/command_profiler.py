@@ -0,0 +1,151 @@
+"""
+WebDriver Command Profiler.
+
+Times every WebDriver command a driver sends, Selenium or Appium, and
+attributes it to the test and the page-object methods that issued it.
+That shows whether a slow test waits on the app (slow commands), the
+driver (many commands), or our own code (time between commands).
+
+Output:
+    commands.folded - one line per call stack with its total microseconds,
+                      e.g. "test_login.py::test_ok;call;LoginPage.login;clickElement 51234",
+                      ready for flamegraph.pl, speedscope or inferno
+    commands.json   - count / total / p50 / p90 / p95 / p99 / max per command,
+                      and totals per page-object method
+
+Usage:
+    PROFILER.install(driver)        # once per driver; idempotent
+    PROFILE_COMMANDS=profile pytest # conftest installs and writes profile/
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Optional
+
+
+# Appium routes most extensions through executeScript; name them by script
+_EXTENSION_PREFIXES = ("mobile:", "flutter:")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def _frame_name(name: str) -> str:
+    # folded format: ';' separates frames, the last space separates the weight
+    return name.replace(";", ":").replace(" ", "_")
+
+
+def command_name(command: str, params: Optional[dict]) -> str:
+    script = (params or {}).get("script")
+    if isinstance(script, str) and script.startswith(_EXTENSION_PREFIXES):
+        return f"{command} {script}"
+    return command
+
+
+def caller_stack(frame) -> list[str]:
+    """Page-object methods on the stack, outermost first, e.g. [LoginPage.login, BasePage.click]."""
+    stack = []
+    while frame is not None:
+        owner = frame.f_locals.get("self")
+        # page objects and driver helpers hold the driver; skip decorator wrappers
+        if owner is not None and hasattr(owner, "driver") and hasattr(type(owner), frame.f_code.co_name):
+            label = f"{type(owner).__name__}.{frame.f_code.co_name}"
+            if not stack or stack[-1] != label:
+                stack.append(label)
+        frame = frame.f_back
+    return stack[::-1]
+
+
+def current_test() -> list[str]:
+    """[nodeid, phase] of the running pytest test, if any."""
+    current = os.getenv("PYTEST_CURRENT_TEST")
+    if not current:
+        return []
+    nodeid, _, phase = current.rpartition(" ")
+    return [nodeid, phase.strip("()")]
+
+
+class CommandProfiler:
+    """Per-command latencies and folded call stacks, across every installed driver."""
+
+    def __init__(self):
+        self.durations: dict[str, list[float]] = defaultdict(list)
+        self.stacks: Counter = Counter()
+        self.callers: dict[str, list[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def install(self, driver) -> None:
+        """Time the driver's commands (once per driver)."""
+        if getattr(driver, "_command_profiler", None) is self:
+            return
+        execute = driver.execute
+
+        def profiled(command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self.record(command_name(command, params), (time.perf_counter() - start) * 1000, sys._getframe(1))
+
+        driver.execute = profiled
+        driver._command_profiler = self
+
+    def record(self, command: str, elapsed_ms: float, frame=None) -> None:
+        callers = caller_stack(frame) if frame is not None else []
+        stack = ";".join(_frame_name(name) for name in [*current_test(), *callers, command])
+        with self._lock:
+            self.durations[command].append(elapsed_ms)
+            self.stacks[stack] += elapsed_ms * 1000
+            self.callers[callers[-1] if callers else "(no page object)"].append(elapsed_ms)
+
+    def folded(self) -> list[str]:
+        with self._lock:
+            return [f"{stack} {round(us)}" for stack, us in sorted(self.stacks.items()) if round(us) > 0]
+
+    def report(self) -> dict:
+        def summarize(samples: list[float]) -> dict:
+            return {
+                "count": len(samples),
+                "total_ms": round(sum(samples), 1),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p90_ms": round(percentile(samples, 90), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+                "max_ms": round(max(samples), 2),
+            }
+
+        with self._lock:
+            commands = {name: summarize(samples) for name, samples in self.durations.items()}
+            callers = {name: summarize(samples) for name, samples in self.callers.items()}
+        by_total = lambda items: dict(sorted(items.items(), key=lambda kv: kv[1]["total_ms"], reverse=True))
+        return {"commands": by_total(commands), "callers": by_total(callers)}
+
+    def write(self, directory: str, suffix: str = "") -> dict[str, str]:
+        """commands{suffix}.folded and commands{suffix}.json under `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        paths = {
+            "folded": os.path.join(directory, f"commands{suffix}.folded"),
+            "json": os.path.join(directory, f"commands{suffix}.json"),
+        }
+        with open(paths["folded"], "w") as f:
+            f.writelines(line + "\n" for line in self.folded())
+        with open(paths["json"], "w") as f:
+            json.dump(self.report(), f, indent=2)
+        return paths
+
+    def clear(self) -> None:
+        with self._lock:
+            self.durations.clear()
+            self.stacks.clear()
+            self.callers.clear()
+
+
+PROFILER = CommandProfiler()